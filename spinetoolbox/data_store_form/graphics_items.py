@@ -15,6 +15,8 @@ Classes for drawing graphics items on graph view's QGraphicsScene.
 :authors: M. Marin (KTH), P. Savolainen (VTT)
 :date:   4.4.2018
 """
+from collections import OrderedDict
+from enum import IntEnum
 from PySide2.QtCore import Qt, Signal, Slot, QLineF, QSize
 from PySide2.QtWidgets import (
     QGraphicsItem,
@@ -34,6 +36,24 @@ from spinetoolbox.helpers import CharIconEngine
 from spinetoolbox.widgets.custom_qwidgets import TitleWidgetAction
 
 
+class DetailLevel(IntEnum):
+    """Rendering detail of the Entity graph, from the most detailed to the least."""
+
+    FULL = 0
+    """Icons, labels and arcs are drawn item by item."""
+    NO_LABELS = 1
+    """Like FULL but without object labels."""
+    PLAIN = 2
+    """Entities are drawn as plain dots, arcs are drawn by the view as a single batched path."""
+    CLUSTERS = 3
+    """Entities and arcs are aggregated into clusters drawn by the view."""
+
+
+_ICON_COLOR_CACHE_SIZE = 256
+_ICON_COLORS = OrderedDict()
+"""Cache of average icon colors keyed by pixmap cache key; least recently used colors are dropped first."""
+
+
 def make_figure_graphics_item(scene, z=0, static=True):
     """Creates a FigureCanvas and adds it to the given scene.
     Used for creating heatmaps and associated colorbars.
@@ -88,6 +108,7 @@ class EntityItem(QGraphicsPixmapItem):
         self._moved_on_scene = False
         self._bg = None
         self._bg_brush = Qt.NoBrush
+        self._detail_level = DetailLevel.FULL
         self._init_bg()
         self._bg.setFlag(QGraphicsItem.ItemStacksBehindParent, enabled=True)
         self.setZValue(0)
@@ -158,6 +179,36 @@ class EntityItem(QGraphicsPixmapItem):
         )
         self.setPixmap(pixmap)
 
+    def _icon_color(self):
+        """Returns the average color of the icon.
+
+        Returns:
+            QColor
+        """
+        pixmap = self.pixmap()
+        key = pixmap.cacheKey()
+        color = _ICON_COLORS.get(key)
+        if color is not None:
+            _ICON_COLORS.move_to_end(key)
+            return color
+        color = pixmap.scaled(1, 1, Qt.IgnoreAspectRatio, Qt.SmoothTransformation).toImage().pixelColor(0, 0)
+        color.setAlpha(255)
+        _ICON_COLORS[key] = color
+        if len(_ICON_COLORS) > _ICON_COLOR_CACHE_SIZE:
+            _ICON_COLORS.popitem(last=False)
+        return color
+
+    def set_detail_level(self, level):
+        """Sets the level of detail used when drawing the item.
+
+        Args:
+            level (DetailLevel): detail level
+        """
+        self._detail_level = level
+        self._bg.setVisible(level < DetailLevel.PLAIN)
+        self.setFlag(QGraphicsItem.ItemHasNoContents, enabled=level >= DetailLevel.CLUSTERS)
+        self.update()
+
     def shape(self):
         """Returns a shape containing the entire bounding rect, to work better with icon transparency."""
         path = QPainterPath()
@@ -167,6 +218,9 @@ class EntityItem(QGraphicsPixmapItem):
 
     def paint(self, painter, option, widget=None):
         """Shows or hides the selection halo."""
+        if self._detail_level >= DetailLevel.PLAIN:
+            self._paint_plain(painter, option)
+            return
         if option.state & (QStyle.State_Selected):
             self._paint_as_selected()
             option.state &= ~QStyle.State_Selected
@@ -174,6 +228,16 @@ class EntityItem(QGraphicsPixmapItem):
             self._paint_as_deselected()
         super().paint(painter, option, widget)
 
+    def _paint_plain(self, painter, option):
+        """Paints the item as a dot in the color of its icon."""
+        if option.state & QStyle.State_Selected:
+            brush = QGuiApplication.palette().highlight()
+        else:
+            brush = QBrush(self._icon_color())
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(brush)
+        painter.drawEllipse(QGraphicsPixmapItem.boundingRect(self))
+
     def _paint_as_selected(self):
         self._bg.setBrush(QGuiApplication.palette().highlight())
 
@@ -248,8 +312,14 @@ class EntityItem(QGraphicsPixmapItem):
         """
         if change == QGraphicsItem.ItemScenePositionHasChanged:
             self._moved_on_scene = True
+            self._invalidate_overview()
         return value
 
+    def _invalidate_overview(self):
+        """Notifies the graph view that the batched drawing of the graph is outdated."""
+        if self._detail_level >= DetailLevel.PLAIN:
+            self._data_store_form.ui.graphicsView.invalidate_overview()
+
     def set_all_visible(self, on):
         """Sets visibility status for this item and all arc items.
 
@@ -259,6 +329,7 @@ class EntityItem(QGraphicsPixmapItem):
         for item in self.arc_items:
             item.setVisible(on)
         self.setVisible(on)
+        self._invalidate_overview()
 
     def _make_menu(self):
         menu = QMenu(self._data_store_form)
@@ -392,6 +463,11 @@ class ObjectItem(EntityItem):
         """Refreshes the name."""
         self.label_item.setPlainText(name)
 
+    def set_detail_level(self, level):
+        """See base class."""
+        super().set_detail_level(level)
+        self.label_item.setVisible(level == DetailLevel.FULL)
+
     def update_description(self, description):
         if not description:
             description = "No description"
@@ -513,6 +589,15 @@ class ArcItem(QGraphicsPathItem):
         """Accepts the event so it's not propagated."""
         event.accept()
 
+    def set_detail_level(self, level):
+        """Sets the level of detail used when drawing the item.
+        On the coarse levels the view draws all arcs at once so the item draws nothing.
+
+        Args:
+            level (DetailLevel): detail level
+        """
+        self.setFlag(QGraphicsItem.ItemHasNoContents, enabled=level >= DetailLevel.PLAIN)
+
     def other_item(self, item):
         return {self.rel_item: self.obj_item, self.obj_item: self.rel_item}.get(item)
 
@@ -281,11 +281,13 @@ class CompoundParameterModel(CompoundWithEmptyTableModel):
 
     def set_filter_class_ids(self, class_ids):
         if self._settattr_if_different(self, "_filter_class_ids", class_ids):
+            self._invalidate_row_map()
             self._invalidate_filter()
 
     def set_filter_parameter_ids(self, parameter_ids):
         for model in self.single_models:
             if self._settattr_if_different(model, "_filter_parameter_ids", parameter_ids):
+                self._invalidate_row_map(model)
                 self._invalidate_filter()
 
     @Slot(str, dict)
@@ -310,6 +312,7 @@ class CompoundParameterModel(CompoundWithEmptyTableModel):
         if self._auto_filter.setdefault(field, {}) == auto_filter:
             return
         self._auto_filter[field] = auto_filter
+        self._invalidate_row_map()
         self._invalidate_filter()
 
     def set_single_auto_filter(self, model, field):
@@ -326,21 +329,22 @@ class CompoundParameterModel(CompoundWithEmptyTableModel):
         if values == model._auto_filter.get(field, {}):
             return
         model._auto_filter[field] = values
+        self._invalidate_row_map(model)
         self._invalidate_filter()
 
-    def _row_map_for_model(self, model):
-        """Returns the row map for the given model.
+    def _rows_for_model(self, model):
+        """Returns the rows of given model to include in the compound model.
         Reimplemented to take filter status into account.
 
         Args:
             model (SingleParameterModel, EmptyParameterModel)
 
         Returns:
-            list: tuples (model, row number) for each accepted row
+            Iterable of int: accepted row numbers in ascending order
         """
         if not self.filter_accepts_model(model):
             return []
-        return [(model, i) for i in model.accepted_rows()]
+        return model.accepted_rows()
 
     def _models_with_db_map(self, db_map):
         """Returns a collection of single models with given db_map.
@@ -406,9 +410,10 @@ class CompoundParameterModel(CompoundWithEmptyTableModel):
     def create_and_append_single_model(self, db_map, entity_class_id, ids):
         model = self._single_model_type(self.header, self.db_mngr, db_map, entity_class_id)
         model.reset_model(ids)
-        single_row_map = super()._row_map_for_model(model)  # NOTE: super() is to get all (unfiltered) rows
-        self._insert_single_row_map(single_row_map)
+        row_count = model.rowCount()
+        self._insert_single_model_rows(model, range(row_count), row_count)  # NOTE: all (unfiltered) rows
         self.sub_models.insert(len(self.single_models), model)
+        self._invalidate_row_map(model)
 
     def receive_parameter_data_updated(self, db_map_data):
         """Runs when either parameter definitions or values are updated in the dbs.
@@ -421,6 +426,10 @@ class CompoundParameterModel(CompoundWithEmptyTableModel):
             items_per_class = self._items_per_class(items)
             for class_items in items_per_class.values():
                 self._do_update_data_in_filter_menus(db_map, class_items)
+            for model in self._models_with_db_map(db_map):
+                if model.entity_class_id in items_per_class:
+                    model.invalidate_filter_columns()
+                    self._invalidate_row_map(model)
         self._emit_data_changed_for_column("parameter_name")
         # NOTE: parameter definition names aren't refreshed unless we emit dataChanged,
         # whereas entity and class names don't need it. Why?
@@ -436,12 +445,13 @@ class CompoundParameterModel(CompoundWithEmptyTableModel):
         for db_map, items in db_map_data.items():
             items_per_class = self._items_per_class(items)
             for model in self._models_with_db_map(db_map):
-                removed_ids = [x["id"] for x in items_per_class.get(model.entity_class_id, {})]
+                removed_ids = {x["id"] for x in items_per_class.get(model.entity_class_id, {})}
                 if not removed_ids:
                     continue
                 removed_rows = [row for row in range(model.rowCount()) if model._main_data[row] in removed_ids]
                 for row, count in sorted(rows_to_row_count_tuples(removed_rows), reverse=True):
                     del model._main_data[row : row + count]
+                model.invalidate_filter_columns()
             for class_items in items_per_class.values():
                 self._do_remove_data_from_filter_menus(db_map, class_items)
         self.do_refresh()
@@ -568,6 +578,7 @@ class CompoundParameterValueMixin:
     def set_filter_entity_ids(self, entity_ids):
         for model in self.single_models:
             if self._settattr_if_different(model, "_filter_entity_ids", entity_ids):
+                self._invalidate_row_map(model)
                 self._invalidate_filter()
 
 
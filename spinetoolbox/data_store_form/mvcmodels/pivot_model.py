@@ -10,12 +10,15 @@
 ######################################################################################################################
 
 """
-Provides PivotModel.
+Provides PivotModel and ProductPivotModel.
 
 :author: P. Vennström (VTT)
 :date:   1.11.2018
 """
 
+import bisect
+from collections.abc import Sequence
+from functools import reduce
 import operator
 from ...helpers import tuple_itemgetter
 
@@ -23,7 +26,7 @@ from ...helpers import tuple_itemgetter
 class PivotModel:
     def __init__(self):
         self._data = {}  # dictionary of unpivoted data
-        self.index_values = {}  # Maps index id to a sorted set of values for that index
+        self.index_values = {}  # Maps index id to an ordered dict of values for that index and their key counts
         self.index_ids = ()  # ids of the indexes in _data, cannot contain duplicates
         self.pivot_rows = ()  # current selected rows indexes
         self.pivot_columns = ()  # current selected columns indexes
@@ -32,6 +35,8 @@ class PivotModel:
         self._key_getter = None  # operator.itemgetter placeholder used to translate pivot to keys in _data
         self._row_data_header = []  # header values for row data
         self._column_data_header = []  # header values for column data
+        self._row_key_counts = {}  # Maps row header values to the number of matching keys in _data
+        self._column_key_counts = {}  # Maps column header values to the number of matching keys in _data
 
     def reset_model(self, data, index_ids=(), rows=(), columns=(), frozen=(), frozen_value=()):
         """Resets the model.
@@ -48,8 +53,8 @@ class PivotModel:
         self.frozen_value = None
         # create data dict with keys as long as index_ids
         self._data = data
-        self.index_values = dict(zip(index_ids, zip(*data.keys())))
         self.index_ids = tuple(index_ids)
+        self._reset_index_values()
         self.set_pivot(rows, columns, frozen, frozen_value)
 
     def clear_model(self):
@@ -63,32 +68,141 @@ class PivotModel:
         self._key_getter = None
         self._row_data_header = []
         self._column_data_header = []
+        self._row_key_counts = {}
+        self._column_key_counts = {}
 
     def update_model(self, data):
         self._data.update(data)
 
     def add_to_model(self, data):
+        """Adds data to the model.
+
+        Only the added keys are visited; new header values are appended to the end of the headers.
+
+        Args:
+            data (dict): data to add
+
+        Returns:
+            tuple: number of added rows and columns
+        """
+        new_keys = [key for key in data if key not in self._data]
         self._data.update(data)
-        self.index_values = dict(zip(self.index_ids, zip(*self._data.keys())))
-        old_row_count = len(self._row_data_header)
-        old_column_count = len(self._column_data_header)
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
-        added_row_count = len(self._row_data_header) - old_row_count
-        added_column_count = len(self._column_data_header) - old_column_count
+        self._count_index_values(new_keys)
+        pivot_keys = self._filter_frozen(new_keys)
+        added_row_count = self._add_header_keys(
+            pivot_keys, self.pivot_rows, self._row_key_counts, self._row_data_header
+        )
+        added_column_count = self._add_header_keys(
+            pivot_keys, self.pivot_columns, self._column_key_counts, self._column_data_header
+        )
         return added_row_count, added_column_count
 
     def remove_from_model(self, data):
-        self._data = {key: self._data[key] for key in set(self._data) - set(data)}
-        self.index_values = dict(zip(self.index_ids, zip(*self._data.keys())))
+        """Removes data from the model.
+
+        Only the removed keys are visited; headers are rebuilt from the key counts if some values disappeared.
+
+        Args:
+            data (dict): data to remove
+
+        Returns:
+            tuple: number of removed rows and columns
+        """
+        removed_keys = [key for key in data if key in self._data]
+        for key in removed_keys:
+            del self._data[key]
+        self._count_index_values(removed_keys, -1)
+        pivot_keys = self._filter_frozen(removed_keys)
         old_row_count = len(self._row_data_header)
         old_column_count = len(self._column_data_header)
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
+        if self._remove_header_keys(pivot_keys, self.pivot_rows, self._row_key_counts):
+            self._row_data_header = self._header_from_counts(self._row_key_counts)
+        if self._remove_header_keys(pivot_keys, self.pivot_columns, self._column_key_counts):
+            self._column_data_header = self._header_from_counts(self._column_key_counts)
         removed_row_count = old_row_count - len(self._row_data_header)
         removed_column_count = old_column_count - len(self._column_data_header)
         return removed_row_count, removed_column_count
 
+    def _reset_index_values(self):
+        """Recounts index_values from scratch."""
+        self.index_values = {}
+        self._count_index_values(self._data)
+
+    def _count_index_values(self, keys, increment=1, index_ids=None):
+        """Updates the value counts in index_values.
+
+        Args:
+            keys (Iterable of tuple): keys that were added to or removed from _data
+            increment (int): 1 for added keys, -1 for removed ones
+            index_ids (tuple, optional): index ids corresponding to key items, defaults to all index ids
+        """
+        if index_ids is None:
+            index_ids = self.index_ids
+        value_counts = [self.index_values.setdefault(index_id, {}) for index_id in index_ids]
+        for key in keys:
+            for counts, value in zip(value_counts, key):
+                count = counts.get(value, 0) + increment
+                if count > 0:
+                    counts[value] = count
+                else:
+                    del counts[value]
+
+    def _filter_frozen(self, keys):
+        """Returns keys that match the frozen condition.
+
+        Args:
+            keys (list of tuple)
+
+        Returns:
+            list of tuple
+        """
+        if not self.pivot_frozen:
+            return keys
+        frozen_getter = self._index_key_getter(self.pivot_frozen)
+        return [key for key in keys if frozen_getter(key) == self.frozen_value]
+
+    def _add_header_keys(self, keys, indexes, key_counts, header):
+        """Counts header values of added keys and appends new values to given header.
+
+        Returns:
+            int: number of values appended to header
+        """
+        if not indexes:
+            return 0
+        index_getter = self._index_key_getter(indexes)
+        old_count = len(header)
+        for key in keys:
+            header_key = index_getter(key)
+            count = key_counts.get(header_key, 0)
+            if count == 0 and None not in header_key:
+                header.append(header_key)
+            key_counts[header_key] = count + 1
+        return len(header) - old_count
+
+    def _remove_header_keys(self, keys, indexes, key_counts):
+        """Uncounts header values of removed keys.
+
+        Returns:
+            bool: True if some header value is no longer in use
+        """
+        if not indexes:
+            return False
+        index_getter = self._index_key_getter(indexes)
+        values_dropped = False
+        for key in keys:
+            header_key = index_getter(key)
+            count = key_counts[header_key] - 1
+            if count > 0:
+                key_counts[header_key] = count
+            else:
+                del key_counts[header_key]
+                values_dropped = True
+        return values_dropped
+
+    @staticmethod
+    def _header_from_counts(key_counts):
+        return [key for key in key_counts if None not in key]
+
     def _check_pivot(self, rows, columns, frozen, frozen_value):
         """Checks if given pivot is valid.
 
@@ -116,6 +230,19 @@ class PivotModel:
         keys = tuple(self.index_ids.index(i) for i in indexes if i in self.index_ids)
         return tuple_itemgetter(operator.itemgetter(*keys), len(keys))
 
+    def _count_unique_index_values(self, indexes):
+        """Counts keys that match the frozen condition by their values for given indexes.
+
+        Args:
+            indexes (list)
+
+        Returns
+            dict: mapping from unique index values to key counts
+        """
+        key_counts = {}
+        self._add_header_keys(self._filter_frozen(list(self._data)), indexes, key_counts, [])
+        return key_counts
+
     def _get_unique_index_values(self, indexes):
         """Returns unique indexes that match the frozen condition.
 
@@ -125,15 +252,21 @@ class PivotModel:
         Returns
             list
         """
+        return self._header_from_counts(self._count_unique_index_values(indexes))
+
+    def unique_values(self, indexes):
+        """Returns unique value combinations for given indexes in the order they appear in data.
+
+        Args:
+            indexes (tuple): index ids
+
+        Returns:
+            list of tuple
+        """
         if not indexes:
             return []
         index_getter = self._index_key_getter(indexes)
-        if self.pivot_frozen:
-            frozen_getter = self._index_key_getter(self.pivot_frozen)
-            result = {index_getter(k): None for k in self._data if frozen_getter(k) == self.frozen_value}
-        else:
-            result = {index_getter(k): None for k in self._data}
-        return [x for x in result if None not in x]
+        return list(dict.fromkeys(index_getter(key) for key in self._data))
 
     def set_pivot(self, rows, columns, frozen, frozen_value):
         """Sets pivot."""
@@ -153,8 +286,14 @@ class PivotModel:
         order = tuple(self.index_ids.index(i) for i in self.pivot_rows + self.pivot_columns + self.pivot_frozen)
         order = tuple(sorted(range(len(order)), key=order.__getitem__))
         self._key_getter = tuple_itemgetter(operator.itemgetter(*order), len(order))
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
+        self._reset_headers()
+
+    def _reset_headers(self):
+        """Recomputes row and column headers for current pivot."""
+        self._row_key_counts = self._count_unique_index_values(self.pivot_rows)
+        self._column_key_counts = self._count_unique_index_values(self.pivot_columns)
+        self._row_data_header = self._header_from_counts(self._row_key_counts)
+        self._column_data_header = self._header_from_counts(self._column_key_counts)
 
     def set_frozen_value(self, value):
         """Sets values for the frozen indexes."""
@@ -219,3 +358,319 @@ class PivotModel:
     @property
     def columns(self):
         return self._column_data_header
+
+
+class ProductPivotModel(PivotModel):
+    """A pivot model whose keys span the Cartesian product of factors.
+
+    A factor is a group of consecutive indexes, e.g. the objects of a relationship class dimension
+    or the object id lists of existing relationships.
+    Only the keys that have data are stored; empty cells are computed on demand
+    and row and column headers are lazy sequences.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._factor_widths = ()  # number of indexes in each factor
+        self._factors = []  # list of dicts mapping value tuples to None, one per factor
+        self._frozen_items = []  # list of (position in factor, frozen value) tuples for each factor
+        self._frozen_match_counts = []  # number of values in each factor that match the frozen value
+
+    def set_factors(self, factor_widths, factors):
+        """Sets the factors that span the keys of the model.
+
+        Must be followed by a call to reset_model().
+
+        Args:
+            factor_widths (Iterable of int): number of indexes in each factor; factors cover index ids in order
+            factors (Iterable of Iterable): value tuples of each factor
+        """
+        self._factor_widths = tuple(factor_widths)
+        self._factors = [dict.fromkeys(values) for values in factors]
+        for width, values in zip(self._factor_widths, self._factors):
+            if not values:
+                values[width * (None,)] = None
+
+    def reset_model(self, data, index_ids=(), rows=(), columns=(), frozen=(), frozen_value=()):
+        if sum(self._factor_widths) != len(index_ids):
+            raise ValueError("factors must cover all index ids")
+        super().reset_model(data, index_ids, rows, columns, frozen, frozen_value)
+
+    def clear_model(self):
+        super().clear_model()
+        self._factor_widths = ()
+        self._factors = []
+        self._frozen_items = []
+        self._frozen_match_counts = []
+
+    def add_to_model(self, data):
+        """Adds data to the model. Data never changes the headers since they are spanned by the factors.
+
+        Returns:
+            tuple: zero added rows and columns
+        """
+        self._data.update(data)
+        return 0, 0
+
+    def remove_from_model(self, data):
+        """Removes data from the model. Data never changes the headers since they are spanned by the factors.
+
+        Returns:
+            tuple: zero removed rows and columns
+        """
+        for key in data:
+            self._data.pop(key, None)
+        return 0, 0
+
+    def add_factor_values(self, factor, values):
+        """Adds values to a factor. New header values are appended to the end of the headers.
+
+        Args:
+            factor (int): factor index
+            values (Iterable of tuple): value tuples to add
+
+        Returns:
+            tuple: number of added rows and columns
+        """
+        values = [value for value in dict.fromkeys(values) if value not in self._factors[factor]]
+        if not values:
+            return 0, 0
+        old_row_count = len(self._row_data_header)
+        old_column_count = len(self._column_data_header)
+        placeholder = self._factor_widths[factor] * (None,)
+        if placeholder in self._factors[factor]:
+            self._discard_factor_values(factor, [placeholder])
+        self._insert_factor_values(factor, values)
+        return len(self._row_data_header) - old_row_count, len(self._column_data_header) - old_column_count
+
+    def remove_factor_values(self, factor, values):
+        """Removes values from a factor.
+
+        Args:
+            factor (int): factor index
+            values (Iterable of tuple): value tuples to remove
+
+        Returns:
+            tuple: number of removed rows and columns
+        """
+        values = [value for value in dict.fromkeys(values) if value in self._factors[factor]]
+        if not values:
+            return 0, 0
+        old_row_count = len(self._row_data_header)
+        old_column_count = len(self._column_data_header)
+        self._discard_factor_values(factor, values)
+        if not self._factors[factor]:
+            self._insert_factor_values(factor, [self._factor_widths[factor] * (None,)])
+        return old_row_count - len(self._row_data_header), old_column_count - len(self._column_data_header)
+
+    def unique_values(self, indexes):
+        """See base class."""
+        if not indexes:
+            return []
+        header = self._make_header(indexes)
+        header.append_block(
+            [list(dict.fromkeys(map(getter, self._factors[factor]))) for factor, getter in header.getters.items()]
+        )
+        return list(header)
+
+    def _reset_index_values(self):
+        """Counts index_values from factors."""
+        self.index_values = {}
+        for factor, values in enumerate(self._factors):
+            self._count_factor_values(factor, values, 1)
+
+    def _count_factor_values(self, factor, values, increment):
+        first = sum(self._factor_widths[:factor])
+        index_ids = self.index_ids[first : first + self._factor_widths[factor]]
+        self._count_index_values(values, increment, index_ids)
+
+    def _reset_headers(self):
+        """Recomputes row and column headers for current pivot."""
+        self._frozen_items = [[] for _ in self._factors]
+        for index_id, value in zip(self.pivot_frozen, self.frozen_value):
+            factor, position = self._factor_and_position(index_id)
+            self._frozen_items[factor].append((position, value))
+        self._frozen_match_counts = [
+            sum(1 for value in values if self._matches_frozen(factor, value))
+            for factor, values in enumerate(self._factors)
+        ]
+        self._row_data_header = self._build_header(self.pivot_rows)
+        self._column_data_header = self._build_header(self.pivot_columns)
+
+    def _build_header(self, indexes):
+        """Builds a header for given indexes from current factors.
+
+        Args:
+            indexes (tuple): index ids
+
+        Returns:
+            _ProductHeader or list: header
+        """
+        if not indexes:
+            return []
+        header = self._make_header(indexes)
+        for factor in header.getters:
+            self._count_projections(header, factor, self._factors[factor], 1)
+        if all(self._frozen_match_counts):
+            header.append_block([list(projections) for projections in header.projections.values()])
+        return header
+
+    def _make_header(self, indexes):
+        """Returns an empty header for given indexes."""
+        positions = sorted(self.index_ids.index(index_id) for index_id in indexes)
+        order = tuple(positions.index(self.index_ids.index(index_id)) for index_id in indexes)
+        positions_by_factor = {}
+        for index_id in sorted(indexes, key=self.index_ids.index):
+            factor, position = self._factor_and_position(index_id)
+            positions_by_factor.setdefault(factor, []).append(position)
+        getters = {
+            factor: tuple_itemgetter(operator.itemgetter(*factor_positions), len(factor_positions))
+            for factor, factor_positions in positions_by_factor.items()
+        }
+        return _ProductHeader(getters, tuple_itemgetter(operator.itemgetter(*order), len(order)))
+
+    def _factor_and_position(self, index_id):
+        """Returns the factor that contains given index and the position of the index in factor's value tuples."""
+        position = self.index_ids.index(index_id)
+        for factor, width in enumerate(self._factor_widths):
+            if position < width:
+                return factor, position
+            position -= width
+        raise ValueError(f"index id {index_id} not in factors")
+
+    def _matches_frozen(self, factor, value):
+        return all(value[position] == frozen_value for position, frozen_value in self._frozen_items[factor])
+
+    def _count_projections(self, header, factor, values, increment):
+        """Updates header's projection counts of given factor values.
+
+        Args:
+            header (_ProductHeader): header to update
+            factor (int): factor index
+            values (Iterable of tuple): factor value tuples
+            increment (int): 1 for added values, -1 for removed ones
+
+        Returns:
+            list of tuple: projections that were added or dropped
+        """
+        getter = header.getters.get(factor)
+        if getter is None:
+            return []
+        projection_counts = header.projections[factor]
+        changed = []
+        for value in values:
+            if not self._matches_frozen(factor, value):
+                continue
+            projection = getter(value)
+            if None in projection:
+                continue
+            count = projection_counts.get(projection, 0) + increment
+            if count > 0:
+                projection_counts[projection] = count
+                if count == 1 and increment > 0:
+                    changed.append(projection)
+            else:
+                del projection_counts[projection]
+                changed.append(projection)
+        return changed
+
+    def _insert_factor_values(self, factor, values):
+        self._factors[factor].update(dict.fromkeys(values))
+        self._count_factor_values(factor, values, 1)
+        all_matched = all(self._frozen_match_counts)
+        self._frozen_match_counts[factor] += sum(1 for value in values if self._matches_frozen(factor, value))
+        if not all_matched and all(self._frozen_match_counts):
+            self._reset_headers()
+            return
+        for header in (self._row_data_header, self._column_data_header):
+            if not isinstance(header, _ProductHeader):
+                continue
+            added = self._count_projections(header, factor, values, 1)
+            if added and all_matched:
+                header.append_block(
+                    [
+                        added if header_factor == factor else list(projections)
+                        for header_factor, projections in header.projections.items()
+                    ]
+                )
+
+    def _discard_factor_values(self, factor, values):
+        for value in values:
+            del self._factors[factor][value]
+        self._count_factor_values(factor, values, -1)
+        all_matched = all(self._frozen_match_counts)
+        self._frozen_match_counts[factor] -= sum(1 for value in values if self._matches_frozen(factor, value))
+        if all_matched and not all(self._frozen_match_counts):
+            self._reset_headers()
+            return
+        for header in (self._row_data_header, self._column_data_header):
+            if not isinstance(header, _ProductHeader):
+                continue
+            dropped = self._count_projections(header, factor, values, -1)
+            if dropped:
+                header.discard_projections(factor, set(dropped))
+
+
+class _ProductHeader(Sequence):
+    """A lazy sequence of header keys.
+
+    The header is a concatenation of blocks where each block is the Cartesian product of lists of value tuples,
+    one list per factor. Header keys are computed on demand.
+    """
+
+    def __init__(self, getters, key_getter):
+        """
+        Args:
+            getters (dict): mapping from factor index to an itemgetter that projects factor's values to the header
+            key_getter (Callable): reorders a concatenated block item into a header key
+        """
+        self.getters = getters
+        self.projections = {factor: {} for factor in getters}  # Maps factor to projected values and their counts
+        self._key_getter = key_getter
+        self._blocks = []
+        self._ends = []  # cumulative block lengths
+
+    def append_block(self, value_lists):
+        """Appends the Cartesian product of given lists to the header.
+
+        Args:
+            value_lists (list of list): one list of value tuples per factor
+        """
+        self._blocks.append(value_lists)
+        self._update_ends()
+
+    def discard_projections(self, factor, projections):
+        """Removes values of given factor from all blocks.
+
+        Args:
+            factor (int): factor index
+            projections (set of tuple): values to remove
+        """
+        position = list(self.getters).index(factor)
+        for value_lists in self._blocks:
+            value_lists[position] = [value for value in value_lists[position] if value not in projections]
+        self._blocks = [value_lists for value_lists in self._blocks if all(value_lists)]
+        self._update_ends()
+
+    def _update_ends(self):
+        self._ends = []
+        end = 0
+        for value_lists in self._blocks:
+            end += reduce(operator.mul, map(len, value_lists), 1)
+            self._ends.append(end)
+
+    def __len__(self):
+        return self._ends[-1] if self._ends else 0
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("header index out of range")
+        block_index = bisect.bisect_right(self._ends, index)
+        offset = index - self._ends[block_index - 1] if block_index > 0 else index
+        parts = []
+        for values in reversed(self._blocks[block_index]):
+            offset, position = divmod(offset, len(values))
+            parts.append(values[position])
+        return self._key_getter(sum(reversed(parts), ()))
@@ -18,7 +18,7 @@ Provides pivot table models for the Tabular View.
 
 from PySide2.QtCore import Qt, Slot, QTimer, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 from PySide2.QtGui import QColor, QFont
-from .pivot_model import PivotModel
+from .pivot_model import PivotModel, ProductPivotModel
 from ...mvcmodels.shared import PARSED_ROLE
 from ...config import PIVOT_TABLE_HEADER_COLOR
 
@@ -124,6 +124,41 @@ class PivotTableModelBase(QAbstractTableModel):
         if not data:
             return
         row_count, column_count = self.model.add_to_model(data)
+        self._insert_data_rows_and_columns(row_count, column_count)
+
+    def remove_from_model(self, data):
+        if not data:
+            return
+        row_count, column_count = self.model.remove_from_model(data)
+        self._remove_data_rows_and_columns(row_count, column_count)
+
+    def add_factor_values(self, factor, values):
+        """Adds values to a factor of a product pivot model.
+
+        Args:
+            factor (int): factor index
+            values (list of tuple): value tuples to add
+        """
+        if not values:
+            return
+        row_count, column_count = self.model.add_factor_values(factor, values)
+        self._insert_data_rows_and_columns(row_count, column_count)
+
+    def remove_factor_values(self, factor, values):
+        """Removes values from a factor of a product pivot model.
+
+        Args:
+            factor (int): factor index
+            values (list of tuple): value tuples to remove
+        """
+        if not values:
+            return
+        row_count, column_count = self.model.remove_factor_values(factor, values)
+        self._remove_data_rows_and_columns(row_count, column_count)
+
+    def _insert_data_rows_and_columns(self, row_count, column_count):
+        if row_count < 0 or column_count < 0:
+            self._remove_data_rows_and_columns(max(-row_count, 0), max(-column_count, 0))
         if row_count > 0:
             first = self.headerRowCount() + self.dataRowCount()
             self.beginInsertRows(QModelIndex(), first, first + row_count - 1)
@@ -135,15 +170,16 @@ class PivotTableModelBase(QAbstractTableModel):
             self._data_column_count += column_count
             self.endInsertColumns()
 
-    def remove_from_model(self, data):
-        if not data:
-            return
-        row_count, column_count = self.model.remove_from_model(data)
+    def _remove_data_rows_and_columns(self, row_count, column_count):
+        if row_count < 0 or column_count < 0:
+            self._insert_data_rows_and_columns(max(-row_count, 0), max(-column_count, 0))
+        row_count = min(row_count, self._data_row_count)
         if row_count > 0:
             first = self.headerRowCount()
             self.beginRemoveRows(QModelIndex(), first, first + row_count - 1)
             self._data_row_count -= row_count
             self.endRemoveRows()
+        column_count = min(column_count, self._data_column_count)
         if column_count > 0:
             first = self.headerColumnCount()
             self.beginRemoveColumns(QModelIndex(), first, first + column_count - 1)
@@ -465,6 +501,9 @@ class PivotTableModelBase(QAbstractTableModel):
     def receive_data_added_or_removed(self, data, action):
         {"add": self.add_to_model, "remove": self.remove_from_model}[action](data)
 
+    def receive_factor_values_added_or_removed(self, factor, values, action):
+        {"add": self.add_factor_values, "remove": self.remove_factor_values}[action](factor, values)
+
 
 class TopLeftHeaderItem:
     """Base class for all 'top left pivot headers'.
@@ -596,6 +635,7 @@ class ParameterValuePivotTableModel(PivotTableModelBase):
             parent (DataStoreForm)
         """
         super().__init__(parent)
+        self.model = ProductPivotModel()
         self._object_class_count = None
 
     @property
@@ -670,7 +710,8 @@ class ParameterValuePivotTableModel(PivotTableModelBase):
     def call_reset_model(self, object_class_ids, pivot=None):
         """See base class."""
         self._object_class_count = len(object_class_ids)
-        data = self._parent.load_parameter_value_data()
+        self.model.set_factors((self._object_class_count, 1), self._parent.load_parameter_value_factors())
+        data = self._parent.load_full_parameter_value_data()
         top_left_headers = [TopLeftObjectHeaderItem(self, name, id_) for name, id_ in object_class_ids.items()]
         top_left_headers += [TopLeftParameterHeaderItem(self)]
         self.top_left_headers = {h.name: h for h in top_left_headers}
@@ -815,21 +856,25 @@ class ParameterValuePivotTableModel(PivotTableModelBase):
         objects = [x for x in items if x["class_id"] == self._parent.current_class_id]
         if not objects:
             return False
-        data = self._parent.load_empty_parameter_value_data(entities=objects)
-        self.receive_data_added_or_removed(data, action)
+        self._receive_entities_added_or_removed(objects, action)
         return True
 
     def receive_relationships_added_or_removed(self, relationships, action):
-        data = self._parent.load_empty_parameter_value_data(entities=relationships)
-        self.receive_data_added_or_removed(data, action)
+        self._receive_entities_added_or_removed(relationships, action)
         return True
 
     def receive_parameter_definitions_added_or_removed(self, parameters, action):
         parameter_ids = {x["id"] for x in parameters}
-        data = self._parent.load_empty_parameter_value_data(parameter_ids=parameter_ids)
-        self.receive_data_added_or_removed(data, action)
+        self._receive_parameter_ids_added_or_removed(parameter_ids, action)
         return True
 
+    def _receive_entities_added_or_removed(self, entities, action):
+        entity_ids = self._parent.get_entity_ids(entities)
+        self.receive_factor_values_added_or_removed(0, entity_ids, action)
+
+    def _receive_parameter_ids_added_or_removed(self, parameter_ids, action):
+        self.receive_factor_values_added_or_removed(1, [(id_,) for id_ in parameter_ids], action)
+
     def receive_parameter_values_added_or_removed(self, parameter_values, action):
         data = self._parent.load_full_parameter_value_data(parameter_values=parameter_values, action=action)
         self.update_model(data)
@@ -845,6 +890,7 @@ class IndexExpansionPivotTableModel(ParameterValuePivotTableModel):
             parent (DataStoreForm)
         """
         super().__init__(parent)
+        self.model = PivotModel()
         self._index_top_left_header = None
 
     def call_reset_model(self, object_class_ids, pivot=None):
@@ -904,17 +950,35 @@ class IndexExpansionPivotTableModel(ParameterValuePivotTableModel):
     def _update_parameter_values(self, items):
         self.db_mngr.update_expanded_parameter_values({self.db_map: items})
 
+    def _receive_entities_added_or_removed(self, entities, action):
+        data = self._parent.load_empty_parameter_value_data(entities=entities)
+        self.receive_data_added_or_removed(data, action)
+
+    def _receive_parameter_ids_added_or_removed(self, parameter_ids, action):
+        data = self._parent.load_empty_parameter_value_data(parameter_ids=parameter_ids)
+        self.receive_data_added_or_removed(data, action)
+
 
 class RelationshipPivotTableModel(PivotTableModelBase):
     """A model for the pivot table in relationship input type."""
 
+    def __init__(self, parent):
+        """
+        Args:
+            parent (DataStoreForm)
+        """
+        super().__init__(parent)
+        self.model = ProductPivotModel()
+
     @property
     def item_type(self):
         return "relationship"
 
     def call_reset_model(self, object_class_ids, pivot=None):
         """See base class."""
-        data = self._parent.load_relationship_data()
+        factors = self._parent.load_relationship_factors()
+        self.model.set_factors(len(factors) * (1,), factors)
+        data = self._parent.load_full_relationship_data()
         self.top_left_headers = {
             name: TopLeftObjectHeaderItem(self, name, id_) for name, id_ in object_class_ids.items()
         }
@@ -978,8 +1042,9 @@ class RelationshipPivotTableModel(PivotTableModelBase):
             objects_per_class.setdefault(item["class_id"], []).append(item)
         if not set(objects_per_class.keys()).intersection(self._parent.current_object_class_id_list):
             return False
-        data = self._parent.load_empty_relationship_data(objects_per_class=objects_per_class)
-        self.receive_data_added_or_removed(data, action)
+        for factor, object_class_id in enumerate(self._parent.current_object_class_id_list):
+            objects = objects_per_class.get(object_class_id, ())
+            self.receive_factor_values_added_or_removed(factor, [(x["id"],) for x in objects], action)
         return True
 
     def receive_relationships_added_or_removed(self, relationships, action):
@@ -16,6 +16,7 @@ Single models for parameter definitions and values (as 'for a single entity').
 :date:   28.6.2019
 """
 
+import numpy as np
 from PySide2.QtCore import Qt, QModelIndex
 from PySide2.QtGui import QGuiApplication
 from ...mvcmodels.minimal_table_model import MinimalTableModel
@@ -46,6 +47,7 @@ class SingleParameterModel(MinimalTableModel):
         self.entity_class_id = entity_class_id
         self._auto_filter = dict()  # Maps field to accepted ids for that field
         self._filter_parameter_ids = dict()
+        self._filter_columns = dict()  # Maps id key to a NumPy array of the corresponding id of each row
 
     @property
     def item_type(self):
@@ -96,6 +98,22 @@ class SingleParameterModel(MinimalTableModel):
         """This model doesn't support row insertion."""
         return False
 
+    def removeRows(self, row, count, parent=QModelIndex()):
+        """Reimplemented to drop the cached filter columns."""
+        self.invalidate_filter_columns()
+        return super().removeRows(row, count, parent)
+
+    def reset_model(self, main_data=None):
+        """Reimplemented to drop the cached filter columns."""
+        self.invalidate_filter_columns()
+        super().reset_model(main_data)
+
+    def invalidate_filter_columns(self):
+        """Drops the cached filter columns.
+        Must be called whenever the rows change or the ids of the items in the rows are updated.
+        """
+        self._filter_columns.clear()
+
     def item_id(self, row):
         return self._main_data[row]
 
@@ -215,31 +233,65 @@ class SingleParameterModel(MinimalTableModel):
         """Update items in db. Required by batch_set_data"""
         raise NotImplementedError()
 
-    def _filter_accepts_row(self, row):
-        return self._parameter_filter_accepts_row(row) and self._auto_filter_accepts_row(row)
+    def _filter_column(self, id_key):
+        """Returns an array with the value of given id key for each row.
+        The array is built from the db mngr cache on first request and then kept until invalidated.
 
-    def _parameter_filter_accepts_row(self, row):
-        """Returns the result of the parameter filter."""
+        Args:
+            id_key (str): key of the id in the db item, or 'id' for the item id itself
+
+        Returns:
+            ndarray
+        """
+        column = self._filter_columns.get(id_key)
+        if column is None:
+            if id_key == "id":
+                ids = self._main_data
+            else:
+                ids = [self.db_item_from_id(id_)[id_key] for id_ in self._main_data]
+            column = self._filter_columns[id_key] = np.array(ids, dtype=np.int64)
+        return column
+
+    @staticmethod
+    def _isin(column, accepted_ids):
+        """Returns a mask of the column elements that are in given ids."""
+        return np.isin(column, np.fromiter(accepted_ids, dtype=np.int64, count=len(accepted_ids)))
+
+    def _filter_masks(self):
+        """Returns boolean masks of the rows accepted by each active filter."""
+        masks = [self._parameter_filter_mask(), self._auto_filter_mask()]
+        return [mask for mask in masks if mask is not None]
+
+    def _parameter_filter_mask(self):
+        """Returns the result of the parameter filter or None if the filter is not active."""
         if not self._filter_parameter_ids:
-            return True
-        parameter_id = self.db_mngr.get_item(self.db_map, self.item_type, self._main_data[row])[
-            self.parameter_definition_id_key
-        ]
-        return parameter_id in self._filter_parameter_ids.get((self.db_map, self.entity_class_id), set())
+            return None
+        accepted_ids = self._filter_parameter_ids.get((self.db_map, self.entity_class_id), set())
+        return self._isin(self._filter_column(self.parameter_definition_id_key), accepted_ids)
 
-    def _auto_filter_accepts_row(self, row):
-        """Returns the result of the auto filter."""
+    def _auto_filter_mask(self):
+        """Returns the result of the auto filter or None if the filter is not active."""
         if self._auto_filter is None:
-            return False
-        item_id = self._main_data[row]
-        for accepted_ids in self._auto_filter.values():
-            if accepted_ids and item_id not in accepted_ids:
-                return False
-        return True
+            return np.zeros(self.rowCount(), dtype=bool)
+        masks = [
+            self._isin(self._filter_column("id"), accepted_ids)
+            for accepted_ids in self._auto_filter.values()
+            if accepted_ids
+        ]
+        if not masks:
+            return None
+        return np.logical_and.reduce(masks)
 
     def accepted_rows(self):
-        """Returns a list of accepted rows, for convenience."""
-        return [row for row in range(self.rowCount()) if self._filter_accepts_row(row)]
+        """Returns accepted rows in ascending order.
+
+        Returns:
+            list or range
+        """
+        masks = self._filter_masks()
+        if not masks:
+            return range(self.rowCount())
+        return np.flatnonzero(np.logical_and.reduce(masks)).tolist()
 
     def _get_field_item(self, field, id_):
         """Returns a item from the db_mngr.get_item depending on the
@@ -322,21 +374,21 @@ class SingleParameterValueMixin(ConvertToDBMixin):
     def item_type(self):
         return "parameter value"
 
-    def _filter_accepts_row(self, row):
+    def _filter_masks(self):
         """Reimplemented to also account for the entity filter."""
-        return (
-            self._parameter_filter_accepts_row(row)
-            and self._entity_filter_accepts_row(row)
-            and self._auto_filter_accepts_row(row)
-        )
-
-    def _entity_filter_accepts_row(self, row):
-        """Returns the result of the entity filter."""
+        masks = super()._filter_masks()
+        entity_mask = self._entity_filter_mask()
+        if entity_mask is not None:
+            masks.append(entity_mask)
+        return masks
+
+    def _entity_filter_mask(self):
+        """Returns the result of the entity filter or None if the filter is not active."""
         if not self._filter_entity_ids:
-            return True
+            return None
         entity_id_key = {"object class": "object_id", "relationship class": "relationship_id"}[self.entity_class_type]
-        entity_id = self.db_mngr.get_item(self.db_map, self.item_type, self._main_data[row])[entity_id_key]
-        return entity_id in self._filter_entity_ids.get((self.db_map, self.entity_class_id), set())
+        accepted_ids = self._filter_entity_ids.get((self.db_map, self.entity_class_id), set())
+        return self._isin(self._filter_column(entity_id_key), accepted_ids)
 
     def update_items_in_db(self, items):
         """Update items in db.
@@ -16,11 +16,149 @@ Classes for custom QGraphicsViews for the Entity graph view.
 :date:   6.2.2018
 """
 
-from PySide2.QtCore import Qt, QTimeLine
-from PySide2.QtWidgets import QMenu
-from PySide2.QtGui import QCursor
+import math
+import numpy as np
+from PySide2.QtCore import Qt, QTimeLine, QPointF
+from PySide2.QtWidgets import QMenu, QGraphicsView
+from PySide2.QtGui import QCursor, QPainterPath, QPen, QBrush
 from ...widgets.custom_qgraphicsviews import CustomQGraphicsView
-from ..graphics_items import ObjectItem, CrossHairsArcItem
+from ..graphics_items import ObjectItem, CrossHairsArcItem, EntityItem, ArcItem, DetailLevel
+
+# Minimum zoom factors of detail levels, the level is CLUSTERS below the last limit
+_DETAIL_LEVEL_ZOOM_LIMITS = ((0.5, DetailLevel.FULL), (0.25, DetailLevel.NO_LABELS), (0.08, DetailLevel.PLAIN))
+# Approximate size of cluster cells on screen in pixels
+_CLUSTER_CELL_PIXELS = 32
+
+
+def detail_level(zoom_factor):
+    """Returns the detail level to use at given zoom.
+
+    Args:
+        zoom_factor (float): view's zoom factor
+
+    Returns:
+        DetailLevel: detail level
+    """
+    for min_zoom, level in _DETAIL_LEVEL_ZOOM_LIMITS:
+        if zoom_factor >= min_zoom:
+            return level
+    return DetailLevel.CLUSTERS
+
+
+class GraphOverview:
+    """Batched drawing of the Entity graph for the coarse detail levels."""
+
+    def __init__(self, items):
+        """
+        Args:
+            items (Iterable of QGraphicsItem): scene's items
+        """
+        vertex_inds = dict()
+        positions = list()
+        arc_items = list()
+        for item in items:
+            if not item.isVisible():
+                continue
+            if isinstance(item, ArcItem):
+                arc_items.append(item)
+            elif isinstance(item, EntityItem):
+                vertex_inds[item] = len(positions)
+                pos = item.pos()
+                positions.append((pos.x(), pos.y()))
+        arcs = [
+            (vertex_inds[arc.rel_item], vertex_inds[arc.obj_item])
+            for arc in arc_items
+            if arc.rel_item in vertex_inds and arc.obj_item in vertex_inds
+        ]
+        self._positions = np.array(positions, dtype=float).reshape(-1, 2)
+        self._arcs = np.array(arcs, dtype=int).reshape(-1, 2)
+        self._arc_pen = QPen(arc_items[0].pen()) if arc_items else QPen()
+        self._arc_path = None
+        self._cluster_cell_size = None
+        self._cluster_paths = None
+
+    def paint_arcs(self, painter):
+        """Paints all arcs as a single path.
+
+        Args:
+            painter (QPainter)
+        """
+        if self._arc_path is None:
+            self._arc_path = _lines_path(self._positions, self._arcs)
+        painter.setPen(self._arc_pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self._arc_path)
+
+    def paint_clusters(self, painter, zoom_factor):
+        """Paints entities aggregated into grid cells and the arcs between the cells.
+
+        Args:
+            painter (QPainter)
+            zoom_factor (float): view's zoom factor
+        """
+        # Cell sizes are powers of two so clusters stay put while zooming within a range.
+        cell_size = 2.0 ** math.ceil(math.log2(_CLUSTER_CELL_PIXELS / zoom_factor))
+        if cell_size != self._cluster_cell_size:
+            self._cluster_cell_size = cell_size
+            self._cluster_paths = self._make_cluster_paths(cell_size, zoom_factor)
+        arc_path, vertex_path = self._cluster_paths
+        pen = QPen(self._arc_pen)
+        pen.setCosmetic(True)
+        pen.setWidthF(1.0)
+        painter.setPen(pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(arc_path)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(self._arc_pen.color()))
+        painter.drawPath(vertex_path)
+
+    def _make_cluster_paths(self, cell_size, zoom_factor):
+        """Aggregates vertices into grid cells.
+
+        Args:
+            cell_size (float): cell size in scene coordinates
+            zoom_factor (float): view's zoom factor
+
+        Returns:
+            tuple: path of arcs between the clusters and path of cluster dots
+        """
+        vertex_path = QPainterPath()
+        if not len(self._positions):
+            return QPainterPath(), vertex_path
+        cells = np.floor(self._positions / cell_size).astype(np.int64)
+        _, cluster_inds, counts = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+        cluster_inds = cluster_inds.reshape(-1)
+        centers = np.column_stack(
+            (
+                np.bincount(cluster_inds, weights=self._positions[:, 0]) / counts,
+                np.bincount(cluster_inds, weights=self._positions[:, 1]) / counts,
+            )
+        )
+        cluster_arcs = np.sort(cluster_inds[self._arcs], axis=1)
+        cluster_arcs = cluster_arcs[cluster_arcs[:, 0] != cluster_arcs[:, 1]]
+        if len(cluster_arcs):
+            cluster_arcs = np.unique(cluster_arcs, axis=0)
+        pixel_radii = np.minimum(2.0 + np.sqrt(counts), 0.5 * _CLUSTER_CELL_PIXELS)
+        for (x, y), radius in zip(centers, pixel_radii / zoom_factor):
+            vertex_path.addEllipse(QPointF(x, y), radius, radius)
+        return _lines_path(centers, cluster_arcs), vertex_path
+
+
+def _lines_path(positions, lines):
+    """Returns a path made of straight lines.
+
+    Args:
+        positions (numpy.ndarray): point coordinates
+        lines (numpy.ndarray): pairs of point indexes
+
+    Returns:
+        QPainterPath
+    """
+    path = QPainterPath()
+    for x1, y1, x2, y2 in np.column_stack((positions[lines[:, 0]], positions[lines[:, 1]])).tolist():
+        path.moveTo(x1, y1)
+        path.lineTo(x2, y2)
+    return path
 
 
 class EntityQGraphicsView(CustomQGraphicsView):
@@ -38,6 +176,12 @@ class EntityQGraphicsView(CustomQGraphicsView):
         self._hovered_obj_item = None
         self.relationship_class = None
         self.cross_hairs_items = []
+        self._detail_level = DetailLevel.FULL
+        self._entity_scale = None
+        self._arc_scale = None
+        self._overview = None
+        # Many items change at once e.g. when rotating, repainting their bounding rect is cheaper.
+        self.setViewportUpdateMode(QGraphicsView.BoundingRectViewportUpdate)
 
     def set_cross_hairs_items(self, relationship_class, cross_hairs_items):
         """Sets 'cross_hairs' items for relationship creation.
@@ -167,12 +311,66 @@ class EntityQGraphicsView(CustomQGraphicsView):
 
     def _zoom(self, factor):
         self.scale(factor, factor)
-        self.apply_zoom()
+        self._apply_zoom_to_items(force=False)
 
     def apply_zoom(self):
+        """Applies current zoom factor and detail level to all items."""
+        self._apply_zoom_to_items(force=True)
+
+    def _apply_zoom_to_items(self, force):
+        """Applies current zoom factor and detail level to items.
+
+        Items are visited only when their look actually changes:
+        entities scale only when zoomed out, arcs only when zoomed in,
+        and neither needs updating while the view draws them in batch.
+
+        Args:
+            force (bool): if True, visits all items and rebuilds the batched drawing
+        """
+        zoom_factor = self.zoom_factor
+        level = detail_level(zoom_factor)
+        level_changed = force or level != self._detail_level
+        self._detail_level = level
+        entity_scale = min(zoom_factor, 1.0)
+        arc_scale = max(zoom_factor, 1.0)
+        update_entities = level_changed or (level < DetailLevel.CLUSTERS and entity_scale != self._entity_scale)
+        update_arcs = level_changed or (level < DetailLevel.PLAIN and arc_scale != self._arc_scale)
+        if level_changed:
+            self.invalidate_overview()
+        if update_entities:
+            self._entity_scale = entity_scale
+        if update_arcs:
+            self._arc_scale = arc_scale
+        if not update_entities and not update_arcs:
+            return
         for item in self.items():
+            if isinstance(item, ArcItem):
+                if not update_arcs:
+                    continue
+            elif not update_entities:
+                continue
             if hasattr(item, "apply_zoom"):
-                item.apply_zoom(self.zoom_factor)
+                item.apply_zoom(zoom_factor)
+            if level_changed and hasattr(item, "set_detail_level") and item not in self.cross_hairs_items:
+                item.set_detail_level(level)
+
+    def invalidate_overview(self):
+        """Discards the batched drawing of the graph so it gets rebuilt on next paint."""
+        self._overview = None
+        if self._detail_level >= DetailLevel.PLAIN:
+            self.viewport().update()
+
+    def drawBackground(self, painter, rect):
+        """Draws arcs or clusters in batch on the coarse detail levels."""
+        super().drawBackground(painter, rect)
+        if self._detail_level < DetailLevel.PLAIN or self.scene() is None:
+            return
+        if self._overview is None:
+            self._overview = GraphOverview(item for item in self.scene().items() if item not in self.cross_hairs_items)
+        if self._detail_level == DetailLevel.PLAIN:
+            self._overview.paint_arcs(painter)
+        else:
+            self._overview.paint_clusters(painter, self.zoom_factor)
 
     def wheelEvent(self, event):
         """Zooms in/out. If user has pressed the shift key, rotates instead.
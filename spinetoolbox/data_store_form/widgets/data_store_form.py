@@ -53,7 +53,7 @@ from ...helpers import (
 from .import_dialog import ImportDialog
 from ...widgets.parameter_value_editor import ParameterValueEditor
 from ...widgets.settings_widget import DataStoreSettingsWidget
-from ...spine_io.exporters.excel import export_spine_database_to_xlsx
+from ...spine_io.exporters.excel import stream_spine_database_to_xlsx
 from ...spine_io.importers.excel_reader import get_mapped_data_from_xlsx
 from ...spine_db_parcel import SpineDBParcel
 
@@ -485,7 +485,7 @@ class DataStoreFormBase(QMainWindow):
         import_data(db_map, **data_for_export)
         file_name = os.path.split(file_path)[1]
         try:
-            export_spine_database_to_xlsx(db_map, file_path)
+            stream_spine_database_to_xlsx(db_map, file_path)
         except PermissionError:
             self.msg_error.emit(
                 f"Unable to export file <b>{file_name}</b>.<br/>" "Close the file in Excel and try again."
@@ -531,11 +531,6 @@ class DataStoreFormBase(QMainWindow):
             self.ui.horizontalLayout_exports.removeWidget(button)
             button.hide()
 
-    def reload_session(self, db_maps):
-        """Reloads data from given db_maps."""
-        self.init_models()
-        self.db_mngr.fetch_db_maps_for_listener(self, *db_maps)
-
     @Slot(bool)
     def refresh_session(self, checked=False):
         self.db_mngr.refresh_session(*self.db_maps)
@@ -558,14 +553,13 @@ class DataStoreFormBase(QMainWindow):
             msg = f"All changes in {db_names} committed successfully."
             self.msg.emit(msg)
         else:  # Commit done by an 'outside force'.
-            self.reload_session(db_maps)
-            self.msg.emit(f"Databases {db_names} reloaded from an external action.")
+            if self.db_mngr.refresh_cache(*db_maps):
+                self.msg.emit(f"Databases {db_names} reloaded from an external action.")
 
     def receive_session_rolled_back(self, db_maps):
         db_maps = set(self.db_maps) & set(db_maps)
         if not db_maps:
             return
-        self.reload_session(db_maps)
         db_names = ", ".join([x.codename for x in db_maps])
         msg = f"All changes in {db_names} rolled back successfully."
         self.msg.emit(msg)
@@ -574,7 +568,6 @@ class DataStoreFormBase(QMainWindow):
         db_maps = set(self.db_maps) & set(db_maps)
         if not db_maps:
             return
-        self.reload_session(db_maps)
         self.msg.emit("Session refreshed.")
 
     @Slot(bool)
@@ -19,12 +19,18 @@ Contains the GraphViewMixin class.
 import enum
 import numpy as np
 from numpy import atleast_1d as arr
+from scipy.sparse import csr_matrix, triu
 from scipy.sparse.csgraph import dijkstra
 from PySide2.QtCore import Signal, Slot, QObject, QThread, Qt
 from PySide2.QtWidgets import QProgressBar, QDialogButtonBox, QLabel, QWidget, QVBoxLayout, QHBoxLayout
 from PySide2.QtGui import QPainter, QColor
 from spinetoolbox.helpers import busy_effect
 
+# Graphs with more vertices than this are laid out using sparse stress instead of full stress
+_SPARSE_LAYOUT_THRESHOLD = 2000
+# Number of pivots in sparse stress layout per binary logarithm of vertex count
+_PIVOTS_PER_LOG2_VERTEX = 4
+
 
 @busy_effect
 def make_heat_map(x, y, values):
@@ -139,22 +145,31 @@ class GraphLayoutGenerator(QObject):
     def start(self):
         self.started.emit()
 
-    def shortest_path_matrix(self):
-        """Returns the shortest-path matrix.
+    def adjacency_matrix(self):
+        """Returns the sparse adjacency matrix with link lengths as entries.
+
+        Returns:
+            csr_matrix
         """
         if not self.src_inds:
             # Introduce fake pair of links to help 'spreadness'
             self.src_inds = [self.vertex_count, self.vertex_count]
             self.dst_inds = [np.random.randint(0, self.vertex_count), np.random.randint(0, self.vertex_count)]
             self.vertex_count += 1
-        dist = np.zeros((self.vertex_count, self.vertex_count))
         src_inds = arr(self.src_inds)
         dst_inds = arr(self.dst_inds)
+        shape = (self.vertex_count, self.vertex_count)
         try:
-            dist[src_inds, dst_inds] = dist[dst_inds, src_inds] = self.spread
-        except IndexError:
-            pass
-        matrix = dijkstra(dist, directed=False)
+            adjacency = csr_matrix((np.ones(len(src_inds)), (src_inds, dst_inds)), shape=shape)
+        except ValueError:
+            return csr_matrix(shape)
+        adjacency.data[:] = self.spread  # csr_matrix sums up duplicate links
+        return adjacency
+
+    def shortest_path_matrix(self):
+        """Returns the shortest-path matrix.
+        """
+        matrix = dijkstra(self.adjacency_matrix(), directed=False)
         # Remove infinites and zeros
         matrix[matrix == np.inf] = self.spread * self.vertex_count ** (0.5)
         matrix[matrix == 0] = self.spread * 1e-6
@@ -183,6 +198,15 @@ class GraphLayoutGenerator(QObject):
             return
         self.finished.emit(x, y)
 
+    def _heavy_indexes_and_positions(self):
+        """Returns indexes and positions of pinned vertices as arrays."""
+        heavy_ind_list = list()
+        heavy_pos_list = list()
+        for ind, pos in self.heavy_positions.items():
+            heavy_ind_list.append(ind)
+            heavy_pos_list.append([pos["x"], pos["y"]])
+        return arr(heavy_ind_list), arr(heavy_pos_list)
+
     @Slot()
     def get_coordinates(self):
         """Computes and returns x and y coordinates for each vertex in the graph, using VSGD-MS."""
@@ -191,20 +215,16 @@ class GraphLayoutGenerator(QObject):
             x, y = [0], [0]
             self.emit_finished(x, y)
             return x, y
+        if self.vertex_count > _SPARSE_LAYOUT_THRESHOLD:
+            return self._get_sparse_coordinates()
         matrix = self.shortest_path_matrix()
         mask = np.ones((self.vertex_count, self.vertex_count)) == 1 - np.tril(
             np.ones((self.vertex_count, self.vertex_count))
         )  # Upper triangular except diagonal
         np.random.seed(0)
         layout = np.random.rand(self.vertex_count, 2) * self.initial_diameter - self.initial_diameter / 2
-        heavy_ind_list = list()
-        heavy_pos_list = list()
-        for ind, pos in self.heavy_positions.items():
-            heavy_ind_list.append(ind)
-            heavy_pos_list.append([pos["x"], pos["y"]])
-        heavy_ind = arr(heavy_ind_list)
-        heavy_pos = arr(heavy_pos_list)
-        if heavy_ind.any():
+        heavy_ind, heavy_pos = self._heavy_indexes_and_positions()
+        if heavy_ind.size:
             layout[heavy_ind, :] = heavy_pos
         weights = matrix ** self.weight_exp  # bus-pair weights (lower for distant buses)
         maxstep = 1 / np.min(weights[mask])
@@ -228,7 +248,7 @@ class GraphLayoutGenerator(QObject):
                 dx2 = -dx1
                 layout[v1, :] += dx1  # update position
                 layout[v2, :] += dx2
-                if heavy_ind.any():
+                if heavy_ind.size:
                     layout[heavy_ind, :] = heavy_pos
             else:  # nobreak
                 continue
@@ -236,3 +256,121 @@ class GraphLayoutGenerator(QObject):
         x, y = layout[:, 0], layout[:, 1]
         self.emit_finished(x, y)
         return x, y
+
+    def _get_sparse_coordinates(self):
+        """Computes and returns x and y coordinates for each vertex in a large graph using sparse stress.
+
+        Instead of all vertex pairs, only linked vertices and a few pivot vertices per vertex contribute to stress.
+        The layout is initialized by pivot MDS and refined by localized stress majorization
+        which takes O(N log N) time per iteration.
+        """
+        adjacency = self.adjacency_matrix()
+        pivot_count = min(self.vertex_count, int(np.ceil(_PIVOTS_PER_LOG2_VERTEX * np.log2(self.vertex_count))))
+        np.random.seed(0)
+        pivots, pivot_matrix = self._pivot_shortest_paths(adjacency, pivot_count)
+        heavy_ind, heavy_pos = self._heavy_indexes_and_positions()
+        if pivots is None:
+            layout = np.random.rand(self.vertex_count, 2) * self.initial_diameter - self.initial_diameter / 2
+            if heavy_ind.size:
+                layout[heavy_ind, :] = heavy_pos
+            x, y = layout[:, 0], layout[:, 1]
+            self.emit_finished(x, y)
+            return x, y
+        layout = self._pivot_mds_layout(pivot_matrix)
+        if heavy_ind.size:
+            layout += heavy_pos.mean(axis=0) - layout[heavy_ind].mean(axis=0)
+            layout[heavy_ind, :] = heavy_pos
+        links = triu(adjacency + adjacency.T, k=1).tocoo()
+        link_weight = self.spread ** self.weight_exp
+        closest_pivots = np.argmin(pivot_matrix, axis=0)
+        region_sizes = np.bincount(closest_pivots, minlength=len(pivots))
+        pivot_weights = region_sizes[:, None] * pivot_matrix ** self.weight_exp
+        pivot_weights[np.arange(len(pivots)), pivots] = 0.0
+        for iteration in range(self.iterations):
+            self.progressed.emit(iteration)
+            if self._state in (_State.STOPPED, _State.CANCELLED):
+                break
+            numerator = np.zeros_like(layout)
+            denominator = np.zeros(self.vertex_count)
+            self._add_link_terms(layout, links.row, links.col, link_weight, numerator, denominator)
+            for pivot, distances, weights in zip(pivots, pivot_matrix, pivot_weights):
+                self._add_pivot_terms(layout, pivot, distances, weights, numerator, denominator)
+            movable = denominator > 0
+            layout[movable] = numerator[movable] / denominator[movable, None]
+            if heavy_ind.size:
+                layout[heavy_ind, :] = heavy_pos
+        x, y = layout[:, 0], layout[:, 1]
+        self.emit_finished(x, y)
+        return x, y
+
+    def _pivot_shortest_paths(self, adjacency, pivot_count):
+        """Selects pivots using max-min strategy and computes their shortest-path distances to all vertices.
+
+        Args:
+            adjacency (csr_matrix): adjacency matrix
+            pivot_count (int): number of pivots to select
+
+        Returns:
+            tuple: pivot indexes and a pivot_count × vertex_count distance matrix, or None, None if cancelled
+        """
+        pivots = np.zeros(pivot_count, dtype=int)
+        matrix = np.empty((pivot_count, self.vertex_count))
+        min_distances = np.full(self.vertex_count, np.inf)
+        pivot = np.random.randint(self.vertex_count)
+        for k in range(pivot_count):
+            if self._state in (_State.STOPPED, _State.CANCELLED):
+                return None, None
+            pivots[k] = pivot
+            matrix[k] = dijkstra(adjacency, directed=False, indices=pivot)
+            min_distances = np.minimum(min_distances, matrix[k])
+            pivot = np.argmax(min_distances)  # Unreachable vertices come first so every component gets a pivot
+        matrix[matrix == np.inf] = self.spread * self.vertex_count ** (0.5)
+        matrix[matrix == 0] = self.spread * 1e-6
+        return pivots, matrix
+
+    def _pivot_mds_layout(self, pivot_matrix):
+        """Returns an initial layout computed by pivot MDS.
+
+        Args:
+            pivot_matrix (ndarray): pivot shortest-path distances
+
+        Returns:
+            ndarray: vertex_count × 2 layout
+        """
+        squared = pivot_matrix ** 2
+        centered = -0.5 * (
+            squared - squared.mean(axis=0) - squared.mean(axis=1)[:, None] + squared.mean()
+        )  # double centering
+        _, eigenvectors = np.linalg.eigh(centered @ centered.T)
+        layout = centered.T @ eigenvectors[:, -1:-3:-1]
+        if layout.shape[1] < 2 or not np.any(layout):
+            return np.random.rand(self.vertex_count, 2) * self.initial_diameter - self.initial_diameter / 2
+        layout += np.random.rand(self.vertex_count, 2) * self.spread * 1e-3  # separate coinciding vertices
+        # Scale so that layout distances to the first pivot match graph distances in the least-squares sense
+        distances = np.linalg.norm(layout - layout[np.argmin(pivot_matrix[0])], axis=1)
+        scale = np.dot(distances, pivot_matrix[0]) / np.dot(distances, distances)
+        return layout * scale
+
+    def _add_link_terms(self, layout, sources, targets, weight, numerator, denominator):
+        """Adds stress majorization terms of links to the numerator and denominator of the vertex update."""
+        delta = layout[sources] - layout[targets]
+        dist = np.linalg.norm(delta, axis=1)
+        dist[dist == 0] = self.spread * 1e-6
+        correction = (self.spread / dist)[:, None] * delta
+        for vertices, others, sign in ((sources, targets, 1.0), (targets, sources, -1.0)):
+            suggestion = layout[others] + sign * correction
+            for coordinate in range(2):
+                numerator[:, coordinate] += weight * np.bincount(
+                    vertices, weights=suggestion[:, coordinate], minlength=self.vertex_count
+                )
+            denominator += weight * np.bincount(vertices, minlength=self.vertex_count)
+
+    def _add_pivot_terms(self, layout, pivot, distances, weights, numerator, denominator):
+        """Adds stress majorization terms between all vertices and a pivot to the numerator and denominator
+        of the vertex update."""
+        delta = layout - layout[pivot]
+        dist = np.linalg.norm(delta, axis=1)
+        dist[dist == 0] = self.spread * 1e-6
+        suggestion = layout[pivot] + (distances / dist)[:, None] * delta
+        numerator += weights[:, None] * suggestion
+        denominator += weights
@@ -65,6 +65,7 @@ class GraphViewMixin:
         self.relationship_ids = list()
         self.src_inds = list()
         self.dst_inds = list()
+        self.object_id_lists = dict()
         self.hidden_items = list()
         self.prunned_entity_ids = dict()
         self.removed_items = list()
@@ -78,6 +79,9 @@ class GraphViewMixin:
         self.zoom_widget_action = None
         self.rotate_widget_action = None
         self.layout_gens = list()
+        self._pending_graph_update = None
+        self._object_ids_per_relationship = None
+        self._relationship_ids_per_object = None
         self.ui.graphicsView.connect_data_store_form(self)
         self.setup_widget_actions()
 
@@ -89,6 +93,8 @@ class GraphViewMixin:
 
     def init_models(self):
         super().init_models()
+        self._object_ids_per_relationship = None
+        self._relationship_ids_per_object = None
         self.scene = CustomGraphicsScene(self)
         self.ui.graphicsView.setScene(self.scene)
 
@@ -106,7 +112,7 @@ class GraphViewMixin:
         self.ui.actionSave_positions.triggered.connect(self.save_positions)
         self.ui.actionClear_positions.triggered.connect(self.clear_saved_positions)
         self.ui.actionExport_graph_as_pdf.triggered.connect(self.export_as_pdf)
-        self.ui.actionRebuild_graph.triggered.connect(self.build_graph)
+        self.ui.actionRebuild_graph.triggered.connect(self.rebuild_graph_from_scratch)
         self.ui.actionFull_relationship_expansion.toggled.connect(self.set_full_relationship_expansion)
         self.ui.menuAdd_parameter_heat_map.triggered.connect(self.add_heat_map)
         # Dock Widgets menu action
@@ -164,6 +170,7 @@ class GraphViewMixin:
         """
         super().receive_relationships_added(db_map_data)
         relationships = db_map_data.get(self.db_map, [])
+        self._index_relationships(relationships)
         added_ids = {x["id"] for x in relationships}
         restored_ids = self.restore_removed_entities(added_ids)
         added_ids -= restored_ids
@@ -172,6 +179,26 @@ class GraphViewMixin:
             self.build_graph(persistent=True)
             self._end_add_relationships()
 
+    def receive_relationships_fetched(self, db_map_data):
+        """Runs when relationships are fetched from the db. Updates the adjacency index.
+
+        Args:
+            db_map_data (dict): list of dictionary-items keyed by DiffDatabaseMapping instance.
+        """
+        super().receive_relationships_fetched(db_map_data)
+        self._index_relationships(db_map_data.get(self.db_map, []))
+
+    def receive_relationships_updated(self, db_map_data):
+        """Runs when relationships are updated in the db. Updates the adjacency index.
+
+        Args:
+            db_map_data (dict): list of dictionary-items keyed by DiffDatabaseMapping instance.
+        """
+        super().receive_relationships_updated(db_map_data)
+        relationships = db_map_data.get(self.db_map, [])
+        self._unindex_relationships(relationships)
+        self._index_relationships(relationships)
+
     def receive_object_classes_updated(self, db_map_data):
         super().receive_object_classes_updated(db_map_data)
         self.refresh_icons(db_map_data)
@@ -210,6 +237,7 @@ class GraphViewMixin:
             db_map_data (dict): list of dictionary-items keyed by DiffDatabaseMapping instance.
         """
         super().receive_relationships_removed(db_map_data)
+        self._unindex_relationships(db_map_data.get(self.db_map, []))
         self.hide_removed_entities(db_map_data)
 
     def restore_removed_entities(self, added_ids):
@@ -290,23 +318,44 @@ class GraphViewMixin:
         self.added_relationship_ids.clear()
         self.build_graph()
 
-    def build_graph(self, persistent=False):
+    @Slot(bool)
+    def rebuild_graph_from_scratch(self, checked=False):
+        """Builds the graph discarding the current layout."""
+        self.build_graph(incremental=False)
+
+    def build_graph(self, persistent=False, incremental=True):
         """Builds the graph.
 
         Args:
             persistent (bool, optional): If True, builds the graph on top of the current one.
+            incremental (bool, optional): If True and there is a graph already,
+                only the entities that entered or left the graph are added to or removed from the scene.
+                Ignored if the scene has state that only a full build resets, see ``_can_update_incrementally()``.
         """
         if not self.ui.dockWidget_entity_graph.isVisible():
             return
         self.ui.graphicsView.clear_cross_hairs_items()  # Needed
         self._persistent = persistent
+        self._pending_graph_update = None
         for layout_gen in self.layout_gens:
             layout_gen.stop()
         self._update_graph_data()
+        if incremental and self._can_update_incrementally():
+            self._update_graph_incrementally()
+            return
         layout_gen = self._make_layout_generator()
+        self._start_layout_generator(layout_gen, self._complete_graph)
+
+    def _start_layout_generator(self, layout_gen, slot):
+        """Starts given layout generator.
+
+        Args:
+            layout_gen (GraphLayoutGenerator)
+            slot (Callable): slot to call with the coordinates once the layout is finished
+        """
         self.layout_gens.append(layout_gen)
         layout_gen.show_progress_widget(self.ui.graphicsView)
-        layout_gen.finished.connect(self._complete_graph)
+        layout_gen.finished.connect(slot)
         layout_gen.done.connect(lambda layout_gen=layout_gen: self.layout_gens.remove(layout_gen))
         layout_gen.start()
 
@@ -333,8 +382,7 @@ class GraphViewMixin:
             self.ui.actionExport_graph_as_pdf.setEnabled(True)
         if not self._persistent:
             self.ui.graphicsView.reset_zoom()
-        else:
-            self.ui.graphicsView.apply_zoom()
+        self.ui.graphicsView.apply_zoom()
         self.graph_build_finished.emit()
 
     def _get_selected_entity_ids(self):
@@ -366,13 +414,70 @@ class GraphViewMixin:
             selected_relationship_ids.update(relationship_ids)
         return selected_object_ids, selected_relationship_ids
 
+    def _build_relationship_index(self):
+        """Builds the object to relationship adjacency index from the db cache unless it exists already."""
+        if self._object_ids_per_relationship is not None:
+            return
+        self._object_ids_per_relationship = dict()
+        self._relationship_ids_per_object = dict()
+        self._index_relationships(self.db_mngr.get_items(self.db_map, "relationship"))
+
+    def _index_relationships(self, relationships):
+        """Adds given relationships to the adjacency index.
+
+        Args:
+            relationships (list(dict)): relationship items
+        """
+        if self._object_ids_per_relationship is None:
+            return
+        for relationship in relationships:
+            object_id_list = [int(id_) for id_ in relationship["object_id_list"].split(",")]
+            self._object_ids_per_relationship[relationship["id"]] = object_id_list
+            for object_id in object_id_list:
+                self._relationship_ids_per_object.setdefault(object_id, set()).add(relationship["id"])
+
+    def _unindex_relationships(self, relationships):
+        """Removes given relationships from the adjacency index.
+
+        Args:
+            relationships (list(dict)): relationship items
+        """
+        if self._object_ids_per_relationship is None:
+            return
+        for relationship in relationships:
+            object_id_list = self._object_ids_per_relationship.pop(relationship["id"], ())
+            for object_id in object_id_list:
+                relationship_ids = self._relationship_ids_per_object.get(object_id)
+                if relationship_ids is None:
+                    continue
+                relationship_ids.discard(relationship["id"])
+                if not relationship_ids:
+                    del self._relationship_ids_per_object[object_id]
+
     def _get_all_relationships_for_graph(self, object_ids, relationship_ids):
-        cond = any if self._full_relationship_expansion else all
-        return [
-            x
-            for x in self.db_mngr.get_items(self.db_map, "relationship")
-            if cond([int(id_) in object_ids for id_ in x["object_id_list"].split(",")])
-        ] + [self.db_mngr.get_item(self.db_map, "relationship", id_) for id_ in relationship_ids]
+        """Returns the relationships to include in the graph.
+
+        Args:
+            object_ids (set(int)): ids of objects in the graph
+            relationship_ids (set(int)): ids of relationships that are in the graph regardless of their objects
+
+        Returns:
+            dict: mapping from relationship id to object id list
+        """
+        self._build_relationship_index()
+        candidate_ids = {
+            relationship_id
+            for object_id in object_ids
+            for relationship_id in self._relationship_ids_per_object.get(object_id, ())
+        }
+        if not self._full_relationship_expansion:
+            candidate_ids = {
+                id_
+                for id_ in candidate_ids
+                if all(object_id in object_ids for object_id in self._object_ids_per_relationship[id_])
+            }
+        candidate_ids.update(id_ for id_ in relationship_ids if id_ in self._object_ids_per_relationship)
+        return {id_: self._object_ids_per_relationship[id_] for id_ in sorted(candidate_ids)}
 
     def _update_graph_data(self):
         """Updates data for graph according to selection in trees."""
@@ -383,20 +488,17 @@ class GraphViewMixin:
         relationship_ids -= prunned_entity_ids
         relationships = self._get_all_relationships_for_graph(object_ids, relationship_ids)
         object_id_lists = dict()
-        for relationship in relationships:
-            if relationship["id"] in prunned_entity_ids:
+        for relationship_id, object_id_list in relationships.items():
+            if relationship_id in prunned_entity_ids:
                 continue
-            object_id_list = [
-                id_
-                for id_ in (int(x) for x in relationship["object_id_list"].split(","))
-                if id_ not in prunned_entity_ids
-            ]
+            object_id_list = [id_ for id_ in object_id_list if id_ not in prunned_entity_ids]
             if len(object_id_list) < 2:
                 continue
             object_ids.update(object_id_list)
-            object_id_lists[relationship["id"]] = object_id_list
+            object_id_lists[relationship_id] = object_id_list
         self.object_ids = list(object_ids)
         self.relationship_ids = list(object_id_lists)
+        self.object_id_lists = object_id_lists
         self._update_src_dst_inds(object_id_lists)
 
     def _update_src_dst_inds(self, object_id_lists):
@@ -468,6 +570,174 @@ class GraphViewMixin:
         for item in self.object_items + self.relationship_items + self.arc_items:
             self.scene.addItem(item)
 
+    def _can_update_incrementally(self):
+        """Checks if diffing the graph into the scene gives the same graph as a full build would.
+
+        Persistent builds re-layout around all current items, and a full build clears
+        hidden, removed and heat map items from the scene.
+
+        Returns:
+            bool: True if the graph can be updated incrementally, False otherwise
+        """
+        return (
+            bool(self.object_items)
+            and not self._persistent
+            and not self.hidden_items
+            and not self.removed_items
+            and not self.heat_map_items
+        )
+
+    def _update_graph_incrementally(self):
+        """Diffs the current graph data into the scene.
+
+        Items of entities that left the graph are removed right away.
+        Entities that entered the graph are laid out locally around their neighbours already in the scene
+        which stay pinned to their current positions.
+        """
+        object_items = {item.entity_id: item for item in self.object_items}
+        relationship_items = {item.entity_id: item for item in self.relationship_items}
+        object_ids = set(self.object_ids)
+        relationship_ids = set(self.relationship_ids)
+        obsolete_items = [item for id_, item in object_items.items() if id_ not in object_ids] + [
+            item for id_, item in relationship_items.items() if id_ not in relationship_ids
+        ]
+        self._remove_graph_items(obsolete_items)
+        new_object_ids = [id_ for id_ in self.object_ids if id_ not in object_items]
+        new_relationship_ids = [id_ for id_ in self.relationship_ids if id_ not in relationship_items]
+        if not new_object_ids and not new_relationship_ids:
+            self._finish_graph_update()
+            return
+        new_ids = new_object_ids + new_relationship_ids
+        vertex_inds = {id_: k for k, id_ in enumerate(new_ids)}
+        pinned_items = {**object_items, **relationship_items}
+        heavy_positions = {}
+        links = list()
+        for relationship_id, object_id_list in self.object_id_lists.items():
+            new_relationship = relationship_id not in pinned_items
+            links += [
+                (relationship_id, object_id)
+                for object_id in object_id_list
+                if new_relationship or object_id not in pinned_items
+            ]
+        anchor_ids = {id_ for link in links for id_ in link if id_ in pinned_items}
+        # Links around the anchors keep the new vertices off the neighbourhood they attach to.
+        links += list(
+            {
+                (arc_item.rel_item.entity_id, arc_item.obj_item.entity_id)
+                for id_ in anchor_ids
+                for arc_item in pinned_items[id_].arc_items
+            }
+        )
+        src_inds = list()
+        dst_inds = list()
+        for link in links:
+            for id_ in link:
+                if id_ not in vertex_inds:
+                    ind = vertex_inds[id_] = len(vertex_inds)
+                    pos = pinned_items[id_].pos()
+                    heavy_positions[ind] = {"x": pos.x(), "y": pos.y()}
+            relationship_id, object_id = link
+            src_inds.append(vertex_inds[relationship_id])
+            dst_inds.append(vertex_inds[object_id])
+        self._pending_graph_update = (new_object_ids, new_relationship_ids, bool(heavy_positions))
+        layout_gen = GraphLayoutGenerator(
+            len(vertex_inds), src_inds, dst_inds, self._ARC_LENGTH_HINT, heavy_positions=heavy_positions
+        )
+        self._start_layout_generator(layout_gen, self._complete_graph_update)
+
+    @Slot(object, object)
+    def _complete_graph_update(self, x, y):
+        """Adds the items of the entities that entered the graph to the scene.
+
+        Args:
+            x (list): Horizontal coordinates of new vertices followed by their pinned neighbours
+            y (list): Vertical coordinates of new vertices followed by their pinned neighbours
+        """
+        if self.layout_gens or self._pending_graph_update is None:
+            return
+        new_object_ids, new_relationship_ids, anchored = self._pending_graph_update
+        self._pending_graph_update = None
+        new_count = len(new_object_ids) + len(new_relationship_ids)
+        x = list(x[:new_count])
+        y = list(y[:new_count])
+        if not anchored:
+            # Nothing connects the new entities to the current graph; put them next to it instead of on top of it.
+            items_rect = self.scene.itemsBoundingRect()
+            dx = items_rect.right() + self._ARC_LENGTH_HINT - min(x)
+            dy = items_rect.center().y() - 0.5 * (min(y) + max(y))
+            x = [x_ + dx for x_ in x]
+            y = [y_ + dy for y_ in y]
+        object_items = {item.entity_id: item for item in self.object_items}
+        relationship_items = {item.entity_id: item for item in self.relationship_items}
+        new_items = list()
+        for i, object_id in enumerate(new_object_ids):
+            object_item = ObjectItem(self, x[i], y[i], self._VERTEX_EXTENT, object_id)
+            object_items[object_id] = object_item
+            new_items.append(object_item)
+        offset = len(new_object_ids)
+        for i, relationship_id in enumerate(new_relationship_ids):
+            relationship_item = RelationshipItem(
+                self, x[offset + i], y[offset + i], 0.5 * self._VERTEX_EXTENT, relationship_id
+            )
+            relationship_items[relationship_id] = relationship_item
+            new_items.append(relationship_item)
+        new_ids = set(new_object_ids) | set(new_relationship_ids)
+        new_arc_items = list()
+        for relationship_id, object_id_list in self.object_id_lists.items():
+            new_relationship = relationship_id in new_ids
+            for object_id in object_id_list:
+                if not new_relationship and object_id not in new_ids:
+                    continue
+                arc_item = ArcItem(relationship_items[relationship_id], object_items[object_id], self._ARC_WIDTH)
+                new_arc_items.append(arc_item)
+        self.object_items.extend(object_items[id_] for id_ in new_object_ids)
+        self.relationship_items.extend(relationship_items[id_] for id_ in new_relationship_ids)
+        self.arc_items.extend(new_arc_items)
+        for item in new_items + new_arc_items:
+            self.scene.addItem(item)
+        self._finish_graph_update()
+
+    def _remove_graph_items(self, items):
+        """Removes given entity items and their arcs from the scene.
+
+        Args:
+            items (list(EntityItem)): items to remove
+        """
+        if not items:
+            return
+        items = set(items)
+        obsolete_arc_items = {arc_item for item in items for arc_item in item.arc_items}
+        for item in {arc_item.rel_item for arc_item in obsolete_arc_items} | {
+            arc_item.obj_item for arc_item in obsolete_arc_items
+        }:
+            if item in items:
+                continue
+            item.arc_items = [arc_item for arc_item in item.arc_items if arc_item not in obsolete_arc_items]
+            item.update_arcs_line()
+        self.scene.selectionChanged.disconnect(self._handle_scene_selection_changed)
+        for item in itertools.chain(obsolete_arc_items, items):
+            self.scene.removeItem(item)
+        self.scene.selectionChanged.connect(self._handle_scene_selection_changed)
+        self.object_items = [item for item in self.object_items if item not in items]
+        self.relationship_items = [item for item in self.relationship_items if item not in items]
+        self.arc_items = [item for item in self.arc_items if item not in obsolete_arc_items]
+        self.hidden_items = [item for item in self.hidden_items if item not in items]
+        self._handle_scene_selection_changed()
+
+    def _finish_graph_update(self):
+        """Finalizes an incremental graph update."""
+        if not self.object_items:
+            self.relationship_items.clear()
+            self.arc_items.clear()
+            self.hidden_items.clear()
+            self.removed_items.clear()
+            self.scene.clear()
+            self._blank_item = QGraphicsTextItem("Nothing to show.")
+            self.scene.addItem(self._blank_item)
+            self.ui.actionExport_graph_as_pdf.setEnabled(False)
+        self.ui.graphicsView.apply_zoom()
+        self.graph_build_finished.emit()
+
     @Slot(bool)
     def hide_selected_items(self, checked=False):
         """Hides selected items."""
@@ -612,7 +882,7 @@ class GraphViewMixin:
         ]
         if vals_to_remove:
             self.db_mngr.remove_items({self.db_map: {"parameter value": vals_to_remove}})
-        self.build_graph()
+        self.build_graph(incremental=False)
 
     @Slot(bool)
     def export_as_pdf(self, checked=False):
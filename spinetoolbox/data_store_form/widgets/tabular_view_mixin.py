@@ -16,7 +16,6 @@ Contains TabularViewMixin class.
 :date:   1.11.2018
 """
 
-from itertools import product
 from collections import namedtuple
 from PySide2.QtCore import Qt, Slot, QTimer
 from PySide2.QtWidgets import QActionGroup
@@ -163,27 +162,20 @@ class TabularViewMixin:
         entity_type = {"object class": "object", "relationship class": "relationship"}[class_type]
         return self.db_mngr.get_items_by_field(self.db_map, entity_type, "class_id", class_id)
 
-    def load_empty_relationship_data(self, objects_per_class=None):
-        """Returns a dict containing all possible relationships in the current class.
-
-        Args:
-            objects_per_class (dict)
+    def load_relationship_factors(self):
+        """Returns the object ids of each dimension of the current class.
+        All possible relationships in the class are given by the Cartesian product of the dimensions.
 
         Returns:
-            dict: Key is object id tuple, value is None.
+            list(list(tuple)): one list of object id tuples per dimension
         """
-        if objects_per_class is None:
-            objects_per_class = dict()
         if self.current_class_type == "object class":
-            return {}
-        object_id_sets = []
+            return []
+        factors = []
         for obj_cls_id in self.current_object_class_id_list:
-            objects = objects_per_class.get(obj_cls_id, None)
-            if objects is None:
-                objects = self._get_entities(obj_cls_id, "object class")
-            id_set = {item["id"]: None for item in objects}
-            object_id_sets.append(list(id_set.keys()))
-        return dict.fromkeys(product(*object_id_sets))
+            objects = self._get_entities(obj_cls_id, "object class")
+            factors.append(list({(item["id"],): None for item in objects}))
+        return factors
 
     def load_full_relationship_data(self, relationships=None, action="add"):
         """Returns a dict of relationships in the current class.
@@ -198,16 +190,6 @@ class TabularViewMixin:
         get_id = {"add": lambda x: x["id"], "remove": lambda x: None}[action]
         return {tuple(int(id_) for id_ in x["object_id_list"].split(',')): get_id(x) for x in relationships}
 
-    def load_relationship_data(self):
-        """Returns a dict that merges empty and full relationship data.
-
-        Returns:
-            dict: Key is object id tuple, value is True if a relationship exists, False otherwise.
-        """
-        data = self.load_empty_relationship_data()
-        data.update(self.load_full_relationship_data())
-        return data
-
     def _get_parameter_value_or_def_ids(self, item_type):
         """Returns a list of integer ids from the parameter model
         corresponding to the currently selected class and the given item type.
@@ -239,6 +221,30 @@ class TabularViewMixin:
         ids = self._get_parameter_value_or_def_ids(item_type)
         return [self.db_mngr.get_item(self.db_map, item_type, id_) for id_ in ids]
 
+    def get_entity_ids(self, entities):
+        """Returns id tuples of given entities; object id lists in case of relationships.
+
+        Args:
+            entities (list(dict))
+
+        Returns:
+            list(tuple)
+        """
+        if self.current_class_type == "relationship class":
+            return [tuple(int(id_) for id_ in e["object_id_list"].split(',')) for e in entities]
+        return [(e["id"],) for e in entities]
+
+    def load_parameter_value_factors(self):
+        """Returns entity ids and parameter ids of the current class.
+        All possible combinations of entities and parameters are given by the Cartesian product of the two.
+
+        Returns:
+            list(list(tuple)): entity id tuples and parameter id tuples
+        """
+        entity_ids = self.get_entity_ids(self._get_entities())
+        parameter_ids = [(id_,) for id_ in self._get_parameter_value_or_def_ids("parameter definition")]
+        return [entity_ids, parameter_ids]
+
     def load_empty_parameter_value_data(self, entities=None, parameter_ids=None):
         """Returns a dict containing all possible combinations of entities and parameters for the current class.
 
@@ -253,10 +259,7 @@ class TabularViewMixin:
             entities = self._get_entities()
         if parameter_ids is None:
             parameter_ids = self._get_parameter_value_or_def_ids("parameter definition")
-        if self.current_class_type == "relationship class":
-            entity_ids = [tuple(int(id_) for id_ in e["object_id_list"].split(',')) for e in entities]
-        else:
-            entity_ids = [(e["id"],) for e in entities]
+        entity_ids = self.get_entity_ids(entities)
         if not entity_ids:
             entity_ids = [tuple(None for _ in self.current_object_class_id_list)]
         if not parameter_ids:
@@ -341,8 +344,7 @@ class TabularViewMixin:
     @busy_effect
     @Slot("QAction")
     def do_reload_pivot_table(self, action=None):
-        """Reloads pivot table.
-        """
+        """Reloads pivot table."""
         if self.current_class_id is None:
             return
         qApp.processEvents()  # pylint: disable=undefined-variable
@@ -518,8 +520,7 @@ class TabularViewMixin:
 
     @Slot("QModelIndex", "QModelIndex")
     def change_frozen_value(self, current, previous):
-        """Sets the frozen value from selection in frozen table.
-        """
+        """Sets the frozen value from selection in frozen table."""
         frozen_value = self.get_frozen_value(current)
         self.pivot_table_model.set_frozen_value(frozen_value)
         # store pivot preferences
@@ -569,7 +570,7 @@ class TabularViewMixin:
         Returns:
             list(tuple(list(int)))
         """
-        return list(dict.fromkeys(zip(*[self.pivot_table_model.model.index_values.get(k, []) for k in frozen])).keys())
+        return self.pivot_table_model.model.unique_values(frozen)
 
     # FIXME: Move this to the models
     @staticmethod
@@ -22,6 +22,9 @@ from datapackage import Package
 from spinedb_api import SpineDBAPIError, DiffDatabaseMapping, create_new_spine_database
 from .helpers import busy_effect
 
+# Maximum number of items added to the database in one go.
+_BATCH_SIZE = 10000
+
 
 class Signaler(QObject):
     finished = Signal(name="finished")
@@ -88,43 +91,32 @@ class DatapackageToSpineConverter(QRunnable):
     def _run(self):
         step = 0
         self.signaler.progressed.emit(step, "")
-        object_class_names = [x.name for x in self.db_map.object_class_list()]
-        parameter_names = [x.name for x in self.db_map.parameter_definition_list()]
-        object_class_name_lists = [
-            x.object_class_name_list.split(",") for x in self.db_map.wide_relationship_class_list()
-        ]
+        object_class_names = {x.name for x in self.db_map.object_class_list()}
+        parameter_names = {x.name for x in self.db_map.parameter_definition_list()}
         object_classes = list()
         pre_relationship_classes = list()
         pre_parameters = list()
         for resource in self.datapackage.resources:
             if resource.name not in object_class_names:
                 object_classes.append(dict(name=resource.name))
-                object_class_names.append(resource.name)
-            primary_key = resource.schema.primary_key
+                object_class_names.add(resource.name)
             foreign_keys = resource.schema.foreign_keys
             reference_resource_names = [fk["reference"]["resource"] for fk in foreign_keys]
             for reference_resource_name in reference_resource_names:
                 if reference_resource_name not in object_class_names:
                     object_classes.append(dict(name=reference_resource_name))
-                    object_class_names.append(reference_resource_name)
+                    object_class_names.add(reference_resource_name)
             if reference_resource_names:
                 object_class_name_list = [resource.name] + reference_resource_names
                 relationship_class_name = "__".join(object_class_name_list)
                 pre_relationship_classes.append(
                     dict(object_class_name_list=object_class_name_list, name=relationship_class_name)
                 )
-                object_class_name_lists.append(object_class_name_list)
-            for field in resource.schema.fields:
-                # Skip fields in primary key
-                if field.name in primary_key:
-                    continue
-                # Skip fields in any foreign key
-                if field in [x for fk in foreign_keys for x in fk["fields"]]:
-                    continue
-                parameter_name = resource.name + "_" + field.name
+            for field_name in _parameter_field_names(resource):
+                parameter_name = resource.name + "_" + field_name
                 if parameter_name not in parameter_names:
                     pre_parameters.append(dict(object_class_name=resource.name, name=parameter_name))
-                    parameter_names.append(parameter_name)
+                    parameter_names.add(parameter_name)
         self.signaler.progressed.emit(step, "Adding object classes...")
         self.db_map.add_object_classes(*object_classes)
         step += self.object_class_count
@@ -144,102 +136,89 @@ class DatapackageToSpineConverter(QRunnable):
         step += self.parameter_count
         relationship_class_name_id = {x.name: x.id for x in self.db_map.wide_relationship_class_list()}
         parameter_name_id = {x.name: x.id for x in self.db_map.parameter_definition_list()}
-        object_names = [x.name for x in self.db_map.object_list()]
-        # Create list of object and preliminary parameter value dicts.
+        object_names = {x.name for x in self.db_map.object_list()}
+        self.signaler.progressed.emit(step, "Adding objects...")
+        final_step = step + self.object_count
         objects = list()
-        pre_parameter_values = list()
         for resource in self.datapackage.resources:
             object_class_id = object_class_name_id[resource.name]
-            primary_key = resource.schema.primary_key
-            foreign_keys = resource.schema.foreign_keys
-            foreign_keys_fields = [x for fk in foreign_keys for x in fk["fields"]]
+            primary_key_columns = _field_columns(resource, resource.schema.primary_key)
             for i, row in enumerate(self.resource_data[resource.name]):
-                row_dict = dict(zip(resource.schema.field_names, row))
-                if primary_key:
-                    object_name_suffix = "_".join(row_dict[field] for field in primary_key)
-                else:
-                    object_name_suffix = str(i)
-                object_name = resource.name + "_" + object_name_suffix
-                if not object_name in object_names:
-                    objects.append(dict(class_id=object_class_id, name=object_name))
-                    object_names.append(object_name)
-                for field_name, value in row_dict.items():
-                    if field_name in primary_key:
-                        continue
-                    if field_name in foreign_keys_fields:
-                        continue
-                    parameter_name = resource.name + "_" + field_name
-                    parameter_id = parameter_name_id[parameter_name]
-                    pre_parameter_values.append(dict(object_name=object_name, parameter_id=parameter_id, value=value))
-        self.signaler.progressed.emit(step, "Adding objects...")
-        self.db_map.add_objects(*objects)
-        step += self.object_count
+                object_name = _object_name(resource.name, row, primary_key_columns, i)
+                if object_name in object_names:
+                    continue
+                objects.append(dict(class_id=object_class_id, name=object_name))
+                object_names.add(object_name)
+                if len(objects) == _BATCH_SIZE:
+                    step = self._add_batch(self.db_map.add_objects, objects, step, "Adding objects...")
+        self._add_batch(self.db_map.add_objects, objects, step, "Adding objects...")
+        step = final_step
         object_name_id = {x.name: x.id for x in self.db_map.object_list()}
-        parameter_values = [
-            dict(object_id=object_name_id[p['object_name']], parameter_id=p['parameter_id'], value=p['value'])
-            for p in pre_parameter_values
-        ]
         self.signaler.progressed.emit(step, "Adding parameter values...")
-        self.db_map.add_parameter_values(*parameter_values)
-        step += self.parameter_value_count
-        # Create dictionary of reference resource names => list of reference fields names
-        reference_resource_dict = dict()
+        final_step = step + self.parameter_value_count
+        parameter_values = list()
         for resource in self.datapackage.resources:
-            foreign_keys = resource.schema.foreign_keys
-            for foreign_key in foreign_keys:
-                reference_resource_name = foreign_key["reference"]["resource"]
-                reference_fields_names = foreign_key["reference"]["fields"]
-                reference_resource_dict.setdefault(reference_resource_name, list()).append(reference_fields_names)
+            primary_key_columns = _field_columns(resource, resource.schema.primary_key)
+            parameter_field_names = _parameter_field_names(resource)
+            parameter_columns = _field_columns(resource, parameter_field_names)
+            parameter_ids = [parameter_name_id[resource.name + "_" + name] for name in parameter_field_names]
+            for i, row in enumerate(self.resource_data[resource.name]):
+                object_id = object_name_id[_object_name(resource.name, row, primary_key_columns, i)]
+                for column, parameter_id in zip(parameter_columns, parameter_ids):
+                    parameter_values.append(dict(object_id=object_id, parameter_id=parameter_id, value=row[column]))
+                if len(parameter_values) >= _BATCH_SIZE:
+                    step = self._add_batch(
+                        self.db_map.add_parameter_values, parameter_values, step, "Adding parameter values..."
+                    )
+        self._add_batch(self.db_map.add_parameter_values, parameter_values, step, "Adding parameter values...")
+        step = final_step
         # Create dictionary of reference resource name => reference fields names
-        # => reference key => object id
+        # => reference key => object id and name
         reference_object_id_dict = dict()
-        for reference_resource_name, reference_fields_names_list in reference_resource_dict.items():
-            reference_resource = self.datapackage.get_resource(reference_resource_name)
-            reference_primary_key = reference_resource.schema.primary_key
-            reference_object_id_dict[reference_resource_name] = d1 = dict()
-            for reference_fields_names in reference_fields_names_list:
-                d1[",".join(reference_fields_names)] = d2 = dict()
+        for resource in self.datapackage.resources:
+            for foreign_key in resource.schema.foreign_keys:
+                reference_resource_name = foreign_key["reference"]["resource"]
+                reference_fields_names = tuple(foreign_key["reference"]["fields"])
+                d1 = reference_object_id_dict.setdefault(reference_resource_name, dict())
+                if reference_fields_names in d1:
+                    continue
+                reference_resource = self.datapackage.get_resource(reference_resource_name)
+                reference_primary_key_columns = _field_columns(
+                    reference_resource, reference_resource.schema.primary_key
+                )
+                reference_field_columns = _field_columns(reference_resource, reference_fields_names)
+                d1[reference_fields_names] = d2 = dict()
                 for i, row in enumerate(self.resource_data[reference_resource_name]):
-                    row_dict = dict(zip(reference_resource.schema.field_names, row))
-                    # Find object id
-                    if reference_primary_key:
-                        reference_object_name_suffix = "_".join(row_dict[field] for field in reference_primary_key)
-                    else:
-                        reference_object_name_suffix = str(i)
-                    reference_object_name = reference_resource_name + reference_object_name_suffix
-                    reference_object_id = object_name_id[reference_object_name]
-                    key = ",".join([row_dict[x] for x in reference_fields_names])
-                    d2[key] = (reference_object_id, reference_object_name)
-        # Create list of relationships
+                    reference_object_name = _object_name(reference_resource_name, row, reference_primary_key_columns, i)
+                    key = tuple(row[column] for column in reference_field_columns)
+                    d2[key] = (object_name_id[reference_object_name], reference_object_name)
+        self.signaler.progressed.emit(step, "Adding relationships...")
+        final_step = step + self.relationship_count
         relationships = list()
         for resource in self.datapackage.resources:
-            primary_key = resource.schema.primary_key
             foreign_keys = resource.schema.foreign_keys
-            reference_resource_names = [fk['reference']['resource'] for fk in foreign_keys]
-            if not reference_resource_names:
+            if not foreign_keys:
                 continue
+            reference_resource_names = [fk['reference']['resource'] for fk in foreign_keys]
             object_class_name_list = [resource.name] + reference_resource_names
             relationship_class_name = "__".join(object_class_name_list)
             relationship_class_id = relationship_class_name_id[relationship_class_name]
+            primary_key_columns = _field_columns(resource, resource.schema.primary_key)
+            references = [
+                (
+                    _field_columns(resource, fk['fields']),
+                    reference_object_id_dict[fk['reference']['resource']][tuple(fk['reference']['fields'])],
+                )
+                for fk in foreign_keys
+            ]
             for i, row in enumerate(self.resource_data[resource.name]):
-                row_dict = dict(zip(resource.schema.field_names, row))
-                if primary_key:
-                    object_name_suffix = "_".join(row_dict[field] for field in primary_key)
-                else:
-                    object_name_suffix = str(i)
-                object_name = resource.name + object_name_suffix
-                object_id = object_name_id[object_name]
-                object_id_list = [object_id]
+                object_name = _object_name(resource.name, row, primary_key_columns, i)
+                object_id_list = [object_name_id[object_name]]
                 object_name_list = [object_name]
-                for fk in foreign_keys:
-                    fields_names = fk['fields']
-                    reference_resource_name = fk['reference']['resource']
-                    reference_fields_names = fk['reference']['fields']
-                    key = ",".join([row_dict[x] for x in fields_names])
-                    d1 = reference_object_id_dict[reference_resource_name]
-                    d2 = d1[",".join(reference_fields_names)]
+                for field_columns, reference_objects in references:
+                    key = tuple(row[column] for column in field_columns)
                     try:
-                        reference_object_id, reference_object_name = d2[key]
+                        reference_object_id, reference_object_name = reference_objects[key]
                     except KeyError:
                         break
                     object_id_list.append(reference_object_id)
@@ -249,12 +228,57 @@ class DatapackageToSpineConverter(QRunnable):
                     relationships.append(
                         dict(class_id=relationship_class_id, object_id_list=object_id_list, name=relationship_name)
                     )
-        self.signaler.progressed.emit(step, "Adding relationships...")
-        self.db_map.add_wide_relationships(*relationships)
-        step += self.relationship_count
+                    if len(relationships) == _BATCH_SIZE:
+                        step = self._add_batch(
+                            self.db_map.add_wide_relationships, relationships, step, "Adding relationships..."
+                        )
+        self._add_batch(self.db_map.add_wide_relationships, relationships, step, "Adding relationships...")
+        step = final_step
         self.db_map.commit_session("Automatically generated by Spine Toolbox.")
         self.signaler.progressed.emit(step, "")
 
+    def _add_batch(self, add_items, items, step, message):
+        """Adds a batch of items to the database and reports progress.
+
+        Args:
+            add_items (Callable): database mapping's method that adds the items
+            items (list): items to add; the list is cleared afterwards
+            step (int): current progress step
+            message (str): progress message of the current phase
+
+        Returns:
+            int: updated progress step
+        """
+        if items:
+            add_items(*items)
+        step += len(items)
+        items.clear()
+        self.signaler.progressed.emit(step, message)
+        return step
+
+
+def _parameter_field_names(resource):
+    """Returns the names of resource's fields that are converted to parameters,
+    i.e. fields that are not part of the primary key or any foreign key."""
+    key_fields = set(resource.schema.primary_key)
+    key_fields.update(field for fk in resource.schema.foreign_keys for field in fk["fields"])
+    return [name for name in resource.schema.field_names if name not in key_fields]
+
+
+def _field_columns(resource, field_names):
+    """Returns row indexes of given fields."""
+    columns = {name: column for column, name in enumerate(resource.schema.field_names)}
+    return [columns[name] for name in field_names]
+
+
+def _object_name(resource_name, row, primary_key_columns, row_index):
+    """Returns the name of the object corresponding to a resource row."""
+    if primary_key_columns:
+        object_name_suffix = "_".join(row[column] for column in primary_key_columns)
+    else:
+        object_name_suffix = str(row_index)
+    return resource_name + "_" + object_name_suffix
+
 
 @busy_effect
 def datapackage_to_spine(db_map, datapackage_file_path):
@@ -16,9 +16,90 @@ Classes to manage tool instance execution in various forms.
 :date:   1.2.2018
 """
 
+import codecs
 import logging
 import json
-from PySide2.QtCore import QObject, QProcess, Slot, Signal
+from PySide2.QtCore import QObject, QProcess, QTimer, Slot, Signal
+
+_OUTPUT_FLUSH_INTERVAL = 50
+"""Time in milliseconds during which process output is collected before it is sent to Process Log."""
+
+
+class ProcessOutput(QObject):
+    """Sends a process's output to Process Log in batches and writes all of it to a log file."""
+
+    def __init__(self, logger, log_file=None, parent=None):
+        """
+        Args:
+            logger (LoggerInterface): a logger instance
+            log_file (str, optional): path to a file where the complete output is written
+            parent (QObject, optional): parent object
+        """
+        super().__init__(parent)
+        self._logger = logger
+        self._log_file_path = log_file
+        self._log_file = None
+        self._buffer = list()
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(_OUTPUT_FLUSH_INTERVAL)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def append(self, text, is_error):
+        """Writes process output to log file and queues it for Process Log.
+
+        Args:
+            text (str): output text
+            is_error (bool): True if text comes from stderr, False if from stdout
+        """
+        if not text:
+            return
+        self._write_to_log_file(text)
+        if self._buffer and self._buffer[-1][0] == is_error:
+            self._buffer[-1][1].append(text)
+        else:
+            self._buffer.append((is_error, [text]))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    @Slot()
+    def flush(self):
+        """Sends queued output to Process Log, one message per consecutive stdout or stderr output."""
+        self._flush_timer.stop()
+        output = self._buffer
+        self._buffer = list()
+        for is_error, texts in output:
+            message = "".join(texts).strip()
+            if not message:
+                continue
+            if is_error:
+                self._logger.msg_proc_error.emit(message)
+            else:
+                self._logger.msg_proc.emit(message)
+
+    def close(self):
+        """Flushes queued output and closes the log file."""
+        self.flush()
+        if self._log_file is None:
+            return
+        try:
+            self._log_file.close()
+        except OSError:
+            pass
+        self._log_file = None
+
+    def _write_to_log_file(self, text):
+        """Appends text to the log file if there is one."""
+        if self._log_file_path is None:
+            return
+        try:
+            if self._log_file is None:
+                self._log_file = open(self._log_file_path, "w", encoding="utf-8")
+            self._log_file.write(text)
+        except OSError as error:
+            self._logger.msg_warning.emit(f"\tWriting process output to {self._log_file_path} failed: {error}")
+            self._log_file_path = None
+            self.close()
 
 
 class ExecutionManager(QObject):
@@ -100,7 +181,7 @@ class ConsoleExecutionManager(ExecutionManager):
 class QProcessExecutionManager(ExecutionManager):
     """Class to manage tool instance execution using a PySide2 QProcess."""
 
-    def __init__(self, logger, program=None, args=None, silent=False, semisilent=False):
+    def __init__(self, logger, program=None, args=None, silent=False, semisilent=False, log_file=None):
         """Class constructor.
 
         Args:
@@ -108,6 +189,8 @@ class QProcessExecutionManager(ExecutionManager):
             program (str): Path to program to run in the subprocess (e.g. julia.exe)
             args (list): List of argument for the program (e.g. path to script file)
             silent (bool): Whether or not to emit logger msg signals
+            semisilent (bool): Whether or not to emit Event Log messages
+            log_file (str, optional): path to a file where the complete stdout and stderr are written
         """
         super().__init__(logger)
         self._program = program
@@ -121,6 +204,9 @@ class QProcessExecutionManager(ExecutionManager):
         self.process_output = None  # stdout when running silent
         self.error_output = None  # stderr when running silent
         self.data_to_inject = None
+        self._stdout_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._stderr_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._output = ProcessOutput(logger, log_file, self)
 
     def program(self):
         """Program getter method."""
@@ -249,6 +335,7 @@ class QProcessExecutionManager(ExecutionManager):
             self._process.deleteLater()
             self._process = None
             self.data_to_inject = None
+            self._output.close()
 
     @Slot(int, "QProcess::ExitStatus")
     def on_process_finished(self, exit_code, exit_status):
@@ -273,16 +360,17 @@ class QProcessExecutionManager(ExecutionManager):
         if not exit_code == 0:
             self.process_failed = True
         if not self._user_stopped:
-            out = str(self._process.readAllStandardOutput().data(), "utf-8", errors="replace")
-            errout = str(self._process.readAllStandardError().data(), "utf-8", errors="replace")
-            if out is not None:
-                if not self._silent:
-                    self._logger.msg_proc.emit(out.strip())
-                else:
-                    self.process_output = out.strip()
-                    self.error_output = errout.strip()
+            out = self._stdout_decoder.decode(self._process.readAllStandardOutput().data(), final=True)
+            errout = self._stderr_decoder.decode(self._process.readAllStandardError().data(), final=True)
+            if not self._silent:
+                self._output.append(out, False)
+                self._output.append(errout, True)
+            else:
+                self.process_output = out.strip()
+                self.error_output = errout.strip()
         else:
             self._logger.msg.emit("*** Terminating process ***")
+        self._output.close()
         # Delete QProcess
         self._process.deleteLater()
         self._process = None
@@ -291,16 +379,14 @@ class QProcessExecutionManager(ExecutionManager):
 
     @Slot()
     def on_ready_stdout(self):
-        """Emit data from stdout."""
+        """Collects data from stdout."""
         if not self._process:
             return
-        out = str(self._process.readAllStandardOutput().data(), "utf-8", errors="replace")
-        self._logger.msg_proc.emit(out.strip())
+        self._output.append(self._stdout_decoder.decode(self._process.readAllStandardOutput().data()), False)
 
     @Slot()
     def on_ready_stderr(self):
-        """Emit data from stderr."""
+        """Collects data from stderr."""
         if not self._process:
             return
-        err = str(self._process.readAllStandardError().data(), "utf-8", errors="replace")
-        self._logger.msg_proc_error.emit(err.strip())
+        self._output.append(self._stderr_decoder.decode(self._process.readAllStandardError().data()), True)
@@ -25,7 +25,6 @@ import os
 import shutil
 import sys
 import urllib.parse
-import matplotlib
 from PySide2.QtCore import Qt, Slot, QFile, QIODevice, QSize, QRect, QPoint, QUrl
 from PySide2.QtCore import __version__ as qt_version
 from PySide2.QtCore import __version_info__ as qt_version_info
@@ -49,14 +48,23 @@ from .config import REQUIRED_SPINE_ENGINE_VERSION
 if os.name == "nt":
     import ctypes
 
-matplotlib.use('Qt5Agg')
-matplotlib.rcParams.update({"font.size": 8})
-logging.getLogger("matplotlib").setLevel(logging.WARNING)
-_matplotlib_version = [int(x) for x in matplotlib.__version__.split(".")]
-if _matplotlib_version[0] == 3 and _matplotlib_version[1] == 0:
-    from pandas.plotting import register_matplotlib_converters
 
-    register_matplotlib_converters()
+def configure_matplotlib():
+    """Configures matplotlib for Toolbox GUI.
+
+    Matplotlib is imported here rather than at module level since it is slow to import
+    and not needed when executing projects without the GUI.
+    """
+    import matplotlib  # pylint: disable=import-outside-toplevel
+
+    matplotlib.use('Qt5Agg')
+    matplotlib.rcParams.update({"font.size": 8})
+    logging.getLogger("matplotlib").setLevel(logging.WARNING)
+    matplotlib_version = [int(x) for x in matplotlib.__version__.split(".")[:2]]
+    if matplotlib_version[0] == 3 and matplotlib_version[1] == 0:
+        from pandas.plotting import register_matplotlib_converters  # pylint: disable=import-outside-toplevel
+
+        register_matplotlib_converters()
 
 
 def set_taskbar_icon():
@@ -27,12 +27,8 @@ from .spinedb_api_version_check import spinedb_api_version_check
 # Check for spinedb_api version before we try to import possibly non-existent stuff below.
 if not spinedb_api_version_check():
     sys.exit(1)
-# Importing resources_icons_rc initializes resources and Font Awesome gets added to the application
-from . import resources_icons_rc  # pylint: disable=unused-import
-from .ui_main import ToolboxUI
-from .helpers import pyside2_version_check, spine_engine_version_check
+from .helpers import configure_matplotlib, pyside2_version_check, spine_engine_version_check
 from .version import __version__
-from .headless import headless_main
 
 
 def main():
@@ -50,7 +46,15 @@ def main():
     parser = _make_argument_parser()
     args = parser.parse_args()
     if args.execute_only:
+        # The GUI modules are imported only when needed to keep headless startup fast.
+        from .headless import headless_main  # pylint: disable=import-outside-toplevel
+
         return headless_main(args)
+    # Importing resources_icons_rc initializes resources and Font Awesome gets added to the application
+    from . import resources_icons_rc  # pylint: disable=unused-import, import-outside-toplevel
+    from .ui_main import ToolboxUI  # pylint: disable=import-outside-toplevel
+
+    configure_matplotlib()
     app = QApplication(sys.argv)
     status = QFontDatabase.addApplicationFont(":/fonts/fontawesome5-solid-webfont.ttf")
     if status < 0:
@@ -16,10 +16,172 @@ Models that vertically concatenate two or more table models.
 :date:   9.10.2019
 """
 
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
 from PySide2.QtCore import Qt, Signal, Slot, QModelIndex
 from ..mvcmodels.minimal_table_model import MinimalTableModel
 
 
+class _RowMap(Sequence):
+    """Maps compound rows to tuples (sub_model, sub_row).
+
+    Each sub model occupies a contiguous block of compound rows.
+    A block stores the sub model's accepted rows in ascending order,
+    either as a range when all rows are accepted or as a compact integer array.
+    Compound rows are located by bisecting the cumulative block ends.
+    """
+
+    def __init__(self):
+        self._models = []
+        self._blocks = []
+        self._source_row_counts = []  # Sub model row counts at the time their block was computed
+        self._ends = []
+        self._positions = {}
+
+    def __len__(self):
+        return self._ends[-1] if self._ends else 0
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[r] for r in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("row map index out of range")
+        position = bisect_right(self._ends, row)
+        start = self._ends[position - 1] if position > 0 else 0
+        return self._models[position], self._blocks[position][row - start]
+
+    def __iter__(self):
+        for model, rows in zip(self._models, self._blocks):
+            for sub_row in rows:
+                yield model, sub_row
+
+    def clear(self):
+        """Removes all blocks."""
+        self._models.clear()
+        self._blocks.clear()
+        self._source_row_counts.clear()
+        self._ends.clear()
+        self._positions.clear()
+
+    def block(self, model):
+        """Returns given sub model's block.
+
+        Args:
+            model (MinimalTableModel): sub model
+
+        Returns:
+            tuple: accepted sub rows and sub model's row count, or None if the model has no block
+        """
+        position = self._positions.get(model)
+        if position is None:
+            return None
+        return self._blocks[position], self._source_row_counts[position]
+
+    def set_blocks(self, blocks):
+        """Replaces all blocks.
+
+        Args:
+            blocks (list): tuples (sub model, accepted sub rows, sub model's row count)
+        """
+        self.clear()
+        for model, rows, row_count in blocks:
+            self._positions[model] = len(self._models)
+            self._models.append(model)
+            self._blocks.append(rows)
+            self._source_row_counts.append(row_count)
+        self._update_ends(0)
+
+    def set_block(self, model, rows, row_count, before=None):
+        """Replaces given sub model's block or inserts a new one.
+
+        Args:
+            model (MinimalTableModel): sub model
+            rows (Sequence): accepted sub rows
+            row_count (int): sub model's row count
+            before (MinimalTableModel, optional): if the block is new, it is inserted before this model's block;
+                new blocks are appended by default
+        """
+        position = self._positions.get(model)
+        if position is None:
+            position = self._positions.get(before, len(self._models))
+            self._models.insert(position, model)
+            self._blocks.insert(position, rows)
+            self._source_row_counts.insert(position, row_count)
+            self._ends.insert(position, 0)
+            self._positions = {m: k for k, m in enumerate(self._models)}
+        else:
+            self._blocks[position] = rows
+            self._source_row_counts[position] = row_count
+        self._update_ends(position)
+
+    def first_row(self, model):
+        """Returns the compound row where given sub model's block starts.
+
+        Args:
+            model (MinimalTableModel): sub model
+
+        Returns:
+            int: first compound row or None if model has no block
+        """
+        position = self._positions.get(model)
+        if position is None:
+            return None
+        return self._ends[position - 1] if position > 0 else 0
+
+    def row_of(self, model, sub_row):
+        """Returns the compound row of given sub row.
+
+        Args:
+            model (MinimalTableModel): sub model
+            sub_row (int): row in sub model
+
+        Returns:
+            int: compound row or None if the sub row is not in the map
+        """
+        position = self._positions.get(model)
+        if position is None:
+            return None
+        rows = self._blocks[position]
+        if isinstance(rows, range):
+            if sub_row not in rows:
+                return None
+            block_row = sub_row - rows.start
+        else:
+            block_row = bisect_left(rows, sub_row)
+            if block_row == len(rows) or rows[block_row] != sub_row:
+                return None
+        return (self._ends[position - 1] if position > 0 else 0) + block_row
+
+    def _update_ends(self, first_position):
+        """Recomputes cumulative block ends starting from given block."""
+        del self._ends[first_position:]
+        end = self._ends[-1] if self._ends else 0
+        for rows in self._blocks[first_position:]:
+            end += len(rows)
+            self._ends.append(end)
+
+
+def _compact_rows(rows, row_count):
+    """Returns accepted rows in a compact form.
+
+    Args:
+        rows (Iterable of int): accepted rows in ascending order
+        row_count (int): total number of rows
+
+    Returns:
+        Sequence: a range if all rows are accepted, an integer array otherwise
+    """
+    if isinstance(rows, range):
+        return rows
+    rows = array("q", rows)
+    if len(rows) == row_count:
+        return range(row_count)
+    return rows
+
+
 class CompoundTableModel(MinimalTableModel):
     """A model that concatenates several sub table models vertically."""
 
@@ -33,8 +195,8 @@ class CompoundTableModel(MinimalTableModel):
         """
         super().__init__(parent=parent, header=header)
         self.sub_models = []
-        self._row_map = []  # Maps compound row to tuple (sub_model, sub_row)
-        self._inv_row_map = {}  # Maps tuple (sub_model, sub_row) to compound row
+        self._row_map = _RowMap()  # Maps compound row to tuple (sub_model, sub_row)
+        self._invalid_sub_models = set()  # Sub models whose rows need to be recomputed on next refresh
         self._fetch_sub_model = None
 
     def map_to_sub(self, index):
@@ -66,9 +228,8 @@ class CompoundTableModel(MinimalTableModel):
         Returns:
             QModelIndex: the equivalent index in the compound model
         """
-        try:
-            row = self._inv_row_map[sub_model, sub_index.row()]
-        except KeyError:
+        row = self._row_map.row_of(sub_model, sub_index.row())
+        if row is None:
             return QModelIndex()
         return self.index(row, sub_index.column())
 
@@ -103,36 +264,54 @@ class CompoundTableModel(MinimalTableModel):
         self.layoutChanged.emit()
 
     def do_refresh(self):
-        """Recomputes the row and inverse row maps."""
-        self._row_map.clear()
-        self._inv_row_map.clear()
+        """Recomputes the row map.
+        Rows are recomputed only for sub models that have been invalidated or whose row count has changed.
+        """
+        blocks = list()
         for model in self.sub_models:
-            row_map = self._row_map_for_model(model)
-            self._append_row_map(row_map)
+            block = self._row_map.block(model)
+            if block is None or model in self._invalid_sub_models or block[1] != model.rowCount():
+                block = self._make_block(model)
+            blocks.append((model, *block))
+        self._invalid_sub_models.clear()
+        self._row_map.set_blocks(blocks)
         self.refreshed.emit()
 
-    def _append_row_map(self, row_map):
-        """Appends given row map to the tail of the model.
+    def _invalidate_row_map(self, model=None):
+        """Marks rows of given sub model to be recomputed on next refresh.
 
         Args:
-            row_map (list): tuples (model, row number)
+            model (MinimalTableModel, optional): sub model; if None, all sub models are invalidated
         """
-        for model_row_tup in row_map:
-            self._inv_row_map[model_row_tup] = self.rowCount()
-            self._row_map.append(model_row_tup)
+        if model is None:
+            self._invalid_sub_models.update(self.sub_models)
+        else:
+            self._invalid_sub_models.add(model)
+
+    def _make_block(self, model):
+        """Computes a row map block for given sub model.
+
+        Args:
+            model (MinimalTableModel)
+
+        Returns:
+            tuple: accepted sub rows and the sub model's row count
+        """
+        row_count = model.rowCount()
+        return _compact_rows(self._rows_for_model(model), row_count), row_count
 
     @staticmethod
-    def _row_map_for_model(model):
-        """Returns row map for given model.
+    def _rows_for_model(model):
+        """Returns the rows of given model to include in the compound model.
         The base class implementation just returns all model rows.
 
         Args:
             model (MinimalTableModel)
 
         Returns:
-            list: tuples (model, row number)
+            Iterable of int: row numbers in ascending order
         """
-        return [(model, i) for i in range(model.rowCount())]
+        return range(model.rowCount())
 
     def canFetchMore(self, parent=QModelIndex()):
         """Returns True if any of the submodels that haven't been fetched yet can fetch more."""
@@ -274,22 +453,16 @@ class CompoundWithEmptyTableModel(CompoundTableModel):
             )
 
     def _recompute_empty_row_map(self):
-        """Recomputeds the part of the row map corresponding to the empty model."""
-        empty_row_map = self._row_map_for_model(self.empty_model)
-        try:
-            row = self._inv_row_map[self.empty_model, 0]
-            self._row_map = self._row_map[:row]
-        except KeyError:
-            pass
-        self._append_row_map(empty_row_map)
+        """Recomputes the part of the row map corresponding to the empty model."""
+        self._row_map.set_block(self.empty_model, *self._make_block(self.empty_model))
 
     @Slot("QModelIndex", "int", "int")
     def _handle_empty_rows_removed(self, parent, empty_first, empty_last):
         """Runs when rows are removed from the empty model.
         Updates row_map, then emits rowsRemoved so the removed rows are no longer visible.
         """
-        first = self._inv_row_map[self.empty_model, empty_first]
-        last = self._inv_row_map[self.empty_model, empty_last]
+        first = self._row_map.row_of(self.empty_model, empty_first)
+        last = self._row_map.row_of(self.empty_model, empty_last)
         self._recompute_empty_row_map()
         self.rowsRemoved.emit(QModelIndex(), first, last)
 
@@ -299,31 +472,35 @@ class CompoundWithEmptyTableModel(CompoundTableModel):
         Updates row_map, then emits rowsInserted so the new rows become visible.
         """
         self._recompute_empty_row_map()
-        first = self._inv_row_map[self.empty_model, empty_first]
-        last = self._inv_row_map[self.empty_model, empty_last]
+        first = self._row_map.row_of(self.empty_model, empty_first)
+        last = self._row_map.row_of(self.empty_model, empty_last)
         self.rowsInserted.emit(QModelIndex(), first, last)
 
     def _handle_single_model_reset(self, single_model):
         """Runs when one of the single models is reset.
         Updates row_map, then emits rowsInserted so the new rows become visible.
         """
-        single_row_map = self._row_map_for_model(single_model)
-        self._insert_single_row_map(single_row_map)
+        self._insert_single_model_rows(single_model, *self._make_block(single_model))
+
+    def _insert_single_model_rows(self, single_model, rows, row_count):
+        """Inserts given single model's rows to the row map just before the empty model's.
 
-    def _insert_single_row_map(self, single_row_map):
-        """Inserts given row map just before the empty model's."""
-        if not single_row_map:
+        Args:
+            single_model (MinimalTableModel): single model
+            rows (Sequence): accepted rows
+            row_count (int): single model's row count
+        """
+        if not rows:
             return
-        try:
-            row = self._inv_row_map[self.empty_model, 0]
-            self._row_map, empty_row_map = self._row_map[:row], self._row_map[row:]
-        except KeyError:
-            row = self.rowCount()
-            empty_row_map = []
-        self._append_row_map(single_row_map)
-        self._append_row_map(empty_row_map)
-        first = row
-        last = row + len(single_row_map) - 1
+        existing_block = self._row_map.block(single_model)
+        if existing_block is not None and existing_block[0]:
+            self.layoutAboutToBeChanged.emit()
+            self._row_map.set_block(single_model, rows, row_count)
+            self.layoutChanged.emit()
+            return
+        self._row_map.set_block(single_model, rows, row_count, before=self.empty_model)
+        first = self._row_map.first_row(single_model)
+        last = first + len(rows) - 1
         self.rowsInserted.emit(QModelIndex(), first, last)
 
     def clear_model(self):
@@ -335,4 +512,4 @@ class CompoundWithEmptyTableModel(CompoundTableModel):
         for m in self.sub_models:
             m.deleteLater()
         self.sub_models.clear()
-        self._inv_row_map.clear()
+        self._invalid_sub_models.clear()
@@ -18,7 +18,12 @@ Provides FilterCheckboxListModel for FilterWidget.
 
 import re
 import bisect
+import numpy as np
 from PySide2.QtCore import Qt, QModelIndex, QAbstractListModel
+from ..helpers import rows_to_row_count_tuples
+
+_MAX_REMOVED_ROW_RANGES = 16
+"""Maximum number of separate row ranges to remove with beginRemoveRows() before resetting the model instead."""
 
 
 class SimpleFilterCheckboxListModel(QAbstractListModel):
@@ -34,6 +39,7 @@ class SimpleFilterCheckboxListModel(QAbstractListModel):
         self._selected = set()
         self._selected_filtered = set()
         self._is_base_filtered = False
+        self._base_filter = None
         self._base_filter_index = []
         self._is_filtered = False
         self._filter_index = []
@@ -154,6 +160,8 @@ class SimpleFilterCheckboxListModel(QAbstractListModel):
             self._selected = set()
             self._all_selected = False
             self._empty_selected = False
+        if self._is_base_filtered:
+            self._base_filter_index = [i for i, item in enumerate(self._data) if self._base_filter(item)]
         self.remove_filter()
         self.endResetModel()
 
@@ -177,7 +185,7 @@ class SimpleFilterCheckboxListModel(QAbstractListModel):
         if filter_expression and (isinstance(filter_expression, str) and not filter_expression.isspace()):
             self._select_all_str = '(Select all filtered)'
             self._filter_expression = filter_expression
-            self._filter_index = [i for i, item in enumerate(self._data) if re.search(self._filter_expression, item)]
+            self._filter_index = [i for i, item in enumerate(self._data) if self._filter_accepts(item)]
             self._selected_filtered = set(self._data[i] for i in self._filter_index)
             self._add_to_selection = False
             self.beginResetModel()
@@ -196,9 +204,13 @@ class SimpleFilterCheckboxListModel(QAbstractListModel):
         Args:
             condition (function): Filter acceptance condition.
         """
+        self._base_filter = condition
         self._base_filter_index = [i for i, item in enumerate(self._data) if condition(item)]
         self._is_base_filtered = True
-        self._filter_index = self._base_filter_index
+        if self._filter_expression:
+            self._filter_index = [i for i in self._base_filter_index if self._expression_accepts(self._data[i])]
+        else:
+            self._filter_index = self._base_filter_index
         self._selected_filtered = set(self._data[i] for i in self._filter_index)
         self.beginResetModel()
         self._is_filtered = True
@@ -244,12 +256,31 @@ class SimpleFilterCheckboxListModel(QAbstractListModel):
         self._all_selected = self._check_all_selected()
         self.endResetModel()
 
+    def _expression_accepts(self, item):
+        """Returns True if item matches the filter expression typed in the search bar."""
+        return not self._filter_expression or re.search(self._filter_expression, item) is not None
+
+    def _filter_accepts(self, item):
+        """Returns True if item passes both the base filter and the filter expression."""
+        if self._is_base_filtered and not self._base_filter(item):
+            return False
+        return self._expression_accepts(item)
+
     def _do_add_items(self, data):
+        """Adds items to the end of the list.
+
+        Args:
+            data (list): items to add
+
+        Returns:
+            list or range: rows in self._data where the items ended up, in ascending order
+        """
         first = len(self._data)
         last = first + len(data) - 1
         self.beginInsertRows(self.index(0, 0), first, last)
         self._data += data
         self.endInsertRows()
+        return range(first, last + 1)
 
     def add_items(self, data, selected=None):
         if selected is None:
@@ -257,32 +288,113 @@ class SimpleFilterCheckboxListModel(QAbstractListModel):
         data = [x for x in data if x not in self._data_set]
         if not data:
             return
-        self._do_add_items(data)
+        new_rows = self._do_add_items(data)
         self._data_set.update(data)
         if selected:
             self._selected.update(data)
-            if self._is_filtered:
-                self._selected_filtered.update(data)
         if self._is_filtered:
-            self._filter_index = [i for i, item in enumerate(self._data) if re.search(self._filter_expression, item)]
+            accepted_new_rows = self._update_filter_indexes_after_insertion(new_rows)
+            if selected:
+                self._selected_filtered.update(self._data[row] for row in accepted_new_rows)
         self._all_selected = self._check_all_selected()
 
+    def _update_filter_indexes_after_insertion(self, new_rows):
+        """Updates the filter indexes incrementally so that filters are evaluated for the new items only.
+
+        Args:
+            new_rows (Sequence of int): rows of the inserted items in ascending order
+
+        Returns:
+            list of int: inserted rows that were accepted into the filter index
+        """
+        is_new = np.zeros(len(self._data), dtype=bool)
+        is_new[new_rows] = True
+        old_to_new_rows = np.flatnonzero(~is_new)
+        if self._is_base_filtered:
+            accepted_new_rows = [row for row in new_rows if self._base_filter(self._data[row])]
+            self._base_filter_index = _merged_index(old_to_new_rows, self._base_filter_index, accepted_new_rows)
+            if not self._filter_expression:
+                self._filter_index = self._base_filter_index
+                return accepted_new_rows
+            new_rows = accepted_new_rows
+        accepted_new_rows = [row for row in new_rows if self._expression_accepts(self._data[row])]
+        self._filter_index = _merged_index(old_to_new_rows, self._filter_index, accepted_new_rows)
+        return accepted_new_rows
+
     def remove_items(self, data):
         data = set(data)
         if not data.intersection(self._data_set):
             return
-        for k, item in reversed(list(enumerate(self._data))):
-            if item in data:
-                self.beginRemoveRows(self.index(0, 0), k, k)
-                self._data.pop(k)
+        removed_rows = [row for row, item in enumerate(self._data) if item in data]
+        removed_ranges = rows_to_row_count_tuples(removed_rows)
+        if self._is_filtered or len(removed_ranges) > _MAX_REMOVED_ROW_RANGES:
+            self.beginResetModel()
+            self._data = [item for item in self._data if item not in data]
+            self._update_filter_indexes_after_removal(removed_rows)
+            self.endResetModel()
+        else:
+            offset = len(self._action_rows)
+            for row, count in reversed(removed_ranges):
+                self.beginRemoveRows(QModelIndex(), row + offset, row + offset + count - 1)
+                del self._data[row : row + count]
                 self.endRemoveRows()
+            self._update_filter_indexes_after_removal(removed_rows)
         self._data_set.difference_update(data)
         self._selected.difference_update(data)
         if self._is_filtered:
-            self._filter_index = [i for i, item in enumerate(self._data) if re.search(self._filter_expression, item)]
             self._selected_filtered.difference_update(data)
         self._all_selected = self._check_all_selected()
 
+    def _update_filter_indexes_after_removal(self, removed_rows):
+        """Drops removed rows from the filter indexes and shifts the remaining ones.
+
+        Args:
+            removed_rows (list of int): removed rows in ascending order
+        """
+        if not self._is_base_filtered and not self._is_filtered:
+            return
+        is_kept = np.ones(len(self._data) + len(removed_rows), dtype=bool)
+        is_kept[removed_rows] = False
+        new_rows = np.cumsum(is_kept) - 1
+        base_is_filter = self._filter_index is self._base_filter_index
+        if self._is_base_filtered:
+            self._base_filter_index = _shrunk_index(new_rows, is_kept, self._base_filter_index)
+        if base_is_filter:
+            self._filter_index = self._base_filter_index
+        elif self._is_filtered:
+            self._filter_index = _shrunk_index(new_rows, is_kept, self._filter_index)
+
+
+def _merged_index(old_to_new_rows, index, accepted_new_rows):
+    """Returns a filter index updated after insertion.
+
+    Args:
+        old_to_new_rows (ndarray): maps rows before insertion to rows after insertion
+        index (list of int): filter index before insertion
+        accepted_new_rows (list of int): inserted rows that pass the filter
+
+    Returns:
+        list of int: filter index after insertion
+    """
+    merged = np.concatenate((old_to_new_rows[index], np.array(accepted_new_rows, dtype=int)))
+    merged.sort()
+    return merged.tolist()
+
+
+def _shrunk_index(new_rows, is_kept, index):
+    """Returns a filter index updated after removal.
+
+    Args:
+        new_rows (ndarray): maps rows before removal to rows after removal
+        is_kept (ndarray): True for rows that were not removed
+        index (list of int): filter index before removal
+
+    Returns:
+        list of int: filter index after removal
+    """
+    index = np.array(index, dtype=int)
+    return new_rows[index[is_kept[index]]].tolist()
+
 
 class LazyFilterCheckboxListModel(SimpleFilterCheckboxListModel):
     """Extends SimpleFilterCheckboxListModel to allow for lazy loading in synch with another model.
@@ -313,6 +425,7 @@ class LazyFilterCheckboxListModel(SimpleFilterCheckboxListModel):
     def _do_add_items(self, data):
         """Adds items so the list is always sorted, while assuming that both existing and new items are sorted.
         """
+        new_rows = []
         data_iter = iter(data)
         item = next(data_iter)
         consecutive_items = [item]
@@ -326,12 +439,15 @@ class LazyFilterCheckboxListModel(SimpleFilterCheckboxListModel):
             self.beginInsertRows(self.index(0, 0), lo, lo + count - 1)
             self._data[lo:lo] = consecutive_items
             self.endInsertRows()
+            new_rows += range(lo, lo + count)
             consecutive_items = [item]
             lo = row + count
         count = len(consecutive_items)
         self.beginInsertRows(self.index(0, 0), lo, lo + count - 1)
         self._data[lo:lo] = consecutive_items
         self.endInsertRows()
+        new_rows += range(lo, lo + count)
+        return new_rows
 
 
 class DataToValueFilterCheckboxListModel(SimpleFilterCheckboxListModel):
@@ -16,6 +16,7 @@ A model for indexed parameter values, used by the parameter value editors.
 :date:   18.6.2019
 """
 
+import numpy as np
 from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt
 
 
@@ -33,6 +34,62 @@ class IndexedValueTableModel(QAbstractTableModel):
         self._index_header = index_header
         self._value_header = value_header
 
+    def batch_set_data(self, indexes, values):
+        """
+        Sets data for several indexes at once.
+
+        The new data is collected per column and written into the value's arrays in one go.
+
+        Args:
+            indexes (Sequence): a sequence of model indexes
+            values (Sequence): a sequence of indexes/floats corresponding to the model indexes
+        """
+        rows_per_column = ([], [])
+        values_per_column = ([], [])
+        for index, value in zip(indexes, values):
+            column = index.column()
+            rows_per_column[column].append(index.row())
+            values_per_column[column].append(value)
+        modified_columns = [
+            column
+            for column, setter in enumerate((self._set_indexes, self._set_values))
+            if rows_per_column[column] and setter(rows_per_column[column], values_per_column[column])
+        ]
+        if not modified_columns:
+            return
+        modified_rows = [row for column in modified_columns for row in rows_per_column[column]]
+        top_left = self.index(min(modified_rows), modified_columns[0])
+        bottom_right = self.index(max(modified_rows), modified_columns[-1])
+        self.dataChanged.emit(top_left, bottom_right, [Qt.EditRole])
+
+    def _set_indexes(self, rows, indexes):
+        """
+        Sets the value's indexes at given rows.
+
+        Args:
+            rows (list of int): rows to set
+            indexes (list): new indexes
+
+        Returns:
+            bool: True if the indexes were set
+        """
+        _set_elements(self._value.indexes, rows, indexes)
+        return True
+
+    def _set_values(self, rows, values):
+        """
+        Sets the value's values at given rows.
+
+        Args:
+            rows (list of int): rows to set
+            values (list): new values
+
+        Returns:
+            bool: True if the values were set
+        """
+        _set_elements(self._value.values, rows, values)
+        return True
+
     def columnCount(self, parent=QModelIndex()):
         """Returns the number of columns which is two."""
         return 2
@@ -67,3 +124,12 @@ class IndexedValueTableModel(QAbstractTableModel):
     def value(self):
         """Returns the parameter value associated with the model."""
         return self._value
+
+
+def _set_elements(sequence, rows, elements):
+    """Sets elements in an array with a single fancy indexing operation or in a list one by one."""
+    if isinstance(sequence, np.ndarray):
+        sequence[rows] = elements
+        return
+    for row, element in zip(rows, elements):
+        sequence[row] = element
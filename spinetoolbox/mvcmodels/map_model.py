@@ -66,6 +66,34 @@ class MapModel(QAbstractTableModel):
         self._rows = list(map(lambda row: row + [None], self._rows))
         self.endInsertColumns()
 
+    def batch_set_data(self, indexes, values):
+        """
+        Sets data for several indexes at once.
+
+        Args:
+            indexes (Sequence): a sequence of model indexes
+            values (Sequence): a sequence of JSON representations corresponding to the indexes
+
+        Returns:
+            bool: True if any data was set
+        """
+        modified_rows = list()
+        modified_columns = list()
+        for index, value in zip(indexes, values):
+            if not index.isValid():
+                continue
+            row = index.row()
+            column = index.column()
+            if self._set_data(row, column, value):
+                modified_rows.append(row)
+                modified_columns.append(column)
+        if not modified_rows:
+            return False
+        top_left = self.index(min(modified_rows), min(modified_columns))
+        bottom_right = self.index(max(modified_rows), max(modified_columns))
+        self.dataChanged.emit(top_left, bottom_right, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
     def columnCount(self, index=QModelIndex()):
         """Returns the number of columns in this model."""
         if not self._rows:
@@ -136,7 +164,7 @@ class MapModel(QAbstractTableModel):
             else:
                 row_before = [None, None]
         template = row_before[:-2] + ["key", 0.0]
-        self._rows = self._rows[:row] + count * [template] + self._rows[row:]
+        self._rows[row:row] = [list(template) for _ in range(count)]
         self.endInsertRows()
         return True
 
@@ -166,7 +194,7 @@ class MapModel(QAbstractTableModel):
         if not self._rows:
             return False
         self.beginRemoveRows(parent, row, row + count - 1)
-        self._rows = self._rows[:row] + self._rows[row + count :]
+        del self._rows[row : row + count]
         self.endRemoveRows()
         return True
 
@@ -183,8 +211,22 @@ class MapModel(QAbstractTableModel):
         """
         if not index.isValid() or role != Qt.EditRole:
             return False
+        return self._set_data(index.row(), index.column(), value)
+
+    def _set_data(self, row, column, value):
+        """
+        Sets data in a single cell.
+
+        Args:
+            row (int): row index
+            column (int): column index
+            value (str): JSON representation of the value
+
+        Returns:
+            bool: True if the operation was successful
+        """
         if not value:
-            self._rows[index.row()][index.column()] = None
+            self._rows[row][column] = None
             return True
         try:
             new_value = from_database(value)
@@ -192,7 +234,7 @@ class MapModel(QAbstractTableModel):
             return False
         if not isinstance(new_value, (str, float, Duration, DateTime)):
             return False
-        self._rows[index.row()][index.column()] = from_database(value)
+        self._rows[row][column] = new_value
         return True
 
     def trim_columns(self):
@@ -143,28 +143,9 @@ class TimeSeriesModelFixedResolution(IndexedValueTableModel):
         self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
         return True
 
-    def batch_set_data(self, indexes, values):
-        """
-        Sets data for several indexes at once.
-
-        Only the values of the series are modified as the time stamps are immutable.
-
-        Args:
-            indexes (Sequence): a sequence of model indexes
-            values (Sequence): a sequence of floats corresponding to the indexes
-        """
-        rows = []
-        for index, value in zip(indexes, values):
-            if index.column() != 1:
-                continue
-            row = index.row()
-            self._value.values[row] = value
-            rows.append(row)
-        if not rows:
-            return
-        top = min(rows)
-        bottom = max(rows)
-        self.dataChanged.emit(self.index(top, 1), self.index(bottom, 1), [Qt.EditRole])
+    def _set_indexes(self, rows, indexes):
+        """Time stamps are immutable in fixed resolution series; does nothing."""
+        return False
 
     @Slot(bool, name="set_ignore_year")
     def set_ignore_year(self, ignore_year):
@@ -135,7 +135,7 @@ def add_array_plot(plot_widget, value, label=None):
         value (Array): the array to plot
         label (str): a label for the array
     """
-    plot_widget.canvas.axes.plot(value.indexes, value.values, label=label)
+    plot_widget.canvas.plot_downsampled(value.indexes, value.values, label=label)
 
 
 def add_map_plot(plot_widget, map_value, label=None):
@@ -170,7 +170,7 @@ def add_time_series_plot(plot_widget, value, label=None):
         value (TimeSeries): the time series to plot
         label (str): a label for the time series
     """
-    plot_widget.canvas.axes.step(value.indexes, value.values, label=label, where='post')
+    plot_widget.canvas.plot_downsampled(value.indexes, value.values, step=True, label=label)
     # matplotlib cannot have time stamps before 0001-01-01T00:00 on the x axis
     left, _ = plot_widget.canvas.axes.get_xlim()
     if left < 1.0:
@@ -332,7 +332,7 @@ def _add_plot_to_widget(values, labels, plot_widget):
         for value, label in zip(values, labels):
             add_array_plot(plot_widget, value, label)
     elif isinstance(values[1][0], Number):
-        plot_widget.canvas.axes.plot(values[0], values[1], label=labels[0])
+        plot_widget.canvas.plot_downsampled(values[0], values[1], label=labels[0])
         if isinstance(values[0][0], str):
             # matplotlib tries to plot every single x tick label if they are strings.
             # This can become very slow if the labels are numerous.
@@ -18,7 +18,7 @@ Spine Toolbox project class.
 
 import os
 import json
-from PySide2.QtCore import Slot, Signal
+from PySide2.QtCore import Slot, Signal, QTimer
 from PySide2.QtWidgets import QMessageBox
 from spine_engine import SpineEngine, SpineEngineState
 from .category import CATEGORIES
@@ -36,6 +36,9 @@ from .project_commands import (
     RemoveAllProjectItemsCommand,
 )
 
+_DAG_NOTIFICATION_DELAY = 50
+"""Time in milliseconds during which DAG change notifications are collected into a single batch."""
+
 
 class SpineToolboxProject(MetaObject):
     """Class for Spine Toolbox projects."""
@@ -80,6 +83,11 @@ class SpineToolboxProject(MetaObject):
         self._embedded_julia_console = embedded_julia_console
         self._embedded_python_console = embedded_python_console
         self.dag_handler = DirectedGraphHandler()
+        self._changed_dag_nodes = set()
+        self._dag_notification_timer = QTimer(self)
+        self._dag_notification_timer.setSingleShot(True)
+        self._dag_notification_timer.setInterval(_DAG_NOTIFICATION_DELAY)
+        self._dag_notification_timer.timeout.connect(self._notify_pending_dag_changes)
         self.db_mngr = SpineDBManager(settings, logger, self)
         self.engine = None
         self._execution_stopped = True
@@ -202,6 +210,8 @@ class SpineToolboxProject(MetaObject):
         # Write into JSON file
         with open(self.config_file, "w") as fp:
             json.dump(saved_dict, fp, indent=4)
+        for item in self._project_item_model.items():
+            item.project_item.project_saved()
         return True
 
     def load(self, objects_dict):
@@ -435,6 +445,7 @@ class SpineToolboxProject(MetaObject):
         icon = item.project_item.get_icon()
         self._toolbox.ui.graphicsView.remove_icon(icon)
         self.dag_handler.remove_node_from_graph(item.name)
+        self._changed_dag_nodes.discard(item.name)
         item.project_item.tear_down()
         if delete_data:
             if data_dir:
@@ -589,7 +600,58 @@ class SpineToolboxProject(MetaObject):
 
     @Slot("QVariant")
     def notify_changes_in_dag(self, dag):
-        """Notifies the items in given dag that the dag has changed."""
+        """Schedules notifying the items in given dag that the dag has changed."""
+        self._schedule_dag_notification(dag.nodes)
+
+    def notify_changes_in_all_dags(self):
+        """Schedules notifying all items of changes in all dags in the project."""
+        for g in self.dag_handler.dags():
+            self.notify_changes_in_dag(g)
+
+    def notify_changes_in_containing_dag(self, item):
+        """Schedules notifying given item and the items downstream of it that the dag has changed."""
+        dag = self.dag_handler.dag_with_node(item)
+        # Some items trigger this method while they are being initialized
+        # but before they have been added to any DAG.
+        # In those cases we don't need to notify other items.
+        if dag:
+            self._schedule_dag_notification((item,))
+
+    def _schedule_dag_notification(self, item_names):
+        """Marks given items changed and starts the timer that notifies the changes in a batch.
+
+        Args:
+            item_names (Iterable of str): names of changed items
+        """
+        for name in item_names:
+            self._changed_dag_nodes.add(name)
+        if not self._dag_notification_timer.isActive():
+            self._dag_notification_timer.start()
+
+    @Slot()
+    def _notify_pending_dag_changes(self):
+        """Notifies the changed items and the items downstream of them that their dag has changed.
+
+        Resources are cached for the duration of a single pass only
+        since items may provide resources from the file system which can change without the project knowing.
+        """
+        self._dag_notification_timer.stop()
+        changed_nodes = self._changed_dag_nodes
+        self._changed_dag_nodes = set()
+        resource_cache = dict()
+        for dag in self.dag_handler.dags():
+            changed_dag_nodes = changed_nodes.intersection(dag.nodes)
+            if changed_dag_nodes:
+                self._notify_dag_nodes(dag, changed_dag_nodes, resource_cache)
+
+    def _notify_dag_nodes(self, dag, changed_nodes, resource_cache):
+        """Notifies changed nodes and their descendants in given dag.
+
+        Args:
+            dag (DiGraph): a dag
+            changed_nodes (set of str): names of changed items in the dag
+            resource_cache (dict): mapping from item name to resources the item provides to its direct successors
+        """
         node_successors = self.dag_handler.node_successors(dag)
         if not node_successors:
             # Not a dag, invalidate workflow
@@ -599,29 +661,36 @@ class SpineToolboxProject(MetaObject):
                 project_item = self._project_item_model.item(ind).project_item
                 project_item.invalidate_workflow(edges)
             return
-        # Make resource map and run simulation
+        # Make resource map and run simulation for the changed part of the dag
         node_predecessors = inverted(node_successors)
+        affected_nodes = set(changed_nodes)
         for rank, item_name in enumerate(node_successors):
+            if item_name not in affected_nodes:
+                continue
+            affected_nodes.update(node_successors[item_name])
             item = self._project_item_model.get_item(item_name).project_item
             resources = []
             for parent_name in node_predecessors.get(item_name, set()):
-                parent_item = self._project_item_model.get_item(parent_name).project_item
-                resources += parent_item.resources_for_direct_successors()
+                resources += self._resources_for_direct_successors(parent_name, resource_cache)
             item.handle_dag_changed(rank, resources)
+            # Item's resources may depend on its input resources, so they need to be queried again
+            resource_cache.pop(item_name, None)
 
-    def notify_changes_in_all_dags(self):
-        """Notifies all items of changes in all dags in the project."""
-        for g in self.dag_handler.dags():
-            self.notify_changes_in_dag(g)
+    def _resources_for_direct_successors(self, item_name, resource_cache):
+        """Returns resources the given item provides to its direct successors, querying the item only if needed.
 
-    def notify_changes_in_containing_dag(self, item):
-        """Notifies items in dag containing the given item that the dag has changed."""
-        dag = self.dag_handler.dag_with_node(item)
-        # Some items trigger this method while they are being initialized
-        # but before they have been added to any DAG.
-        # In those cases we don't need to notify other items.
-        if dag:
-            self.notify_changes_in_dag(dag)
+        Args:
+            item_name (str): project item's name
+            resource_cache (dict): mapping from item name to resources already queried
+
+        Returns:
+            list: a list of ProjectItemResources
+        """
+        resources = resource_cache.get(item_name)
+        if resources is None:
+            item = self._project_item_model.get_item(item_name).project_item
+            resources = resource_cache[item_name] = item.resources_for_direct_successors()
+        return resources
 
     @property
     def settings(self):
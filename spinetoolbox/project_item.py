@@ -307,6 +307,11 @@ class ProjectItem(MetaObject):
         Implement in subclasses to eg close all QMainWindows opened by this item.
         """
 
+    def project_saved(self):
+        """Called after the project, including this item's dictionary, has been written to disk.
+        Implement in subclasses to eg remove files the saved item does not refer to anymore.
+        """
+
     def set_up(self):
         """Sets up this item. Called when adding the item to the project.
         Implement in subclasses to eg recreate attributes destroyed by tear_down.
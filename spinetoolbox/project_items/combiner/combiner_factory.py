@@ -17,10 +17,6 @@ The ViewFactory class.
 """
 
 from spinetoolbox.project_item import ProjectItemFactory
-from .combiner import Combiner
-from .combiner_icon import CombinerIcon
-from .widgets.combiner_properties_widget import CombinerPropertiesWidget
-from .widgets.add_combiner_widget import AddCombinerWidget
 
 
 class CombinerFactory(ProjectItemFactory):
@@ -30,14 +26,20 @@ class CombinerFactory(ProjectItemFactory):
 
     @property
     def item_maker(self):
+        from .combiner import Combiner  # pylint: disable=import-outside-toplevel
+
         return Combiner
 
     @property
     def icon_maker(self):
+        from .combiner_icon import CombinerIcon  # pylint: disable=import-outside-toplevel
+
         return CombinerIcon
 
     @property
     def add_form_maker(self):
+        from .widgets.add_combiner_widget import AddCombinerWidget  # pylint: disable=import-outside-toplevel
+
         return AddCombinerWidget
 
     @property
@@ -50,4 +52,8 @@ class CombinerFactory(ProjectItemFactory):
 
     @staticmethod
     def _make_properties_widget(toolbox):
+        from .widgets.combiner_properties_widget import (  # pylint: disable=import-outside-toplevel
+            CombinerPropertiesWidget,
+        )
+
         return CombinerPropertiesWidget(toolbox)
@@ -20,7 +20,7 @@ import os
 import shutil
 import logging
 import pathlib
-from PySide2.QtCore import Slot, QFileSystemWatcher, Qt, QFileInfo
+from PySide2.QtCore import Slot, QFileSystemWatcher, Qt, QFileInfo, QTimer
 from PySide2.QtGui import QStandardItem, QStandardItemModel, QIcon, QPixmap
 from PySide2.QtWidgets import QFileDialog, QStyle, QFileIconProvider, QInputDialog, QMessageBox
 from spinetoolbox.project_item import ProjectItem
@@ -32,6 +32,12 @@ from .commands import AddDCReferencesCommand, RemoveDCReferencesCommand
 from .executable_item import ExecutableItem
 from .item_info import ItemInfo
 
+_REFRESH_DELAY = 100
+"""Time in milliseconds during which data directory changes are collected before refreshing the data list."""
+
+_file_icons = dict()
+"""Cache of file icons by file name extension."""
+
 
 class DataConnection(ProjectItem):
     def __init__(self, toolbox, project, logger, name, description, x, y, references=None):
@@ -53,6 +59,10 @@ class DataConnection(ProjectItem):
         self.data_model = QStandardItemModel()  # Paths of project internal files. These are found in DC data directory
         self.datapackage_icon = QIcon(QPixmap(":/icons/datapkg.png"))
         self.data_dir_watcher = None
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(_REFRESH_DELAY)
+        self._refresh_timer.timeout.connect(self.refresh)
         # Populate references model
         if references is None:
             references = list()
@@ -68,7 +78,7 @@ class DataConnection(ProjectItem):
         self.data_dir_watcher = QFileSystemWatcher(self)
         if os.path.isdir(self.data_dir):
             self.data_dir_watcher.addPath(self.data_dir)
-        self.data_dir_watcher.directoryChanged.connect(self.refresh)
+        self.data_dir_watcher.directoryChanged.connect(self._schedule_refresh)
 
     @staticmethod
     def item_type():
@@ -330,11 +340,35 @@ class DataConnection(ProjectItem):
         return files
 
     @Slot("QString")
-    def refresh(self, _=None):
-        """Refresh data files in Data Connection Properties.
-        NOTE: Might lead to performance issues."""
-        d = self.data_files()
-        self.populate_data_list(d)
+    def _schedule_refresh(self, _=None):
+        """Starts the timer that refreshes data files once the data directory has settled for a while."""
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    @Slot()
+    def refresh(self):
+        """Updates data files in Data Connection Properties.
+
+        Only rows of files that have been added or removed are touched.
+        Emits item_changed if the set of data files has changed.
+        """
+        self._refresh_timer.stop()
+        files = self.data_files()
+        file_set = set(files)
+        listed_files = set()
+        files_removed = False
+        for row in reversed(range(self.data_model.rowCount())):
+            path = self.data_model.item(row).data(Qt.UserRole)
+            if path in file_set:
+                listed_files.add(path)
+            else:
+                self.data_model.removeRow(row)
+                files_removed = True
+        added_files = [path for path in files if path not in listed_files]
+        for path in added_files:
+            self.data_model.appendRow(self._make_data_item(path))
+        if added_files or files_removed:
+            self.item_changed.emit()
 
     def populate_reference_list(self, items, emit_item_changed=True):
         """List file references in QTreeView.
@@ -360,17 +394,28 @@ class DataConnection(ProjectItem):
         self.data_model.setHorizontalHeaderItem(0, QStandardItem("Data"))  # Add header
         if items is not None:
             for item in items:
-                qitem = QStandardItem(item)
-                qitem.setFlags(~Qt.ItemIsEditable)
-                if item == 'datapackage.json':
-                    qitem.setData(self.datapackage_icon, Qt.DecorationRole)
-                else:
-                    qitem.setData(QFileIconProvider().icon(QFileInfo(item)), Qt.DecorationRole)
-                full_path = os.path.join(self.data_dir, item)  # For drag and drop
-                qitem.setData(full_path, Qt.UserRole)
-                self.data_model.appendRow(qitem)
+                self.data_model.appendRow(self._make_data_item(item))
         self.item_changed.emit()
 
+    def _make_data_item(self, item):
+        """Creates a row for the data file list.
+
+        Args:
+            item (str): path to a data file
+
+        Returns:
+            QStandardItem: a new item
+        """
+        qitem = QStandardItem(item)
+        qitem.setFlags(~Qt.ItemIsEditable)
+        if os.path.basename(item) == 'datapackage.json':
+            qitem.setData(self.datapackage_icon, Qt.DecorationRole)
+        else:
+            qitem.setData(_file_icon(item), Qt.DecorationRole)
+        full_path = os.path.join(self.data_dir, item)  # For drag and drop
+        qitem.setData(full_path, Qt.UserRole)
+        return qitem
+
     def update_name_label(self):
         """Update Data Connection tab name label. Used only when renaming project items."""
         self._properties_ui.label_dc_name.setText(self.name)
@@ -418,6 +463,7 @@ class DataConnection(ProjectItem):
     def tear_down(self):
         """Tears down this item. Called by toolbox just before closing.
         Closes the SpineDatapackageWidget instances opened."""
+        self._refresh_timer.stop()
         if self.spine_datapackage_form:
             self.spine_datapackage_form.close()
         watched_paths = self.data_dir_watcher.directories()
@@ -442,3 +488,19 @@ class DataConnection(ProjectItem):
     def default_name_prefix():
         """See base class."""
         return "Data Connection"
+
+
+def _file_icon(path):
+    """Returns an icon for given file from a cache shared by all Data Connections.
+
+    Args:
+        path (str): path to a file
+
+    Returns:
+        QIcon: file's icon
+    """
+    extension = os.path.splitext(path)[1].lower()
+    icon = _file_icons.get(extension)
+    if icon is None:
+        icon = _file_icons[extension] = QFileIconProvider().icon(QFileInfo(path))
+    return icon
@@ -17,10 +17,6 @@ The DataConnectionFactory class.
 """
 
 from spinetoolbox.project_item import ProjectItemFactory
-from .data_connection_icon import DataConnectionIcon
-from .data_connection import DataConnection
-from .widgets.data_connection_properties_widget import DataConnectionPropertiesWidget
-from .widgets.add_data_connection_widget import AddDataConnectionWidget
 
 
 class DataConnectionFactory(ProjectItemFactory):
@@ -30,14 +26,22 @@ class DataConnectionFactory(ProjectItemFactory):
 
     @property
     def item_maker(self):
+        from .data_connection import DataConnection  # pylint: disable=import-outside-toplevel
+
         return DataConnection
 
     @property
     def icon_maker(self):
+        from .data_connection_icon import DataConnectionIcon  # pylint: disable=import-outside-toplevel
+
         return DataConnectionIcon
 
     @property
     def add_form_maker(self):
+        from .widgets.add_data_connection_widget import (  # pylint: disable=import-outside-toplevel
+            AddDataConnectionWidget,
+        )
+
         return AddDataConnectionWidget
 
     @property
@@ -51,4 +55,8 @@ class DataConnectionFactory(ProjectItemFactory):
     @staticmethod
     def _make_properties_widget(toolbox):
         """See base class."""
+        from .widgets.data_connection_properties_widget import (  # pylint: disable=import-outside-toplevel
+            DataConnectionPropertiesWidget,
+        )
+
         return DataConnectionPropertiesWidget(toolbox)
@@ -17,10 +17,6 @@ The DataStoreFactory class.
 """
 
 from spinetoolbox.project_item import ProjectItemFactory
-from .data_store import DataStore
-from .data_store_icon import DataStoreIcon
-from .widgets.data_store_properties_widget import DataStorePropertiesWidget
-from .widgets.add_data_store_widget import AddDataStoreWidget
 
 
 class DataStoreFactory(ProjectItemFactory):
@@ -30,14 +26,20 @@ class DataStoreFactory(ProjectItemFactory):
 
     @property
     def item_maker(self):
+        from .data_store import DataStore  # pylint: disable=import-outside-toplevel
+
         return DataStore
 
     @property
     def icon_maker(self):
+        from .data_store_icon import DataStoreIcon  # pylint: disable=import-outside-toplevel
+
         return DataStoreIcon
 
     @property
     def add_form_maker(self):
+        from .widgets.add_data_store_widget import AddDataStoreWidget  # pylint: disable=import-outside-toplevel
+
         return AddDataStoreWidget
 
     @property
@@ -51,4 +53,8 @@ class DataStoreFactory(ProjectItemFactory):
     @staticmethod
     def _make_properties_widget(toolbox):
         """See base class"""
+        from .widgets.data_store_properties_widget import (  # pylint: disable=import-outside-toplevel
+            DataStorePropertiesWidget,
+        )
+
         return DataStorePropertiesWidget(toolbox)
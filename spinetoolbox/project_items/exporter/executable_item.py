@@ -121,12 +121,13 @@ class ExecutableItem(ExecutableItemBase):
     @classmethod
     def from_dict(cls, item_dict, name, project_dir, app_settings, specifications, logger):
         """See base class."""
+        data_dir = pathlib.Path(project_dir, ".spinetoolbox", "items", item_dict["short name"])
         settings_packs = dict()
         for pack_dict in item_dict["settings_packs"]:
             serialized_url = pack_dict["database_url"]
             url = deserialize_path(serialized_url, project_dir)
             try:
-                settings_pack = SettingsPack.from_dict(pack_dict, url, logger)
+                settings_pack = SettingsPack.from_dict(pack_dict, url, logger, str(data_dir))
             except gdx.GdxExportException as error:
                 logger.msg_error.emit(f"Failed to fully restore Exporter settings: {error}")
                 settings_pack = SettingsPack("")
@@ -134,6 +135,5 @@ class ExecutableItem(ExecutableItemBase):
         cancel_on_error = item_dict.get("cancel_on_error")
         if cancel_on_error is None:
             cancel_on_error = True
-        data_dir = pathlib.Path(project_dir, ".spinetoolbox", "items", item_dict["short name"])
         gams_path = app_settings.value("appSettings/gamsPath", defaultValue=None)
         return cls(name, settings_packs, cancel_on_error, data_dir, gams_path, logger)
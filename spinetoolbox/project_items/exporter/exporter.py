@@ -31,6 +31,7 @@ from .db_utils import latest_database_commit_time_stamp
 from .executable_item import ExecutableItem
 from .item_info import ItemInfo
 from .notifications import Notifications
+from .records_storage import remove_unused_records_files
 from .settings_pack import SettingsPack
 from .settings_state import SettingsState
 from .widgets.gdx_export_settings import GdxExportSettings
@@ -81,6 +82,7 @@ class Exporter(ProjectItem):
         self._settings_packs = dict()
         self._export_list_items = dict()
         self._workers = dict()
+        self._saved_records_hashes = None
         if settings_packs is None:
             settings_packs = list()
         for pack in settings_packs:
@@ -88,7 +90,7 @@ class Exporter(ProjectItem):
             url = deserialize_path(serialized_url, self._project.project_dir)
             url = _normalize_url(url)
             try:
-                settings_pack = SettingsPack.from_dict(pack, url, logger)
+                settings_pack = SettingsPack.from_dict(pack, url, logger, self.data_dir)
             except gdx.GdxExportException as error:
                 logger.msg_error.emit(f"Failed to fully restore Exporter settings: {error}")
                 settings_pack = SettingsPack("")
@@ -350,6 +352,12 @@ class Exporter(ProjectItem):
         settings_pack = self._settings_packs[database_url]
         if settings_pack.state == SettingsState.FETCHING:
             return
+        try:
+            settings_pack.load_records()
+        except gdx.GdxExportException as error:
+            self._logger.msg_error.emit(f"<b>[{self.name}]</b> Failed to restore export settings: {error}")
+            self._start_worker(database_url)
+            return
         # Give window its own settings and indexing domains so Cancel doesn't change anything here.
         settings = deepcopy(settings_pack.settings)
         indexing_settings = deepcopy(settings_pack.indexing_settings)
@@ -452,14 +460,28 @@ class Exporter(ProjectItem):
         d = super().item_dict()
         packs = list()
         for url, pack in self._settings_packs.items():
-            pack_dict = pack.to_dict()
+            pack_dict = pack.to_dict(self.data_dir)
             serialized_url = serialize_url(url, self._project.project_dir)
             pack_dict["database_url"] = serialized_url
             packs.append(pack_dict)
         d["settings_packs"] = packs
+        self._saved_records_hashes = {pack["records_hash"] for pack in packs if "records_hash" in pack}
         d["cancel_on_error"] = self._cancel_on_error
         return d
 
+    def project_saved(self):
+        """See base class."""
+        if self._saved_records_hashes is not None:
+            remove_unused_records_files(self.data_dir, self._saved_records_hashes)
+
+    def rename(self, new_name):
+        """See base class."""
+        if not super().rename(new_name):
+            return False
+        for settings_pack in self._settings_packs.values():
+            settings_pack.move_records(self.data_dir)
+        return True
+
     def _discard_settings_window(self, database_path):
         """Discards the settings window for given database."""
         del self._settings_windows[database_path]
@@ -17,10 +17,6 @@ The ExporterFactory class.
 """
 
 from spinetoolbox.project_item import ProjectItemFactory
-from .exporter import Exporter
-from .exporter_icon import ExporterIcon
-from .widgets.add_exporter_widget import AddExporterWidget
-from .widgets.exporter_properties import ExporterProperties
 
 
 class ExporterFactory(ProjectItemFactory):
@@ -30,14 +26,20 @@ class ExporterFactory(ProjectItemFactory):
 
     @property
     def item_maker(self):
+        from .exporter import Exporter  # pylint: disable=import-outside-toplevel
+
         return Exporter
 
     @property
     def icon_maker(self):
+        from .exporter_icon import ExporterIcon  # pylint: disable=import-outside-toplevel
+
         return ExporterIcon
 
     @property
     def add_form_maker(self):
+        from .widgets.add_exporter_widget import AddExporterWidget  # pylint: disable=import-outside-toplevel
+
         return AddExporterWidget
 
     @property
@@ -51,4 +53,6 @@ class ExporterFactory(ProjectItemFactory):
     @staticmethod
     def _make_properties_widget(toolbox):
         """See base class."""
+        from .widgets.exporter_properties import ExporterProperties  # pylint: disable=import-outside-toplevel
+
         return ExporterProperties(toolbox)
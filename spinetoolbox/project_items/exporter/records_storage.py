@@ -0,0 +1,180 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Contains utilities to store the record orderings of export settings outside project.json.
+
+Records are written into gzipped JSON files in Exporter's data directory.
+The files are content addressed: the file name contains a SHA-1 hash of the uncompressed content
+which is also used to verify the file when it is read back.
+"""
+from collections.abc import MutableMapping
+import gzip
+import hashlib
+import json
+import os
+import os.path
+from spinetoolbox.spine_io.exporters.gdx import GdxExportException
+
+_FILE_NAME_PREFIX = "set_records_"
+_FILE_NAME_SUFFIX = ".json.gz"
+
+
+def records_file_path(records_dir, content_hash):
+    """
+    Returns the path to a records file.
+
+    Args:
+        records_dir (str): directory containing the records files
+        content_hash (str): records' content hash
+
+    Returns:
+        str: path to the file
+    """
+    return os.path.join(records_dir, _FILE_NAME_PREFIX + content_hash + _FILE_NAME_SUFFIX)
+
+
+def save_records(records, records_dir):
+    """
+    Writes records into a content addressed file in given directory.
+
+    Nothing is written if the records have not been loaded from disk in the first place
+    or if a file with identical content exists already.
+
+    Args:
+        records (dict or LazyRecords): a mapping from set names to lists of record keys
+        records_dir (str): directory where to store the file
+
+    Returns:
+        str: records' content hash
+    """
+    if isinstance(records, LazyRecords) and not records.is_loaded:
+        return records.content_hash
+    content = _serialize(records)
+    content_hash = hashlib.sha1(content).hexdigest()
+    path = records_file_path(records_dir, content_hash)
+    if not os.path.exists(path):
+        os.makedirs(records_dir, exist_ok=True)
+        temporary_path = path + ".tmp"
+        with gzip.open(temporary_path, "wb") as records_file:
+            records_file.write(content)
+        os.replace(temporary_path, path)
+    return content_hash
+
+
+def load_records(records_dir, content_hash):
+    """
+    Reads records from a content addressed file.
+
+    Args:
+        records_dir (str): directory containing the records files
+        content_hash (str): records' content hash
+
+    Returns:
+        dict: a mapping from set names to lists of record key tuples
+
+    Raises:
+        GdxExportException: if the file cannot be read or its content does not match the hash
+    """
+    path = records_file_path(records_dir, content_hash)
+    try:
+        with gzip.open(path, "rb") as records_file:
+            content = records_file.read()
+    except OSError as error:
+        raise GdxExportException(f"Failed to read set records from '{path}': {error}")
+    if hashlib.sha1(content).hexdigest() != content_hash:
+        raise GdxExportException(f"Set records file '{path}' is corrupted.")
+    try:
+        records = json.loads(content.decode("utf-8"))
+    except ValueError as error:
+        raise GdxExportException(f"Failed to parse set records in '{path}': {error}")
+    return {set_name: [tuple(keys) for keys in key_lists] for set_name, key_lists in records.items()}
+
+
+def remove_unused_records_files(records_dir, used_hashes):
+    """
+    Deletes records files that are not referred to anymore.
+
+    Args:
+        records_dir (str): directory containing the records files
+        used_hashes (set of str): content hashes of the files to keep
+    """
+    try:
+        file_names = os.listdir(records_dir)
+    except OSError:
+        return
+    for file_name in file_names:
+        if not file_name.startswith(_FILE_NAME_PREFIX) or not file_name.endswith(_FILE_NAME_SUFFIX):
+            continue
+        content_hash = file_name[len(_FILE_NAME_PREFIX) : -len(_FILE_NAME_SUFFIX)]
+        if content_hash not in used_hashes:
+            try:
+                os.remove(os.path.join(records_dir, file_name))
+            except OSError:
+                pass
+
+
+def _serialize(records):
+    """Serializes records into compact, canonical JSON bytes."""
+    return json.dumps(dict(records), separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+class LazyRecords(MutableMapping):
+    """
+    A mapping from set names to record key lists that reads its contents from a records file on first access.
+
+    Deep copying a LazyRecords that has not been loaded yet does not load it.
+    """
+
+    def __init__(self, records_dir, content_hash):
+        """
+        Args:
+            records_dir (str): directory containing the records files
+            content_hash (str): records' content hash
+        """
+        self.records_dir = records_dir
+        self.content_hash = content_hash
+        self._records = None
+
+    @property
+    def is_loaded(self):
+        """True if records have been read from disk."""
+        return self._records is not None
+
+    def load(self):
+        """
+        Reads the records from disk unless they have been loaded already.
+
+        Raises:
+            GdxExportException: if reading the records fails
+        """
+        if self._records is None:
+            self._records = load_records(self.records_dir, self.content_hash)
+
+    def __getitem__(self, set_name):
+        self.load()
+        return self._records[set_name]
+
+    def __setitem__(self, set_name, key_lists):
+        self.load()
+        self._records[set_name] = key_lists
+
+    def __delitem__(self, set_name):
+        self.load()
+        del self._records[set_name]
+
+    def __iter__(self):
+        self.load()
+        return iter(self._records)
+
+    def __len__(self):
+        self.load()
+        return len(self._records)
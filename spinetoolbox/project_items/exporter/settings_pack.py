@@ -15,11 +15,13 @@ Contains the SettingsPack class.
 :author: A. Soininen (VTT)
 :date:   6.5.2020
 """
+import os.path
 import dateutil.parser
 from PySide2.QtCore import QObject, Signal, Slot
 from spinedb_api import DatabaseMapping, SpineDBAPIError
 from spinetoolbox.spine_io.exporters import gdx
 from .notifications import Notifications
+from .records_storage import LazyRecords, records_file_path, save_records
 from .settings_state import SettingsState
 
 
@@ -69,15 +71,28 @@ class SettingsPack(QObject):
         self._state = state
         self.state_changed.emit(state)
 
-    def to_dict(self):
-        """Stores the settings pack into a JSON compatible dictionary."""
+    def to_dict(self, records_dir=None):
+        """
+        Stores the settings pack into a JSON compatible dictionary.
+
+        Args:
+            records_dir (str, optional): if given, set records are stored in a separate file in this directory
+                instead of the dictionary
+
+        Returns:
+            dict: serialized pack
+        """
         d = dict()
         d["output_file_name"] = self.output_file_name
         # Override ERROR by FETCHING so we'll retry reading the database when reopening the project.
         d["state"] = self.state.value
         if self.state not in (SettingsState.OK, SettingsState.INDEXING_PROBLEM):
             return d
-        d["settings"] = self.settings.to_dict()
+        settings_dict = self.settings.to_dict()
+        if records_dir is not None:
+            records = settings_dict.pop("records")
+            d["records_hash"] = save_records(records, records_dir)
+        d["settings"] = settings_dict
         d["indexing_settings"] = gdx.indexing_settings_to_dict(self.indexing_settings)
         d["indexing_domains"] = [domain.to_dict() for domain in self.indexing_domains]
         d["merging_settings"] = {
@@ -89,14 +104,63 @@ class SettingsPack(QObject):
         )
         return d
 
+    def load_records(self):
+        """
+        Makes sure set records have been read from their records file.
+
+        Raises:
+            GdxExportException: if the records cannot be read
+        """
+        if self.settings is None:
+            return
+        records = self.settings.records
+        if isinstance(records, LazyRecords):
+            records.load()
+
+    def move_records(self, records_dir):
+        """
+        Points set records that have not been read yet to a new records directory.
+
+        Args:
+            records_dir (str): directory that now contains the set records files
+        """
+        if self.settings is None:
+            return
+        records = self.settings.records
+        if isinstance(records, LazyRecords):
+            records.records_dir = records_dir
+
     @staticmethod
-    def from_dict(pack_dict, database_url, logger):
-        """Restores the settings pack from a dictionary."""
+    def from_dict(pack_dict, database_url, logger, records_dir=None):
+        """
+        Restores the settings pack from a dictionary.
+
+        Set records stored in a separate file are not read until they are actually needed.
+
+        Args:
+            pack_dict (dict): serialized pack
+            database_url (str): database's URL
+            logger (LoggerInterface): a logger
+            records_dir (str, optional): directory containing the set records files
+
+        Returns:
+            SettingsPack: restored pack
+        """
         pack = SettingsPack(pack_dict["output_file_name"])
         pack.state = SettingsState(pack_dict["state"])
         if pack.state not in (SettingsState.OK, SettingsState.INDEXING_PROBLEM):
             return pack
-        pack.settings = gdx.SetSettings.from_dict(pack_dict["settings"])
+        records_hash = pack_dict.get("records_hash")
+        records = None
+        if records_hash is not None:
+            if not os.path.exists(records_file_path(records_dir, records_hash)):
+                logger.msg_warning.emit(
+                    f"Set records file for database '{database_url}' not found. Exporter settings need to be reset."
+                )
+                pack.state = SettingsState.FETCHING
+                return pack
+            records = LazyRecords(records_dir, records_hash)
+        pack.settings = gdx.SetSettings.from_dict(pack_dict["settings"], records)
         try:
             db_map = DatabaseMapping(database_url)
             value_type_logger = _UnsupportedValueTypeLogger(
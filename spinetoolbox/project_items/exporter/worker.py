@@ -65,7 +65,11 @@ class Worker(QObject):
             return
         if self._previous_settings is not None:
             updated_settings = deepcopy(self._previous_settings)
-            updated_settings.update(result.set_settings)
+            try:
+                updated_settings.update(result.set_settings)
+            except gdx.GdxExportException as error:
+                self.errored.emit(self._database_url, error)
+                return
             updated_indexing_settings, updated_indexing_domains = self._update_indexing_settings(
                 updated_settings, result.indexing_settings
             )
@@ -17,10 +17,6 @@ The ImporterFactory class.
 """
 
 from spinetoolbox.project_item import ProjectItemFactory
-from .importer import Importer
-from .importer_icon import ImporterIcon
-from .widgets.importer_properties_widget import ImporterPropertiesWidget
-from .widgets.add_importer_widget import AddImporterWidget
 
 
 class ImporterFactory(ProjectItemFactory):
@@ -30,14 +26,20 @@ class ImporterFactory(ProjectItemFactory):
 
     @property
     def item_maker(self):
+        from .importer import Importer  # pylint: disable=import-outside-toplevel
+
         return Importer
 
     @property
     def icon_maker(self):
+        from .importer_icon import ImporterIcon  # pylint: disable=import-outside-toplevel
+
         return ImporterIcon
 
     @property
     def add_form_maker(self):
+        from .widgets.add_importer_widget import AddImporterWidget  # pylint: disable=import-outside-toplevel
+
         return AddImporterWidget
 
     @property
@@ -50,4 +52,8 @@ class ImporterFactory(ProjectItemFactory):
 
     @staticmethod
     def _make_properties_widget(toolbox):
+        from .widgets.importer_properties_widget import (  # pylint: disable=import-outside-toplevel
+            ImporterPropertiesWidget,
+        )
+
         return ImporterPropertiesWidget(toolbox)
@@ -17,31 +17,40 @@ Contains Tool's executable item and support functionality.
 """
 
 import datetime
-import fnmatch
 import glob
 import os.path
 import pathlib
-import shutil
 import time
 import uuid
 from PySide2.QtCore import QEventLoop, Slot
 from spinetoolbox.config import DEFAULT_WORK_DIR, TOOL_OUTPUT_DIR
 from spinetoolbox.executable_item_base import ExecutableItemBase
 from spinetoolbox.project_item_resource import ProjectItemResource
+from .file_staging import STAGING_CACHE_DIR_NAME, remove_unused_files, stage_files
 from .item_info import ItemInfo
 from .utils import (
-    file_paths_from_resources,
-    find_file,
+    copy_input_files,
+    file_path_index,
     find_last_output_files,
     flatten_file_path_duplicates,
     is_pattern,
+    prune_result_archives,
+    result_archive_limit,
 )
 
+ARCHIVE_STORE_DIR_NAME = ".blobs"
+"""Name of the directory inside Tool's output directory that stores the contents of archived files."""
+
+PROCESS_LOG_FILE_NAME = ".process_output.log"
+"""Name of the file in result directories that contains the complete output of Tool's process."""
+
 
 class ExecutableItem(ExecutableItemBase):
     """Tool project item's executable parts."""
 
-    def __init__(self, name, work_dir, output_dir, tool_specification, cmd_line_args, logger):
+    def __init__(
+        self, name, work_dir, output_dir, tool_specification, cmd_line_args, logger, archive_limit=0, copy_inputs=False
+    ):
         """
         Args:
             name (str): item's name
@@ -51,6 +60,9 @@ class ExecutableItem(ExecutableItemBase):
             tool_specification (ToolSpecification): a tool specification
             cmd_line_args (list): a list of command line argument to pass to the tool instance
             logger (LoggerInterface): a logger
+            archive_limit (int): number of result directories to keep; 0 keeps all
+            copy_inputs (bool): if True, input files are copied so the Tool can write to them,
+                otherwise they are linked read-only from the staging cache
         """
         super().__init__(name, logger)
         self._work_dir = work_dir
@@ -60,6 +72,8 @@ class ExecutableItem(ExecutableItemBase):
         self._downstream_resources = list()
         self._tool_instance = None
         self._last_return_code = None
+        self._archive_limit = archive_limit
+        self._copy_inputs = copy_inputs
 
     @staticmethod
     def item_type():
@@ -97,7 +111,7 @@ class ExecutableItem(ExecutableItemBase):
         Returns:
             bool: True if the operation was successful, False otherwise
         """
-        n_copied_files = 0
+        copy_paths = list()
         for dst, src_path in paths.items():
             if not os.path.exists(src_path):
                 self._logger.msg_error.emit(f"\tFile <b>{src_path}</b> does not exist")
@@ -119,27 +133,15 @@ class ExecutableItem(ExecutableItemBase):
                         self._logger.msg_error.emit(f"[OSError] Creating directory <b>{work_subdir_path}</b> failed.")
                         return False
                 self._logger.msg.emit(f"\tCopying <b>{src_path}</b> into subdirectory <b>{os.path.sep}{dst_subdir}</b>")
-            try:
-                shutil.copyfile(src_path, dst_path)
-                n_copied_files += 1
-            except OSError as e:
-                self._logger.msg_error.emit(f"Copying file <b>{src_path}</b> to <b>{dst_path}</b> failed")
-                self._logger.msg_error.emit(f"{e}")
-                if e.errno == 22:
-                    msg = (
-                        "The reason might be:\n"
-                        "[1] The destination file already exists and it cannot be "
-                        "overwritten because it is locked by Julia or some other application.\n"
-                        "[2] You don't have the necessary permissions to overwrite the file.\n"
-                        "To solve the problem, you can try the following:\n[1] Execute the Tool in work "
-                        "directory.\n[2] If you are executing a Julia Tool with Julia 0.6.x, upgrade to "
-                        "Julia 0.7 or newer.\n"
-                        "[3] Close any other background application(s) that may have locked the file.\n"
-                        "And try again.\n"
-                    )
-                    self._logger.msg_warning.emit(msg)
-                return False
-        self._logger.msg.emit(f"\tCopied <b>{n_copied_files}</b> input file(s)")
+            copy_paths.append((src_path, dst_path))
+        failures = stage_files(copy_paths, self._input_staging_cache_dir())
+        if failures:
+            src_path, dst_path, error = failures[0]
+            self._logger.msg_error.emit(f"Copying file <b>{src_path}</b> to <b>{dst_path}</b> failed")
+            self._logger.msg_error.emit(f"{error}")
+            self._warn_if_file_is_locked(error)
+            return False
+        self._logger.msg.emit(f"\tCopied <b>{len(copy_paths)}</b> input file(s)")
         return True
 
     def _copy_optional_input_files(self, paths):
@@ -150,28 +152,55 @@ class ExecutableItem(ExecutableItemBase):
         Args:
             paths (dict): key is the source path, value is the destination path
         """
-        n_copied_files = 0
-        for src_path, dst_path in paths.items():
-            try:
-                shutil.copyfile(src_path, dst_path)
-                n_copied_files += 1
-            except OSError as e:
-                self._logger.msg_error.emit(f"Copying optional file <b>{src_path}</b> to <b>{dst_path}</b> failed")
-                self._logger.msg_error.emit(f"{e}")
-                if e.errno == 22:
-                    msg = (
-                        "The reason might be:\n"
-                        "[1] The destination file already exists and it cannot be "
-                        "overwritten because it is locked by Julia or some other application.\n"
-                        "[2] You don't have the necessary permissions to overwrite the file.\n"
-                        "To solve the problem, you can try the following:\n[1] Execute the Tool in work "
-                        "directory.\n[2] If you are executing a Julia Tool with Julia 0.6.x, upgrade to "
-                        "Julia 0.7 or newer.\n"
-                        "[3] Close any other background application(s) that may have locked the file.\n"
-                        "And try again.\n"
-                    )
-                    self._logger.msg_warning.emit(msg)
-        self._logger.msg.emit(f"\tCopied <b>{n_copied_files}</b> optional input file(s)")
+        failures = stage_files(list(paths.items()), self._input_staging_cache_dir())
+        for src_path, dst_path, error in failures:
+            self._logger.msg_error.emit(f"Copying optional file <b>{src_path}</b> to <b>{dst_path}</b> failed")
+            self._logger.msg_error.emit(f"{error}")
+            self._warn_if_file_is_locked(error)
+        self._logger.msg.emit(f"\tCopied <b>{len(paths) - len(failures)}</b> optional input file(s)")
+
+    def _warn_if_file_is_locked(self, error):
+        """Logs possible reasons and remedies if copying failed because the destination file is locked.
+
+        Args:
+            error (OSError): the error that occurred during copying
+        """
+        if error.errno != 22:
+            return
+        msg = (
+            "The reason might be:\n"
+            "[1] The destination file already exists and it cannot be "
+            "overwritten because it is locked by Julia or some other application.\n"
+            "[2] You don't have the necessary permissions to overwrite the file.\n"
+            "To solve the problem, you can try the following:\n[1] Execute the Tool in work "
+            "directory.\n[2] If you are executing a Julia Tool with Julia 0.6.x, upgrade to "
+            "Julia 0.7 or newer.\n"
+            "[3] Close any other background application(s) that may have locked the file.\n"
+            "And try again.\n"
+        )
+        self._logger.msg_warning.emit(msg)
+
+    def _staging_cache_dir(self):
+        """Returns the path to the cache directory for staging files or None if files should be copied directly.
+
+        Files are staged through the cache only when executing in work directory
+        since linking files into Tool's source directory could expose the cached copies to modifications.
+        """
+        if self._work_dir is None:
+            return None
+        return os.path.join(self._work_dir, STAGING_CACHE_DIR_NAME)
+
+    def _input_staging_cache_dir(self):
+        """Returns the path to the cache directory for staging input files or None if they should be copied."""
+        if self._copy_inputs:
+            return None
+        return self._staging_cache_dir()
+
+    def _remove_unused_staged_files(self):
+        """Removes cached files that are not linked to any execution directory anymore."""
+        cache_dir = self._staging_cache_dir()
+        if cache_dir is not None:
+            remove_unused_files(cache_dir)
 
     def _copy_output_files(self, target_dir, execution_dir):
         """Copies Tool specification output files from work directory to given target directory.
@@ -190,6 +219,8 @@ class ExecutableItem(ExecutableItemBase):
         """
         failed_files = list()
         saved_files = list()
+        paths = list()
+        archived_files = list()
         for pattern in self._tool_specification.outputfiles:
             # Create subdirectories if necessary
             dst_subdir, fname_pattern = os.path.split(pattern)
@@ -208,26 +239,67 @@ class ExecutableItem(ExecutableItemBase):
                     fname = os.path.split(fname_path)[1]  # File name (no path)
                     dst = os.path.abspath(os.path.join(target, fname))
                     full_fname = os.path.join(dst_subdir, fname)
-                    try:
-                        shutil.copyfile(fname_path, dst)
-                        saved_files.append((full_fname, dst))
-                    except OSError:
-                        self._logger.msg_error.emit(f"[OSError] Copying pattern {fname_path} to {dst} failed")
-                        failed_files.append(full_fname)
+                    paths.append((fname_path, dst))
+                    archived_files.append(full_fname)
             else:
                 output_file = os.path.abspath(os.path.join(execution_dir, pattern))
                 if not os.path.isfile(output_file):
                     failed_files.append(pattern)
                     continue
                 dst = os.path.abspath(os.path.join(target, fname_pattern))
-                try:
-                    shutil.copyfile(output_file, dst)
-                    saved_files.append((pattern, dst))
-                except OSError:
-                    self._logger.msg_error.emit(f"[OSError] Copying output file {output_file} to {dst} failed")
-                    failed_files.append(pattern)
+                paths.append((output_file, dst))
+                archived_files.append(pattern)
+        errors = stage_files(paths, self._archive_store_dir(), remember_sources=False)
+        failed_destinations = set()
+        for src, dst, _ in errors:
+            self._logger.msg_error.emit(f"[OSError] Copying output file {src} to {dst} failed")
+            failed_destinations.add(dst)
+        for archived_file, (_, dst) in zip(archived_files, paths):
+            if dst in failed_destinations:
+                failed_files.append(archived_file)
+            else:
+                saved_files.append((archived_file, dst))
         return saved_files, failed_files
 
+    def _process_log_path(self):
+        """Returns path to the file where Tool's process writes its output during execution or None if unavailable."""
+        try:
+            os.makedirs(self._output_dir, exist_ok=True)
+        except OSError:
+            return None
+        return os.path.join(self._output_dir, PROCESS_LOG_FILE_NAME)
+
+    def _archive_process_log(self, result_path):
+        """Moves the log of the finished process into given result directory.
+
+        Args:
+            result_path (str): path to the result directory
+        """
+        log_path = os.path.join(self._output_dir, PROCESS_LOG_FILE_NAME)
+        if not os.path.isfile(log_path):
+            return
+        try:
+            os.replace(log_path, os.path.join(result_path, PROCESS_LOG_FILE_NAME))
+        except OSError:
+            self._logger.msg_warning.emit(f"\tCould not move process output log <b>{log_path}</b> to results directory")
+
+    def _archive_store_dir(self):
+        """Returns path to the directory that stores the contents of archived output files."""
+        return os.path.join(self._output_dir, ARCHIVE_STORE_DIR_NAME)
+
+    def _prune_result_archives(self):
+        """Removes old result directories and archived contents that are not needed anymore.
+
+        Archived contents are removed even if there is no limit for result directories
+        since the user may have deleted result directories manually.
+        """
+        if self._archive_limit > 0:
+            failed_dirs = prune_result_archives(self._output_dir, self._archive_limit)
+            failed_dirs += prune_result_archives(os.path.join(self._output_dir, "failed"), self._archive_limit)
+            for failed_dir in failed_dirs:
+                self._logger.msg_warning.emit(f"\tCould not remove old results directory <b>{failed_dir}</b>")
+        remove_unused_files(self._archive_store_dir())
+
     def _copy_program_files(self, execution_dir):
         """Copies Tool specification source files to base directory."""
         # Make work directory anchor with path as tooltip
@@ -237,7 +309,7 @@ class ExecutableItem(ExecutableItemBase):
         self._logger.msg.emit(
             f"*** Copying Tool specification <b>{self._tool_specification.name}</b> program files to {work_anchor} ***"
         )
-        n_copied_files = 0
+        copy_paths = list()
         for source_pattern in self._tool_specification.includes:
             dir_name, file_pattern = os.path.split(source_pattern)
             src_dir = os.path.join(self._tool_specification.path, dir_name)
@@ -252,16 +324,16 @@ class ExecutableItem(ExecutableItemBase):
             if file_pattern:
                 for src_file in glob.glob(os.path.abspath(os.path.join(src_dir, file_pattern))):
                     dst_file = os.path.abspath(os.path.join(dst_dir, os.path.basename(src_file)))
-                    try:
-                        shutil.copyfile(src_file, dst_file)
-                        n_copied_files += 1
-                    except OSError:
-                        self._logger.msg_error.emit(f"\tCopying file <b>{src_file}</b> to <b>{dst_file}</b> failed")
-                        return False
-        if n_copied_files == 0:
+                    copy_paths.append((src_file, dst_file))
+        failures = stage_files(copy_paths, self._staging_cache_dir())
+        if failures:
+            src_file, dst_file, _ = failures[0]
+            self._logger.msg_error.emit(f"\tCopying file <b>{src_file}</b> to <b>{dst_file}</b> failed")
+            return False
+        if not copy_paths:
             self._logger.msg_warning.emit("Warning: No files copied")
         else:
-            self._logger.msg.emit(f"\tCopied <b>{n_copied_files}</b> file(s)")
+            self._logger.msg.emit(f"\tCopied <b>{len(copy_paths)}</b> file(s)")
         return True
 
     def _create_input_dirs(self, execution_dir):
@@ -418,9 +490,10 @@ class ExecutableItem(ExecutableItemBase):
         # Wait for finished right here
         loop = QEventLoop()
         self._tool_instance.instance_finished.connect(loop.quit)
-        self._tool_instance.execute()
+        self._tool_instance.execute(log_file=self._process_log_path())
         if self._tool_instance.is_running():
             loop.exec_()
+        self._remove_unused_staged_files()
         return self._last_return_code == 0
 
     def _find_input_files(self, resources):
@@ -434,12 +507,13 @@ class ExecutableItem(ExecutableItemBase):
             Dictionary mapping required files to path where they are found, or to None if not found
         """
         file_paths = dict()
+        index = file_path_index(resources)
         for required_path in self._tool_specification.inputfiles:
             _, filename = os.path.split(required_path)
             if not filename:
                 # It's a directory
                 continue
-            file_paths[required_path] = find_file(filename, resources)
+            file_paths[required_path] = index.find_file(filename)
         return file_paths
 
     def _find_optional_input_files(self, resources):
@@ -454,13 +528,13 @@ class ExecutableItem(ExecutableItemBase):
                 optional input item and value is a list of paths that matches the item.
         """
         file_paths = dict()
-        paths_in_resources = file_paths_from_resources(resources)
+        index = file_path_index(resources)
         for file_path in self._tool_specification.inputfiles_opt:
             _, pattern = os.path.split(file_path)
             if not pattern:
                 # It's a directory -> skip
                 continue
-            found_files = _find_files_in_pattern(pattern, paths_in_resources)
+            found_files = index.match(pattern)
             if not found_files:
                 self._logger.msg_warning.emit(f"\tNo files matching pattern <b>{pattern}</b> found")
             else:
@@ -488,6 +562,7 @@ class ExecutableItem(ExecutableItemBase):
                 "Tool specification output files not copied. Please check directory permissions."
             )
             return
+        self._archive_process_log(result_path)
         # Make link to output folder
         result_anchor = (
             f"<a style='color:#BB99FF;' title='{result_path}'" f"href='file:///{result_path}'>results directory</a>"
@@ -518,6 +593,7 @@ class ExecutableItem(ExecutableItemBase):
                 "subsequent project items.' href='#'>Tip</a>"
             )
             self._logger.msg_warning.emit(f"\tNo output files defined for this Tool specification. {tip_anchor}")
+        self._prune_result_archives()
 
     def _optional_output_destination_paths(self, paths, execution_dir):
         """
@@ -606,7 +682,9 @@ class ExecutableItem(ExecutableItemBase):
             logger.msg_error.emit(f"Cannot find tool specification '{missing_specification}'.")
             return None
         cmd_line_args = item_dict["cmd_line_args"]
-        return cls(name, work_dir, output_dir, specification, cmd_line_args, logger)
+        archive_limit = result_archive_limit(app_settings)
+        copy_inputs = copy_input_files(app_settings)
+        return cls(name, work_dir, output_dir, specification, cmd_line_args, logger, archive_limit, copy_inputs)
 
 
 def _count_files_and_dirs(paths):
@@ -678,20 +756,6 @@ def _execution_directory(work_dir, tool_specification):
     return tool_specification.path
 
 
-def _find_files_in_pattern(pattern, available_file_paths):
-    """
-    Returns a list of files that match the given pattern.
-
-    Args:
-        pattern (str): file pattern
-        available_file_paths (list): list of available file paths from upstream items
-    Returns:
-        list: List of (full) paths
-    """
-    extended_pattern = os.path.join("*", pattern)  # Match all absolute paths.
-    return fnmatch.filter(available_file_paths, extended_pattern)
-
-
 def _unique_dir_name(tool_specification):
     """Builds a unique name for Tool's work directory."""
     return tool_specification.short_name + "__" + uuid.uuid4().hex + "__toolbox"
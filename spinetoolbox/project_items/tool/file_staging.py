@@ -0,0 +1,352 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Contains utilities to stage Tool's input and program files into execution directories
+and to archive output files into result directories.
+
+Files can be staged through a content addressed store:
+the first time a file is staged, it is copied to its destination and hashed in the same pass.
+The copy is then made read-only and hard linked into the cache
+so the links cannot be used to modify the cached content in place.
+Unchanged source files are recognized by their path, size and modification time,
+so they are linked again without reading their content.
+Identical files staged from different sources share the same copy in the store which deduplicates result archives.
+If linking is not possible, e.g. because the execution directory is on another file system,
+the destination is left as an independent copy.
+Files that are staged without a cache are copied, as copy-on-write clones if the file system supports it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import os.path
+import shutil
+import stat
+import threading
+import uuid
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+STAGING_CACHE_DIR_NAME = ".input_cache"
+"""Name of the staging cache directory inside Toolbox work directory."""
+
+_INDEX_FILE_NAME = "index.json"
+_MAX_WORKERS = 4
+_CHUNK_SIZE = 1024 * 1024
+_FICLONE = 0x40049409
+"""Linux ioctl request that clones a file's content copy-on-write."""
+_NOT_WRITABLE = ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+_caches = dict()
+_caches_lock = threading.Lock()
+
+
+def stage_files(paths, cache_dir=None, remember_sources=True):
+    """
+    Stages files into their destinations in parallel.
+
+    Args:
+        paths (list of tuple): pairs of source and destination paths
+        cache_dir (str, optional): path to the staging cache directory;
+            if None, the files are copied directly; the staged files are read-only if a cache is used
+        remember_sources (bool): if True, the cache remembers the source files so unchanged sources
+            need not be read again; should be False if the sources are not going to be staged again
+
+    Returns:
+        list of tuple: source path, destination path and the OSError for each file that could not be staged
+    """
+    if not paths:
+        return []
+    if cache_dir is None:
+        stage = _copy_file
+    else:
+        cache = _cache(cache_dir)
+
+        def stage(src_path, dst_path):
+            cache.stage(src_path, dst_path, remember_sources)
+
+    with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(paths))) as executor:
+        errors = list(executor.map(lambda path_pair: _try_to_stage(stage, *path_pair), paths))
+    if cache_dir is not None:
+        cache.save_index()
+    return [(src, dst, error) for (src, dst), error in zip(paths, errors) if error is not None]
+
+
+def remove_unused_files(cache_dir):
+    """
+    Removes files from a staging cache that are not linked anywhere else anymore.
+
+    Args:
+        cache_dir (str): path to the staging cache directory
+    """
+    if not os.path.isdir(cache_dir):
+        return
+    cache = _cache(cache_dir)
+    cache.remove_unused_files()
+    cache.save_index()
+
+
+def _try_to_stage(stage, src_path, dst_path):
+    """Calls ``stage`` and returns the OSError it raised or None."""
+    try:
+        stage(src_path, dst_path)
+    except OSError as error:
+        return error
+    return None
+
+
+def _copy_file(src_path, dst_path):
+    """Copies a file without going through a staging cache making a copy-on-write clone if possible."""
+    if fcntl is not None:
+        try:
+            with open(src_path, "rb") as source, open(dst_path, "wb") as target:
+                fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfile(src_path, dst_path)
+
+
+def _link(target_path, link_path):
+    """
+    Replaces a file by a hard link to another file.
+
+    Args:
+        target_path (str): path to the file to link to
+        link_path (str): path to the link
+
+    Returns:
+        bool: True if the link was created, False if linking is not possible
+    """
+    temporary_path = link_path + "." + uuid.uuid4().hex + ".tmp"
+    try:
+        os.link(target_path, temporary_path)
+    except OSError:
+        return False
+    os.replace(temporary_path, link_path)
+    return True
+
+
+def _remove_file(path):
+    """Removes a file even if it is read-only."""
+    os.chmod(path, stat.S_IREAD | stat.S_IWRITE)
+    os.remove(path)
+
+
+def _cache(cache_dir):
+    """Returns a shared staging cache for given directory."""
+    cache_dir = os.path.abspath(cache_dir)
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = _caches[cache_dir] = StagingCache(cache_dir)
+        return cache
+
+
+class StagingCache:
+    """A content addressed file cache that hard links its read-only files into execution directories."""
+
+    def __init__(self, cache_dir):
+        """
+        Args:
+            cache_dir (str): path to the cache directory
+        """
+        self._cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._sources = None
+        self._blobs = None
+        self._index_dirty = False
+
+    def stage(self, src_path, dst_path, remember_source=True):
+        """
+        Places the content of a source file at given destination.
+
+        Args:
+            src_path (str): path to the source file
+            dst_path (str): path to the destination file
+            remember_source (bool): if True, remember the source so it need not be read again if it is unchanged
+
+        Returns:
+            bool: True if the destination was linked to the cache, False if it was copied
+
+        Raises:
+            OSError: if staging fails
+        """
+        if remember_source:
+            source_stat = os.stat(src_path)
+            source_key = "\n".join((os.path.abspath(src_path), str(source_stat.st_size), str(source_stat.st_mtime_ns)))
+            digest = self._cached_digest(source_key)
+        else:
+            source_key = None
+            digest = None
+        if digest is None:
+            return self._add(src_path, dst_path, source_key)
+        if _link(self._blob_path(digest), dst_path):
+            return True
+        shutil.copyfile(src_path, dst_path)
+        return False
+
+    def remove_unused_files(self):
+        """Removes cached files that have no links outside the cache."""
+        with self._lock:
+            self._load_index()
+            for digest in list(self._blobs):
+                blob_path = self._blob_path(digest)
+                try:
+                    if os.stat(blob_path).st_nlink > 1:
+                        continue
+                    _remove_file(blob_path)
+                except OSError:
+                    pass
+                del self._blobs[digest]
+                self._index_dirty = True
+            self._sources = {key: digest for key, digest in self._sources.items() if digest in self._blobs}
+
+    def save_index(self):
+        """Writes the cache index to disk if it has changed."""
+        with self._lock:
+            if not self._index_dirty:
+                return
+            index_path = os.path.join(self._cache_dir, _INDEX_FILE_NAME)
+            temporary_path = index_path + "." + uuid.uuid4().hex + ".tmp"
+            try:
+                with open(temporary_path, "w") as index_file:
+                    json.dump({"sources": self._sources, "blobs": self._blobs}, index_file)
+                os.replace(temporary_path, index_path)
+            except OSError:
+                return
+            self._index_dirty = False
+
+    def _load_index(self):
+        """Reads the cache index from disk unless it has been read already. Must be called with lock held."""
+        if self._sources is not None:
+            return
+        try:
+            with open(os.path.join(self._cache_dir, _INDEX_FILE_NAME)) as index_file:
+                index = json.load(index_file)
+            self._sources = index["sources"]
+            self._blobs = index["blobs"]
+        except (OSError, ValueError, KeyError):
+            self._sources = dict()
+            self._blobs = dict()
+
+    def _blob_path(self, digest):
+        """Returns the path to a cached file."""
+        return os.path.join(self._cache_dir, digest[:2], digest)
+
+    def _cached_digest(self, source_key):
+        """
+        Returns the digest of a source file's cached copy.
+
+        Args:
+            source_key (str): source file's path, size and modification time
+
+        Returns:
+            str: content digest or None if the file is not in the cache or the cached copy has been modified
+        """
+        with self._lock:
+            self._load_index()
+            digest = self._sources.get(source_key)
+            if digest is None:
+                return None
+            if self._blob_is_intact(digest):
+                return digest
+            del self._sources[source_key]
+            self._blobs.pop(digest, None)
+            self._index_dirty = True
+            return None
+
+    def _blob_is_intact(self, digest):
+        """Returns True if a cached file exists and has not been modified through a link.
+
+        Must be called with lock held.
+        """
+        signature = self._blobs.get(digest)
+        if signature is None:
+            return False
+        try:
+            blob_stat = os.stat(self._blob_path(digest))
+        except OSError:
+            return False
+        return [blob_stat.st_size, blob_stat.st_mtime_ns] == signature
+
+    def _add(self, src_path, dst_path, source_key):
+        """
+        Copies a source file to given destination and adds the copy to the cache by hard linking it.
+
+        If the cache contains the content already, the copy is replaced by a link to the cached file.
+        The source file is read and the destination written only once.
+
+        Args:
+            src_path (str): path to the source file
+            dst_path (str): path to the destination file
+            source_key (str, optional): source file's path, size and modification time;
+                if None, the source is not remembered
+
+        Returns:
+            bool: True if the destination was linked to the cache, False if it is an independent copy
+        """
+        temporary_path = dst_path + "." + uuid.uuid4().hex + ".tmp"
+        content_hash = hashlib.sha1()
+        try:
+            with open(src_path, "rb") as source, open(temporary_path, "wb") as target:
+                for chunk in iter(lambda: source.read(_CHUNK_SIZE), b""):
+                    content_hash.update(chunk)
+                    target.write(chunk)
+            digest = content_hash.hexdigest()
+            with self._lock:
+                self._load_index()
+                blob_path = self._blob_path(digest)
+                if self._blob_is_intact(digest):
+                    linked = _link(blob_path, temporary_path)
+                else:
+                    linked = self._add_blob(temporary_path, digest)
+                if linked and source_key is not None:
+                    self._sources[source_key] = digest
+                    self._index_dirty = True
+            os.replace(temporary_path, dst_path)
+        except OSError:
+            if os.path.exists(temporary_path):
+                _remove_file(temporary_path)
+            raise
+        return linked
+
+    def _add_blob(self, path, digest):
+        """
+        Makes a file read-only and hard links it into the cache.
+
+        Must be called with lock held.
+
+        Args:
+            path (str): path to the file
+            digest (str): file's content digest
+
+        Returns:
+            bool: True if the file was linked, False if linking is not possible
+        """
+        blob_path = self._blob_path(digest)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        if os.path.exists(blob_path):
+            _remove_file(blob_path)
+        try:
+            os.link(path, blob_path)
+        except OSError:
+            return False
+        os.chmod(blob_path, stat.S_IMODE(os.stat(blob_path).st_mode) & _NOT_WRITABLE)
+        blob_stat = os.stat(blob_path)
+        self._blobs[digest] = [blob_stat.st_size, blob_stat.st_mtime_ns]
+        self._index_dirty = True
+        return True
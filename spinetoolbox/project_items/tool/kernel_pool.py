@@ -0,0 +1,418 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Contains a pool of warm Python and Julia worker kernels for Tool execution.
+
+A kernel is a long running interpreter process that executes Tool scripts one after another.
+Packages a script loads stay loaded in the kernel, so subsequent executions skip the warmup,
+e.g. Julia's package loading and JIT compilation.
+Before each run the kernel changes to the run's working directory and resets the command line arguments.
+Each script runs in a fresh namespace and a kernel runs a single script at a time;
+if all kernels are busy, a new one is started.
+"""
+
+import atexit
+import codecs
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from PySide2.QtCore import QTimer, Slot
+from spinetoolbox.execution_managers import ExecutionManager, ProcessOutput
+
+KERNEL_POOL_SIZE_SETTING = "appSettings/toolKernelPoolSize"
+"""Settings key for the number of idle kernels to keep per interpreter and environment; 0 disables kernels."""
+
+_POLL_INTERVAL = 50
+_EXIT_TIMEOUT = 5.0
+"""Seconds to wait for a kernel process to exit after it has closed its output streams."""
+_READ_SIZE = 64 * 1024
+_END_OF_RUN = "\x1e"
+
+_PYTHON_DRIVER = """
+import os, runpy, sys, traceback
+_initial_path = list(sys.path)
+for _line in sys.stdin:
+    _token, _work_dir, _script, *_args = [bytes.fromhex(field).decode("utf-8") for field in _line.split()]
+    _exit_code = 0
+    _modules = set(sys.modules)
+    try:
+        os.chdir(_work_dir)
+        sys.argv = [_script] + _args
+        sys.path[:] = [_work_dir] + _initial_path
+        runpy.run_path(_script, run_name="__main__")
+    except SystemExit as _exit:
+        if isinstance(_exit.code, int):
+            _exit_code = _exit.code
+        elif _exit.code is not None:
+            print(_exit.code, file=sys.stderr)
+            _exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        _exit_code = 1
+    for _name in set(sys.modules) - _modules:
+        _file = getattr(sys.modules[_name], "__file__", None) or ""
+        if _file and os.path.abspath(_file).startswith(os.path.join(os.path.abspath(_work_dir), "")):
+            del sys.modules[_name]
+    for _stream in (sys.stdout, sys.stderr):
+        print("\\x1e" + _token, _exit_code, file=_stream, flush=True)
+"""
+
+_JULIA_DRIVER = """
+while !eof(stdin)
+    fields = [String(hex2bytes(field)) for field in split(readline(stdin))]
+    token, work_dir, script = fields[1:3]
+    exit_code = 0
+    try
+        cd(work_dir)
+        empty!(ARGS)
+        append!(ARGS, fields[4:end])
+        script_module = Module(:ToolScript)
+        Core.eval(script_module, :(eval(x) = Core.eval($script_module, x)))
+        Core.eval(script_module, :(include(path) = Base.include($script_module, path)))
+        Base.include(script_module, script)
+    catch err
+        showerror(stderr, err, catch_backtrace())
+        println(stderr)
+        exit_code = 1
+    end
+    for stream in (stdout, stderr)
+        println(stream, "\\x1e", token, " ", exit_code)
+        flush(stream)
+    end
+end
+"""
+
+_DRIVERS = {"python": ["-u", "-c", _PYTHON_DRIVER], "julia": ["-e", _JULIA_DRIVER]}
+
+
+def kernel_pool_size(settings):
+    """
+    Reads the kernel pool size from application settings.
+
+    Args:
+        settings (QSettings): application settings
+
+    Returns:
+        int: number of idle kernels to keep per interpreter and environment, 0 if kernels are disabled
+    """
+    try:
+        return max(0, int(settings.value(KERNEL_POOL_SIZE_SETTING, defaultValue="0")))
+    except (TypeError, ValueError):
+        return 0
+
+
+class KernelPool:
+    """Keeps idle kernels per language, interpreter and interpreter arguments."""
+
+    def __init__(self):
+        self._idle_kernels = dict()
+        self._lock = threading.Lock()
+
+    def acquire(self, language, program, interpreter_args):
+        """
+        Returns an idle kernel or starts a new one.
+
+        Args:
+            language (str): "python" or "julia"
+            program (str): path to the interpreter
+            interpreter_args (list of str): interpreter's command line arguments, e.g. Julia's --project
+
+        Returns:
+            Kernel: a kernel ready to run a script
+
+        Raises:
+            OSError: if starting the kernel fails
+        """
+        key = (language, program, tuple(interpreter_args))
+        with self._lock:
+            idle_kernels = self._idle_kernels.get(key, [])
+            while idle_kernels:
+                kernel = idle_kernels.pop()
+                if kernel.is_alive():
+                    return kernel
+        return Kernel(key, [program] + list(interpreter_args) + _DRIVERS[language])
+
+    def release(self, kernel, pool_size):
+        """
+        Returns a kernel into the pool or shuts it down if the pool is full.
+
+        Args:
+            kernel (Kernel): a kernel that has finished its run
+            pool_size (int): maximum number of idle kernels per interpreter and environment
+        """
+        with self._lock:
+            idle_kernels = self._idle_kernels.setdefault(kernel.key, list())
+            if kernel.is_alive() and len(idle_kernels) < pool_size:
+                idle_kernels.append(kernel)
+                return
+        kernel.kill()
+
+    def shut_down(self):
+        """Shuts down all idle kernels."""
+        with self._lock:
+            kernels = [kernel for idle_kernels in self._idle_kernels.values() for kernel in idle_kernels]
+            self._idle_kernels.clear()
+        for kernel in kernels:
+            kernel.kill()
+
+
+class Kernel:
+    """A worker process that runs scripts on request."""
+
+    def __init__(self, key, command):
+        """
+        Args:
+            key (tuple): pool key
+            command (list of str): command that starts the kernel
+
+        Raises:
+            OSError: if starting the process fails
+        """
+        self.key = key
+        env = dict(os.environ, PYTHONIOENCODING="utf-8")
+        creation_flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            creationflags=creation_flags,
+        )
+        self._output = queue.Queue()
+        for stream, is_error in ((self._process.stdout, False), (self._process.stderr, True)):
+            threading.Thread(target=self._read, args=(stream, is_error), daemon=True).start()
+
+    def _read(self, stream, is_error):
+        """Reads a stream into the output queue until the stream closes."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            data = os.read(stream.fileno(), _READ_SIZE)
+            if not data:
+                self._output.put((is_error, decoder.decode(b"", final=True)))
+                self._output.put((is_error, None))
+                return
+            self._output.put((is_error, decoder.decode(data)))
+
+    def is_alive(self):
+        """Returns True if the kernel process is running."""
+        return self._process.poll() is None
+
+    def exit_code(self):
+        """Returns the exit code of a kernel process that has stopped or None if it is still running."""
+        return self._process.poll()
+
+    def run(self, token, work_dir, script, args):
+        """
+        Requests the kernel to run a script.
+
+        Args:
+            token (str): a token that marks the end of the run in kernel's output
+            work_dir (str): working directory for the run
+            script (str): path to the script
+            args (list of str): script's command line arguments
+
+        Raises:
+            OSError: if the request cannot be sent
+        """
+        fields = [token, work_dir, script] + list(args)
+        request = " ".join(field.encode("utf-8").hex() for field in fields) + "\n"
+        self._process.stdin.write(request.encode("ascii"))
+        self._process.stdin.flush()
+
+    def read_output(self):
+        """
+        Returns output that has been read since last call.
+
+        Returns:
+            list of tuple: is_error flag and output text or None if the stream has closed
+        """
+        output = list()
+        while True:
+            try:
+                output.append(self._output.get_nowait())
+            except queue.Empty:
+                return output
+
+    def kill(self):
+        """Stops the kernel process."""
+        if self.is_alive():
+            self._process.kill()
+            self._process.wait()
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+
+
+class KernelExecutionManager(ExecutionManager):
+    """Class to manage tool instance execution in a pooled kernel."""
+
+    def __init__(
+        self, logger, pool, language, program, interpreter_args, script, script_args, pool_size, log_file=None
+    ):
+        """
+        Args:
+            logger (LoggerInterface): a logger instance
+            pool (KernelPool): kernel pool
+            language (str): "python" or "julia"
+            program (str): path to the interpreter
+            interpreter_args (list of str): interpreter's command line arguments
+            script (str): path to the script to run
+            script_args (list of str): script's command line arguments
+            pool_size (int): maximum number of idle kernels per interpreter and environment
+            log_file (str, optional): path to a file where the complete stdout and stderr are written
+        """
+        super().__init__(logger)
+        self._pool = pool
+        self._language = language
+        self._program = program
+        self._interpreter_args = interpreter_args
+        self._script = script
+        self._script_args = script_args
+        self._pool_size = pool_size
+        self._kernel = None
+        self._token = None
+        self._exit_codes = dict()
+        self._tails = {False: "", True: ""}
+        self._closed_streams = set()
+        self._exit_deadline = None
+        self._output = ProcessOutput(logger, log_file, self)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(_POLL_INTERVAL)
+        self._poll_timer.timeout.connect(self._poll)
+        self.process_failed = False
+        self.process_failed_to_start = False
+
+    def program(self):
+        """Program getter method."""
+        return self._program
+
+    def start_execution(self, workdir=None):
+        """See base class."""
+        try:
+            self._kernel = self._pool.acquire(self._language, self._program, self._interpreter_args)
+        except OSError as error:
+            self._logger.msg_error.emit(f"\tStarting kernel <b>{self._program}</b> failed: {error}")
+            self.process_failed = True
+            self.process_failed_to_start = True
+            self.execution_finished.emit(-9998)
+            return
+        self._token = uuid.uuid4().hex
+        try:
+            self._kernel.run(self._token, workdir, self._script, self._script_args)
+        except OSError:
+            self._kernel.kill()
+            self._kernel = None
+            self.process_failed = True
+            self.process_failed_to_start = True
+            self.execution_finished.emit(-9998)
+            return
+        self._logger.msg_warning.emit("\tExecution is in progress. See Process Log for messages (stdout&stderr)")
+        self._poll_timer.start()
+
+    def stop_execution(self):
+        """See base class."""
+        self._logger.msg_error.emit("Terminating kernel")
+        self._poll_timer.stop()
+        self.process_failed = True
+        if self._kernel is not None:
+            self._kernel.kill()
+            self._kernel = None
+        self._output.close()
+
+    @Slot()
+    def _poll(self):
+        """Passes kernel's output on and finishes the execution when the kernel has finished the run."""
+        for is_error, text in self._kernel.read_output():
+            if text is None:
+                self._closed_streams.add(is_error)
+                continue
+            self._handle_output(text, is_error)
+        if len(self._exit_codes) == 2:
+            self._pool.release(self._kernel, self._pool_size)
+            self._finish(self._exit_codes[False])
+        elif len(self._closed_streams) == 2:
+            # Kernel died before finishing the run, e.g. because the script called exit()
+            if self._exit_deadline is None:
+                for is_error, tail in self._tails.items():
+                    self._output.append(tail, is_error)
+                self._exit_deadline = time.monotonic() + _EXIT_TIMEOUT
+            exit_code = self._kernel.exit_code()
+            if exit_code is None:
+                if time.monotonic() < self._exit_deadline:
+                    # Check again on later timer ticks instead of blocking the event loop.
+                    return
+                exit_code = -1
+            self._kernel.kill()
+            self._finish(exit_code)
+        else:
+            return
+        self._kernel = None
+
+    def _handle_output(self, text, is_error):
+        """Passes output on to Process Log while watching for the end of run marker.
+
+        Args:
+            text (str): output text
+            is_error (bool): True if text comes from stderr, False if from stdout
+        """
+        tail = self._tails[is_error] + text
+        while tail:
+            marker_start = tail.find(_END_OF_RUN)
+            if marker_start < 0:
+                self._output.append(tail, is_error)
+                tail = ""
+                break
+            line_end = tail.find("\n", marker_start)
+            if line_end < 0:
+                # Wait for the rest of the possible marker
+                self._output.append(tail[:marker_start], is_error)
+                tail = tail[marker_start:]
+                break
+            token, _, exit_code = tail[marker_start + 1 : line_end].partition(" ")
+            if token == self._token:
+                self._output.append(tail[:marker_start], is_error)
+                try:
+                    self._exit_codes[is_error] = int(exit_code)
+                except ValueError:
+                    self._exit_codes[is_error] = -1
+                tail = ""
+                break
+            self._output.append(tail[: line_end + 1], is_error)
+            tail = tail[line_end + 1 :]
+        self._tails[is_error] = tail
+
+    def _finish(self, exit_code):
+        """Finishes the execution.
+
+        Args:
+            exit_code (int): script's exit code
+        """
+        self._poll_timer.stop()
+        self._output.close()
+        if exit_code != 0:
+            self.process_failed = True
+        self.execution_finished.emit(exit_code)
+
+
+_pool = KernelPool()
+atexit.register(_pool.shut_down)
+
+
+def kernel_pool():
+    """Returns the kernel pool shared by all Tool executions."""
+    return _pool
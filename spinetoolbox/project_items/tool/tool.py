@@ -29,7 +29,14 @@ from .item_info import ItemInfo
 from .tool_specifications import ToolSpecification
 from .widgets.custom_menus import ToolContextMenu, ToolSpecificationMenu
 from .executable_item import ExecutableItem
-from .utils import flatten_file_path_duplicates, find_file, find_last_output_files, is_pattern
+from .utils import (
+    copy_input_files,
+    file_path_index,
+    flatten_file_path_duplicates,
+    find_last_output_files,
+    is_pattern,
+    result_archive_limit,
+)
 
 
 class Tool(ProjectItem):
@@ -408,8 +415,17 @@ class Tool(ProjectItem):
     def execution_item(self):
         """Creates project item's execution counterpart."""
         work_dir = self._toolbox.work_dir if self.execute_in_work else None
+        archive_limit = result_archive_limit(self._toolbox.qsettings())
+        copy_inputs = copy_input_files(self._toolbox.qsettings())
         return ExecutableItem(
-            self.name, work_dir, self.output_dir, self._specification, self.cmd_line_args, self._logger
+            self.name,
+            work_dir,
+            self.output_dir,
+            self._specification,
+            self.cmd_line_args,
+            self._logger,
+            archive_limit,
+            copy_inputs,
         )
 
     def _find_input_files(self, resources):
@@ -422,6 +438,7 @@ class Tool(ProjectItem):
             Dictionary mapping required files to path where they are found, or to None if not found
         """
         file_paths = dict()
+        index = file_path_index(resources)
         for i in range(self.input_file_model.rowCount()):
             req_file_path = self.input_file_model.item(i, 0).data(Qt.DisplayRole)
             # Just get the filename if there is a path attached to the file
@@ -429,7 +446,7 @@ class Tool(ProjectItem):
             if not filename:
                 # It's a directory
                 continue
-            file_paths[req_file_path] = find_file(filename, resources)
+            file_paths[req_file_path] = index.find_file(filename)
         return file_paths
 
     def _do_handle_dag_changed(self, resources):
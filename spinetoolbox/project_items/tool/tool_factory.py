@@ -17,12 +17,6 @@ The ToolFactory class.
 """
 
 from spinetoolbox.project_item import ProjectItemFactory
-from .tool import Tool
-from .tool_icon import ToolIcon
-from .widgets.tool_properties_widget import ToolPropertiesWidget
-from .widgets.tool_specification_widget import ToolSpecificationWidget
-from .widgets.add_tool_widget import AddToolWidget
-from .widgets.custom_menus import ToolSpecificationMenu
 
 
 class ToolFactory(ProjectItemFactory):
@@ -32,14 +26,20 @@ class ToolFactory(ProjectItemFactory):
 
     @property
     def item_maker(self):
+        from .tool import Tool  # pylint: disable=import-outside-toplevel
+
         return Tool
 
     @property
     def icon_maker(self):
+        from .tool_icon import ToolIcon  # pylint: disable=import-outside-toplevel
+
         return ToolIcon
 
     @property
     def add_form_maker(self):
+        from .widgets.add_tool_widget import AddToolWidget  # pylint: disable=import-outside-toplevel
+
         return AddToolWidget
 
     @staticmethod
@@ -48,12 +48,20 @@ class ToolFactory(ProjectItemFactory):
 
     @property
     def specification_form_maker(self):
+        from .widgets.tool_specification_widget import (  # pylint: disable=import-outside-toplevel
+            ToolSpecificationWidget,
+        )
+
         return ToolSpecificationWidget
 
     @property
     def specification_menu_maker(self):
+        from .widgets.custom_menus import ToolSpecificationMenu  # pylint: disable=import-outside-toplevel
+
         return ToolSpecificationMenu
 
     @staticmethod
     def _make_properties_widget(toolbox):
+        from .widgets.tool_properties_widget import ToolPropertiesWidget  # pylint: disable=import-outside-toplevel
+
         return ToolPropertiesWidget(toolbox)
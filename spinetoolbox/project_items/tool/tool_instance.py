@@ -22,6 +22,7 @@ import shutil
 from PySide2.QtCore import QObject, Signal, Slot
 from spinetoolbox.config import GAMS_EXECUTABLE, JULIA_EXECUTABLE, PYTHON_EXECUTABLE
 from spinetoolbox.execution_managers import ConsoleExecutionManager, QProcessExecutionManager
+from .kernel_pool import KernelExecutionManager, kernel_pool, kernel_pool_size
 
 
 class ToolInstance(QObject):
@@ -216,7 +217,22 @@ class JuliaToolInstance(ToolInstance):
             self.exec_mngr.execution_finished.connect(self.handle_repl_execution_finished)
             self.exec_mngr.start_execution()
         else:
-            self.exec_mngr = QProcessExecutionManager(self._logger, self.program, self.args, **kwargs)
+            pool_size = kernel_pool_size(self._settings)
+            if pool_size > 0:
+                # args: --project, script path and script's arguments
+                self.exec_mngr = KernelExecutionManager(
+                    self._logger,
+                    kernel_pool(),
+                    "julia",
+                    self.program,
+                    self.args[:1],
+                    self.args[1],
+                    self.args[2:],
+                    pool_size,
+                    **kwargs,
+                )
+            else:
+                self.exec_mngr = QProcessExecutionManager(self._logger, self.program, self.args, **kwargs)
             self.exec_mngr.execution_finished.connect(self.handle_execution_finished)
             # On Julia the Qprocess workdir must be set to the path where the main script is
             # Otherwise it doesn't find input files in subdirectories
@@ -328,7 +344,22 @@ class PythonToolInstance(ToolInstance):
             self.exec_mngr.execution_finished.connect(self.handle_console_execution_finished)
             self.exec_mngr.start_execution()
         else:
-            self.exec_mngr = QProcessExecutionManager(self._logger, self.program, self.args, **kwargs)
+            pool_size = kernel_pool_size(self._settings)
+            if pool_size > 0:
+                # args: script path and script's arguments
+                self.exec_mngr = KernelExecutionManager(
+                    self._logger,
+                    kernel_pool(),
+                    "python",
+                    self.program,
+                    [],
+                    self.args[0],
+                    self.args[1:],
+                    pool_size,
+                    **kwargs,
+                )
+            else:
+                self.exec_mngr = QProcessExecutionManager(self._logger, self.program, self.args, **kwargs)
             self.exec_mngr.execution_finished.connect(self.handle_execution_finished)
             self.exec_mngr.start_execution(workdir=self.basedir)
 
@@ -15,8 +15,28 @@ Utility functions for the Tool project item.
 :author: A. Soininen (VTT)
 :date:   1.4.2020
 """
+from collections import OrderedDict
+import datetime
+import fnmatch
+import functools
 import glob
 import os.path
+import re
+import shutil
+import stat
+import threading
+
+RESULT_ARCHIVE_LIMIT_SETTING = "appSettings/toolResultArchiveLimit"
+"""Settings key for the number of result directories to keep per Tool; 0 keeps all."""
+
+COPY_INPUT_FILES_SETTING = "appSettings/toolCopyInputFiles"
+"""Settings key that makes Tools get writable copies of their input files instead of read-only links."""
+
+_INDEX_CACHE_SIZE = 8
+_WILDCARD_CHARACTERS = "*?[]"
+
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
 
 
 def flatten_file_path_duplicates(file_paths, logger, log_duplicates=False):
@@ -65,12 +85,35 @@ def find_file(filename, resources):
     Returns:
         list: Full paths to file if found, None if not found
     """
-    found_file_paths = list()
-    for file_path in file_paths_from_resources(resources):
-        _, file_candidate = os.path.split(file_path)
-        if file_candidate == filename:
-            found_file_paths.append(file_path)
-    return found_file_paths if found_file_paths else None
+    return file_path_index(resources).find_file(filename)
+
+
+def file_path_index(resources):
+    """
+    Returns an index of the file paths in given resources.
+
+    Indexes are cached and shared as long as the resources resolve to the same files.
+    The resources are resolved on every call so files that have been created or deleted since are noticed.
+
+    Args:
+        resources (list): resources available
+
+    Returns:
+        FilePathIndex: file path index
+    """
+    file_paths = file_paths_from_resources(resources)
+    key = tuple(file_paths)
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+    index = FilePathIndex(file_paths)
+    with _index_cache_lock:
+        _index_cache[key] = index
+        if len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
 
 
 def find_last_output_files(output_files, output_dir):
@@ -88,9 +131,7 @@ def find_last_output_files(output_files, output_dir):
         return dict()
     recent_output_files = dict()
     file_patterns = list(output_files)
-    archive_dirs = os.listdir(output_dir)
-    if "failed" in archive_dirs:
-        archive_dirs.remove("failed")
+    archive_dirs = [name for name in os.listdir(output_dir) if name != "failed" and not name.startswith(".")]
     archive_dirs.sort(reverse=True)
     for archive in archive_dirs:
         for pattern in list(file_patterns):
@@ -114,6 +155,82 @@ def is_pattern(file_name):
     return "*" in file_name or "?" in file_name
 
 
+class FilePathIndex:
+    """
+    An index of file paths for fast file name and file pattern lookups.
+
+    Paths are bucketed by file name and by file extension so most lookups need to look only at a few paths.
+    """
+
+    def __init__(self, file_paths):
+        """
+        Args:
+            file_paths (list of str): paths to index
+        """
+        self._file_paths = list()
+        self._by_name = dict()
+        self._by_normalized_name = dict()
+        self._by_extension = dict()
+        for path in file_paths:
+            normalized_path = os.path.normcase(path)
+            entry = (normalized_path, path)
+            self._file_paths.append(entry)
+            self._by_name.setdefault(os.path.split(path)[1], list()).append(path)
+            normalized_name = os.path.split(normalized_path)[1]
+            self._by_normalized_name.setdefault(normalized_name, list()).append(entry)
+            _, dot, extension = normalized_name.rpartition(".")
+            if dot:
+                self._by_extension.setdefault(extension, list()).append(entry)
+
+    def find_file(self, filename):
+        """
+        Returns all paths that have given file name.
+
+        Args:
+            filename (str): file name (no path)
+
+        Returns:
+            list: full paths to file if found, None if not found
+        """
+        found_file_paths = self._by_name.get(filename)
+        return list(found_file_paths) if found_file_paths else None
+
+    def match(self, pattern):
+        """
+        Returns paths that match given file name pattern in the same order as they were indexed.
+
+        Args:
+            pattern (str): file name pattern
+
+        Returns:
+            list: full paths to matching files
+        """
+        extended_pattern = os.path.normcase(os.path.join("*", pattern))  # Match all absolute paths.
+        regex = _compile_pattern(extended_pattern)
+        return [path for normalized_path, path in self._candidates(extended_pattern) if regex(normalized_path)]
+
+    def _candidates(self, extended_pattern):
+        """Returns a list of (normalized path, path) pairs that may match given pattern."""
+        tail_start = max(extended_pattern.rfind(character) for character in _WILDCARD_CHARACTERS) + 1
+        literal_tail = extended_pattern[tail_start:]
+        separators = (os.sep, os.altsep) if os.altsep else (os.sep,)
+        if literal_tail[:1] in separators:
+            name = literal_tail[1:]
+            if not any(separator in name for separator in separators):
+                return self._by_normalized_name.get(name, [])
+        elif not any(separator in literal_tail for separator in separators):
+            _, dot, extension = literal_tail.rpartition(".")
+            if dot:
+                return self._by_extension.get(extension, [])
+        return self._file_paths
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_pattern(pattern):
+    """Compiles a normalized fnmatch pattern into a match function."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
 class _LatestOutputFile:
     """
     A class to hold information on a latest output file.
@@ -132,3 +249,73 @@ class _LatestOutputFile:
         """Constructs a _LatestOutputFile object from an absolute path and archive directory."""
         label = os.path.relpath(path, archive_dir)
         return _LatestOutputFile(label, path)
+
+
+def copy_input_files(settings):
+    """
+    Reads from application settings whether Tools should get writable copies of their input files.
+
+    Args:
+        settings (QSettings): application settings
+
+    Returns:
+        bool: True if input files should be copied, False if they can be linked from the staging cache
+    """
+    return settings.value(COPY_INPUT_FILES_SETTING, defaultValue="false") == "true"
+
+
+def result_archive_limit(settings):
+    """
+    Reads the maximum number of result directories to keep from application settings.
+
+    Args:
+        settings (QSettings): application settings
+
+    Returns:
+        int: maximum number of result directories, 0 if there is no limit
+    """
+    try:
+        return max(0, int(settings.value(RESULT_ARCHIVE_LIMIT_SETTING, defaultValue="0")))
+    except (TypeError, ValueError):
+        return 0
+
+
+def prune_result_archives(archive_dir, keep):
+    """
+    Removes all but the most recent timestamped result directories.
+
+    Directories whose names are not result directory timestamps are left untouched.
+
+    Args:
+        archive_dir (str): path to a directory containing result directories
+        keep (int): number of result directories to keep
+
+    Returns:
+        list of str: paths to directories that could not be removed
+    """
+    if keep <= 0 or not os.path.isdir(archive_dir):
+        return []
+    archives = sorted(name for name in os.listdir(archive_dir) if _is_result_archive(archive_dir, name))
+    failed = list()
+    for name in archives[:-keep]:
+        path = os.path.join(archive_dir, name)
+        try:
+            shutil.rmtree(path, onerror=_remove_read_only)
+        except OSError:
+            failed.append(path)
+    return failed
+
+
+def _remove_read_only(function, path, _):
+    """Makes a read-only archived file writable and retries removing it; used as ``shutil.rmtree`` error handler."""
+    os.chmod(path, stat.S_IREAD | stat.S_IWRITE)
+    function(path)
+
+
+def _is_result_archive(archive_dir, name):
+    """Returns True if name is a timestamped result directory in archive_dir."""
+    try:
+        datetime.datetime.strptime(name, "%Y-%m-%dT%H.%M.%S")
+    except ValueError:
+        return False
+    return os.path.isdir(os.path.join(archive_dir, name))
@@ -17,10 +17,6 @@ The ViewFactory class.
 """
 
 from spinetoolbox.project_item import ProjectItemFactory
-from .view import View
-from .view_icon import ViewIcon
-from .widgets.view_properties_widget import ViewPropertiesWidget
-from .widgets.add_view_widget import AddViewWidget
 
 
 class ViewFactory(ProjectItemFactory):
@@ -30,14 +26,20 @@ class ViewFactory(ProjectItemFactory):
 
     @property
     def item_maker(self):
+        from .view import View  # pylint: disable=import-outside-toplevel
+
         return View
 
     @property
     def icon_maker(self):
+        from .view_icon import ViewIcon  # pylint: disable=import-outside-toplevel
+
         return ViewIcon
 
     @property
     def add_form_maker(self):
+        from .widgets.add_view_widget import AddViewWidget  # pylint: disable=import-outside-toplevel
+
         return AddViewWidget
 
     @property
@@ -50,4 +52,6 @@ class ViewFactory(ProjectItemFactory):
 
     @staticmethod
     def _make_properties_widget(toolbox):
+        from .widgets.view_properties_widget import ViewPropertiesWidget  # pylint: disable=import-outside-toplevel
+
         return ViewPropertiesWidget(toolbox)
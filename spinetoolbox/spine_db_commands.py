@@ -16,11 +16,23 @@ QUndoCommand subclasses for modifying the db.
 :date:   31.1.2020
 """
 
+import io
+import os
+import pickle
+import sqlite3
+import tempfile
 import time
+import weakref
+import zlib
 from copy import deepcopy
 from PySide2.QtCore import Slot
 from PySide2.QtWidgets import QUndoCommand, QUndoStack
 
+UNDO_MEMORY_BUDGET = 256 * 1024 * 1024
+"""Default number of bytes the item data of undo commands may occupy in memory."""
+_COMPRESSION_THRESHOLD = 64 * 1024
+"""Payloads larger than this many bytes are kept compressed."""
+
 
 def _cache_to_db_relationship_class(item):
     item = deepcopy(item)
@@ -80,7 +92,189 @@ def _format_item(item_type, item):
     }.get(item_type, lambda x: x["name"])(item)
 
 
+class _PayloadPickler(pickle.Pickler):
+    """Pickles payloads replacing database mappings by references so they don't get serialized."""
+
+    def __init__(self, file, db_maps):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._db_map_ids = {id(db_map): k for k, db_map in enumerate(db_maps)}
+
+    def persistent_id(self, obj):
+        return self._db_map_ids.get(id(obj))
+
+
+class _PayloadUnpickler(pickle.Unpickler):
+    """Unpickles payloads restoring the database mapping references."""
+
+    def __init__(self, file, db_maps):
+        super().__init__(file)
+        self._db_maps = db_maps
+
+    def persistent_load(self, pid):
+        return self._db_maps[pid]
+
+
+class _SpillFile:
+    """A temporary SQLite database for storing payloads that don't fit into the memory budget."""
+
+    def __init__(self):
+        handle, self._path = tempfile.mkstemp(prefix="spinetoolbox_undo_", suffix=".sqlite")
+        os.close(handle)
+        self._connection = sqlite3.connect(self._path)
+        self._connection.execute("CREATE TABLE payload (id INTEGER PRIMARY KEY, blob BLOB NOT NULL)")
+
+    def write(self, blob):
+        """Stores a blob and returns its key."""
+        cursor = self._connection.execute("INSERT INTO payload (blob) VALUES (?)", (blob,))
+        return cursor.lastrowid
+
+    def read(self, key):
+        """Returns the blob stored under given key."""
+        return self._connection.execute("SELECT blob FROM payload WHERE id = ?", (key,)).fetchone()[0]
+
+    def delete(self, key):
+        """Deletes the blob stored under given key."""
+        self._connection.execute("DELETE FROM payload WHERE id = ?", (key,))
+
+    def close(self):
+        """Closes the database and removes the file."""
+        self._connection.close()
+        try:
+            os.remove(self._path)
+        except OSError:
+            pass
+
+
+class _PackedPayload:
+    """Item data of an undo command that has been measured and possibly compressed or spilled to disk.
+
+    Small payloads are kept as is; large ones are pickled and compressed.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data (dict): item data, possibly keyed by database mappings
+        """
+        self._db_maps = _db_maps_in(data)
+        self._data = data
+        self._blob = None
+        self._spill_file = None
+        self._spill_key = None
+        try:
+            blob = self._pickle(data)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            self.size = 0
+            return
+        if len(blob) > _COMPRESSION_THRESHOLD:
+            self._blob = zlib.compress(blob, 1)
+            self._data = None
+            self.size = len(self._blob)
+        else:
+            self.size = len(blob)
+
+    @property
+    def resident_size(self):
+        """Number of bytes the payload occupies in memory."""
+        return 0 if self._spill_file is not None else self.size
+
+    def get(self):
+        """Returns the item data."""
+        if self._data is not None:
+            return self._data
+        blob = self._blob if self._spill_file is None else self._spill_file.read(self._spill_key)
+        return _PayloadUnpickler(io.BytesIO(zlib.decompress(blob)), self._db_maps).load()
+
+    def spill(self, spill_file):
+        """Moves the payload out of memory.
+
+        Args:
+            spill_file (_SpillFile): where to store the payload
+
+        Returns:
+            bool: True if the payload was spilled
+        """
+        if self._spill_file is not None or self.size == 0:
+            return False
+        blob = self._blob if self._blob is not None else zlib.compress(self._pickle(self._data), 1)
+        self._spill_key = spill_file.write(blob)
+        self._spill_file = spill_file
+        self._data = None
+        self._blob = None
+        return True
+
+    def _pickle(self, data):
+        with io.BytesIO() as stream:
+            _PayloadPickler(stream, self._db_maps).dump(data)
+            return stream.getvalue()
+
+
+def _db_maps_in(data):
+    """Returns the non-string keys from the first two levels of given dict which are the database mappings."""
+    db_maps = list()
+    for key, value in data.items():
+        if not isinstance(key, str):
+            db_maps.append(key)
+        if isinstance(value, dict):
+            db_maps += [k for k in value if not isinstance(k, str)]
+    return list({id(db_map): db_map for db_map in db_maps}.values())
+
+
+class PayloadAttribute:
+    """A descriptor for command attributes holding item data that the undo stack can pack to save memory.
+
+    Reading a packed attribute unpacks the whole payload, so commands should read it once per undo or redo.
+    """
+
+    def __init__(self):
+        self._name = None
+
+    def __set_name__(self, owner, name):
+        self._name = "_payload_" + name
+
+    def __get__(self, command, owner=None):
+        if command is None:
+            return self
+        payload = command.__dict__.get(self._name)
+        if isinstance(payload, _PackedPayload):
+            return payload.get()
+        return payload
+
+    def __set__(self, command, value):
+        command.__dict__[self._name] = value
+
+    def pack(self, command):
+        """Packs the attribute's value in given command.
+
+        Returns:
+            _PackedPayload: packed payload or None if there is nothing to pack
+        """
+        payload = command.__dict__.get(self._name)
+        if not payload or isinstance(payload, _PackedPayload):
+            return None
+        payload = command.__dict__[self._name] = _PackedPayload(payload)
+        return payload
+
+
 class AgedUndoStack(QUndoStack):
+    """An undo stack that keeps the item data of its commands within a memory budget.
+
+    Once a command has been pushed and executed, its item data gets measured and large payloads compressed.
+    When the payloads no longer fit into the budget, the oldest ones are moved into a temporary SQLite file.
+    """
+
+    def __init__(self, parent=None, memory_budget=UNDO_MEMORY_BUDGET):
+        """
+        Args:
+            parent (QObject, optional): parent object
+            memory_budget (int): number of bytes the item data may occupy in memory
+        """
+        super().__init__(parent)
+        self._memory_budget = memory_budget
+        self._unpacked_commands = list()
+        self._payloads = list()
+        self._spill_file = None
+
     @property
     def redo_age(self):
         if self.canRedo():
@@ -96,6 +290,89 @@ class AgedUndoStack(QUndoStack):
     def commands(self):
         return [self.command(idx) for idx in range(self.index())]
 
+    def push(self, cmd):
+        """Pushes a command and packs the payloads of the previously pushed ones.
+
+        If the command gets merged into the one on top of the stack, the top command is packed again later.
+        """
+        self.pack_payloads()
+        super().push(cmd)
+        if self.index() > 0:
+            self.repack(self.command(self.index() - 1))
+
+    def repack(self, cmd):
+        """Schedules packing the payloads of a pushed command again after they have been replaced, e.g. by a merge.
+
+        Args:
+            cmd (QUndoCommand): a command on the stack or a child of one
+        """
+        if cmd not in self._unpacked_commands:
+            self._unpacked_commands.append(cmd)
+
+    def clear(self):
+        """Clears the stack and removes the spill file."""
+        super().clear()
+        self._unpacked_commands.clear()
+        self._payloads.clear()
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def memory_usage(self):
+        """Returns the number of bytes the packed payloads occupy in memory."""
+        payloads = (payload() for payload in self._payloads)
+        return sum(payload.resident_size for payload in payloads if payload is not None)
+
+    def pack_payloads(self):
+        """Packs the payloads of pushed commands and spills the oldest ones to disk if over budget."""
+        for cmd in self._unpacked_commands:
+            try:
+                packed = _pack_command(cmd)
+            except RuntimeError:
+                # The command was deleted by the stack
+                continue
+            self._payloads += [weakref.ref(payload) for payload in packed]
+        self._unpacked_commands.clear()
+        self._payloads = [payload for payload in self._payloads if payload() is not None]
+        excess = self.memory_usage() - self._memory_budget
+        for payload_ref in self._payloads:
+            if excess <= 0:
+                break
+            payload = payload_ref()
+            if payload is None:
+                continue
+            size = payload.resident_size
+            if self._spill_file is None:
+                self._spill_file = _SpillFile()
+            if payload.spill(self._spill_file):
+                excess -= size
+
+
+def _pack_command(cmd):
+    """Packs the payload attributes of a command and its children.
+
+    Returns:
+        list of _PackedPayload: packed payloads
+    """
+    packed = list()
+    for attribute in _payload_attributes(type(cmd)):
+        payload = attribute.pack(cmd)
+        if payload is not None:
+            packed.append(payload)
+    for k in range(cmd.childCount()):
+        packed += _pack_command(cmd.child(k))
+    return packed
+
+
+def _payload_attributes(command_type):
+    """Yields the payload attributes of given command class."""
+    seen = set()
+    for cls in command_type.__mro__:
+        for name, attribute in vars(cls).items():
+            if isinstance(attribute, PayloadAttribute) and name not in seen:
+                seen.add(name)
+                yield attribute
+
 
 class AgedUndoCommand(QUndoCommand):
     def __init__(self, parent=None):
@@ -259,6 +536,9 @@ class SpineDBCommand(AgedUndoCommand):
 
 
 class AddItemsCommand(SpineDBCommand):
+    redo_db_map_data = PayloadAttribute()
+    undo_db_map_data = PayloadAttribute()
+
     def __init__(self, db_mngr, db_map, data, item_type, parent=None):
         """
         Args:
@@ -297,6 +577,27 @@ class AddItemsCommand(SpineDBCommand):
         self.method_name = self._readd_method_name[self.item_type]
         self.undo_db_map_data = {db_map: {self.item_type: data} for db_map, data in db_map_data.items()}
 
+    def mergeWith(self, other):
+        """Takes over the items added by another completed command of the same type.
+
+        Args:
+            other (AddItemsCommand): command to merge
+
+        Returns:
+            bool: True if the commands were merged, False otherwise
+        """
+        if type(other) is not type(self) or other.item_type != self.item_type or other.db_map is not self.db_map:
+            return False
+        if not self._completed or not other._completed:
+            return False
+        redo_items = self.redo_db_map_data[self.db_map] + other.redo_db_map_data[self.db_map]
+        undo_items = (
+            self.undo_db_map_data[self.db_map][self.item_type] + other.undo_db_map_data[self.db_map][self.item_type]
+        )
+        self.redo_db_map_data = {self.db_map: redo_items}
+        self.undo_db_map_data = {self.db_map: {self.item_type: undo_items}}
+        return True
+
     def data(self):
         return {_format_item(self.item_type, item): [] for item in self.undo_db_map_data[self.db_map][self.item_type]}
 
@@ -308,6 +609,9 @@ class AddCheckedParameterValuesCommand(AddItemsCommand):
 
 
 class UpdateItemsCommand(SpineDBCommand):
+    redo_db_map_data = PayloadAttribute()
+    undo_db_map_data = PayloadAttribute()
+
     def __init__(self, db_mngr, db_map, data, item_type, parent=None):
         """
         Args:
@@ -343,6 +647,30 @@ class UpdateItemsCommand(SpineDBCommand):
             self.undo_db_map_data, self.method_name, self.get_method_name, self.completed_signal_name
         )
 
+    def mergeWith(self, other):
+        """Takes over the updates done by another completed command of the same type.
+
+        The later update of an item wins when redoing while the earlier state is restored when undoing.
+
+        Args:
+            other (UpdateItemsCommand): command to merge
+
+        Returns:
+            bool: True if the commands were merged, False otherwise
+        """
+        if type(other) is not type(self) or other.item_type != self.item_type or other.db_map is not self.db_map:
+            return False
+        if not self._completed or not other._completed:
+            return False
+        redo_items = {item["id"]: item for item in self.redo_db_map_data[self.db_map]}
+        redo_items.update((item["id"], item) for item in other.redo_db_map_data[self.db_map])
+        undo_items = {item["id"]: item for item in self.undo_db_map_data[self.db_map]}
+        for item in other.undo_db_map_data[self.db_map]:
+            undo_items.setdefault(item["id"], item)
+        self.redo_db_map_data = {self.db_map: list(redo_items.values())}
+        self.undo_db_map_data = {self.db_map: list(undo_items.values())}
+        return True
+
     def data(self):
         return {_format_item(self.item_type, item): [] for item in self.undo_db_map_data[self.db_map]}
 
@@ -354,6 +682,9 @@ class UpdateCheckedParameterValuesCommand(UpdateItemsCommand):
 
 
 class SetParameterDefinitionTagsCommand(SpineDBCommand):
+    redo_db_map_data = PayloadAttribute()
+    undo_db_map_data = PayloadAttribute()
+
     def __init__(self, db_mngr, db_map, data, parent=None):
         super().__init__(db_mngr, db_map, parent=parent)
         self.redo_db_map_data = {db_map: data}
@@ -386,6 +717,9 @@ class SetParameterDefinitionTagsCommand(SpineDBCommand):
 
 
 class RemoveItemsCommand(SpineDBCommand):
+    redo_db_map_typed_data = PayloadAttribute()
+    undo_typed_db_map_data = PayloadAttribute()
+
     def __init__(self, db_mngr, db_map, typed_data, parent=None):
         """
         Args:
@@ -406,8 +740,9 @@ class RemoveItemsCommand(SpineDBCommand):
 
     @SpineDBCommand.undomethod
     def undo(self):
-        for item_type in reversed(list(self.undo_typed_db_map_data.keys())):
-            db_map_data = self.undo_typed_db_map_data[item_type]
+        undo_typed_db_map_data = self.undo_typed_db_map_data
+        for item_type in reversed(list(undo_typed_db_map_data.keys())):
+            db_map_data = undo_typed_db_map_data[item_type]
             method_name = self._readd_method_name[item_type]
             get_method_name = self._get_method_name[item_type]
             emit_signal_name = self._added_signal_name[item_type]
@@ -417,12 +752,15 @@ class RemoveItemsCommand(SpineDBCommand):
     def receive_items_changed(self, db_map_typed_data):  # pylint: disable=arguments-differ
         super().receive_items_changed(db_map_typed_data)
         typed_data = db_map_typed_data.get(self.db_map, {})
+        undo_typed_db_map_data = self.undo_typed_db_map_data
         for item_type, data in typed_data.items():
             data = [_cache_to_db_item(item_type, item) for item in data]
-            self.undo_typed_db_map_data.setdefault(item_type, {}).setdefault(self.db_map, []).extend(data)
+            undo_typed_db_map_data.setdefault(item_type, {}).setdefault(self.db_map, []).extend(data)
+        self.undo_typed_db_map_data = undo_typed_db_map_data
 
     def data(self):
+        undo_typed_db_map_data = self.undo_typed_db_map_data
         return {
-            item_type: [_format_item(item_type, item) for item in self.undo_typed_db_map_data[item_type][self.db_map]]
-            for item_type in reversed(list(self.undo_typed_db_map_data.keys()))
+            item_type: [_format_item(item_type, item) for item in undo_typed_db_map_data[item_type][self.db_map]]
+            for item_type in reversed(list(undo_typed_db_map_data.keys()))
         }
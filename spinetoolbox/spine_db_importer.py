@@ -0,0 +1,180 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+SpineDBImporter class.
+"""
+
+from collections import deque
+from PySide2.QtCore import QObject, QTimer, Signal, Slot
+from spinedb_api import get_data_for_import
+from .spine_db_commands import AgedUndoCommand, AddItemsCommand, UpdateItemsCommand
+
+IMPORT_BATCH_SIZE = 1000
+"""Maximum number of items to import in one go."""
+
+_IMPORT_ORDER = (
+    "object_classes",
+    "relationship_classes",
+    "parameter_value_lists",
+    "parameter_tags",
+    "object_parameters",
+    "relationship_parameters",
+    "objects",
+    "relationships",
+    "object_groups",
+    "object_parameter_values",
+    "relationship_parameter_values",
+)
+"""Keyword arguments of ``get_data_for_import`` in the order their items depend on each other."""
+
+
+class SpineDBImporter(QObject):
+    """Imports data into database mappings in batches.
+
+    The import can either run to completion at once, or one batch per event loop iteration,
+    in which case the UI stays responsive and the import can be cancelled between batches.
+    Everything imported into a db map ends up in a single macro command on the db map's undo stack.
+    """
+
+    progressed = Signal(int)
+    """Emitted after each batch with the number of items imported so far."""
+    finished = Signal(object)
+    """Emitted when the import is done with a dict mapping db maps to lists of import errors."""
+
+    def __init__(self, db_mngr, db_map_data, command_text, batch_size=IMPORT_BATCH_SIZE):
+        """
+        Args:
+            db_mngr (SpineDBManager)
+            db_map_data (dict(DiffDatabaseMapping, dict)): maps dbs to data to be passed as keyword arguments
+                to ``get_data_for_import``
+            command_text (str): what to call the macro command
+            batch_size (int): maximum number of items per batch
+        """
+        super().__init__()
+        self._db_mngr = db_mngr
+        self._command_text = command_text
+        self._batches = deque(_make_batches(db_map_data, batch_size))
+        self.item_count = sum(len(items) for _, _, items in self._batches)
+        self._imported_count = 0
+        self._import_commands = {}
+        self._child_commands = {}
+        self._error_log = {db_map: [] for db_map in db_map_data}
+        self._cancelled = False
+
+    def run(self):
+        """Imports all batches at once."""
+        while self._batches:
+            self._import_batch(*self._batches.popleft())
+        self._finish()
+
+    def start(self):
+        """Starts importing batches one event loop iteration at a time."""
+        QTimer.singleShot(0, self._import_next_batch)
+
+    @Slot()
+    def cancel(self):
+        """Stops the import after current batch. Items imported so far are kept."""
+        self._cancelled = True
+
+    @Slot()
+    def _import_next_batch(self):
+        if self._cancelled or not self._batches:
+            self._finish()
+            return
+        self._import_batch(*self._batches.popleft())
+        self.progressed.emit(self._imported_count)
+        QTimer.singleShot(0, self._import_next_batch)
+
+    def _import_batch(self, db_map, keyword, items):
+        """Imports a batch of items of one kind into given db map.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            keyword (str): keyword argument of ``get_data_for_import``
+            items (list): items to import
+        """
+        import_command = self._import_commands.get(db_map)
+        if import_command is None:
+            import_command = self._import_commands[db_map] = AgedUndoCommand()
+            import_command.setText(self._command_text)
+            # NOTE: we push the import command before adding the children,
+            # because we *need* to call redo() on the children one by one
+            self._db_mngr.undo_stack[db_map].push(import_command)
+        for item_type, (to_add, to_update, import_error_log) in get_data_for_import(db_map, **{keyword: items}):
+            self._error_log[db_map] += [str(x) for x in import_error_log]
+            self._redo_child_command(AddItemsCommand, db_map, item_type, to_add)
+            self._redo_child_command(UpdateItemsCommand, db_map, item_type, to_update)
+        self._imported_count += len(items)
+
+    def _redo_child_command(self, command_type, db_map, item_type, data):
+        """Executes a child command of the import macro.
+
+        Only the first successful command of each type ends up in the macro;
+        the following ones are merged into it to keep the undo stack compact.
+
+        Args:
+            command_type (type): AddItemsCommand or UpdateItemsCommand
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            data (list): items to add or update
+        """
+        if not data:
+            return
+        key = (command_type, db_map, item_type)
+        target = self._child_commands.get(key)
+        parent = self._import_commands[db_map] if target is None else None
+        command = command_type(self._db_mngr, db_map, data, item_type, parent=parent)
+        command.redo()
+        if command.isObsolete():
+            return
+        if target is None:
+            self._child_commands[key] = command
+        else:
+            target.mergeWith(command)
+            self._db_mngr.undo_stack[db_map].repack(target)
+
+    def _finish(self):
+        for db_map, import_command in self._import_commands.items():
+            undo_stack = self._db_mngr.undo_stack[db_map]
+            if not any(key[1] is db_map for key in self._child_commands):
+                # Nothing imported. Set the command obsolete and call undo() on the stack to removed it
+                # unless something else has been pushed on the stack while importing in the background.
+                import_command.setObsolete(True)
+                if undo_stack.command(undo_stack.index() - 1) is import_command:
+                    undo_stack.undo()
+            else:
+                undo_stack.pack_payloads()
+        self.finished.emit(self._error_log)
+
+
+def _make_batches(db_map_data, batch_size):
+    """Splits import data into batches.
+
+    Args:
+        db_map_data (dict(DiffDatabaseMapping, dict)): maps dbs to data to be passed as keyword arguments
+            to ``get_data_for_import``
+        batch_size (int): maximum number of items per batch
+
+    Yields:
+        tuple: db map, keyword argument and list of items
+    """
+    for db_map, data in db_map_data.items():
+        keywords = [keyword for keyword in _IMPORT_ORDER if keyword in data]
+        keywords += [keyword for keyword in data if keyword not in _IMPORT_ORDER]
+        for keyword in keywords:
+            items = list(data[keyword])
+            if keyword not in _IMPORT_ORDER:
+                if items:
+                    yield db_map, keyword, items
+                continue
+            for start in range(0, len(items), batch_size):
+                yield db_map, keyword, items[start : start + batch_size]
@@ -17,14 +17,13 @@ The SpineDBManager class
 """
 
 from PySide2.QtCore import Qt, QObject, Signal, Slot
-from PySide2.QtWidgets import QMessageBox, QDialog, QCheckBox
+from PySide2.QtWidgets import QMessageBox, QDialog, QCheckBox, QProgressDialog
 from PySide2.QtGui import QKeySequence, QIcon, QFontMetrics, QFont
 from spinedb_api import (
     Array,
     create_new_spine_database,
     DateTime,
     DiffDatabaseMapping,
-    get_data_for_import,
     from_database,
     IndexedValue,
     is_empty,
@@ -43,9 +42,9 @@ from .data_store_form.widgets.data_store_form import DataStoreForm
 from .helpers import IconManager, busy_effect, format_string_list
 from .spine_db_signaller import SpineDBSignaller
 from .spine_db_fetcher import SpineDBFetcher
+from .spine_db_importer import IMPORT_BATCH_SIZE, SpineDBImporter
 from .spine_db_commands import (
     AgedUndoStack,
-    AgedUndoCommand,
     AddItemsCommand,
     AddCheckedParameterValuesCommand,
     UpdateItemsCommand,
@@ -106,6 +105,18 @@ class SpineDBManager(QObject):
 
     _GROUP_SEP = " \u01C0 "
 
+    _DELTA_REFRESH_TYPES = (
+        ("object class", "get_object_classes", "object_classes"),
+        ("relationship class", "get_relationship_classes", "relationship_classes"),
+        ("parameter value list", "get_parameter_value_lists", "parameter_value_lists"),
+        ("parameter tag", "get_parameter_tags", "parameter_tags"),
+        ("parameter definition", "get_parameter_definitions", "parameter_definitions"),
+        ("object", "get_objects", "objects"),
+        ("relationship", "get_relationships", "relationships"),
+        ("parameter value", "get_parameter_values", "parameter_values"),
+    )
+    """Item types that are synchronized by a delta refresh, in the order they need to be added."""
+
     def __init__(self, settings, logger, project):
         """Initializes the instance.
 
@@ -120,6 +131,7 @@ class SpineDBManager(QObject):
         self._db_specific_loggers = dict()
         self._db_maps = {}
         self._cache = {}
+        self._last_commit_ids = {}
         self._ds_forms = {}
         self.qsettings = settings
         self.undo_stack = {}
@@ -128,6 +140,7 @@ class SpineDBManager(QObject):
         self.icon_mngr = {}
         self.signaller = SpineDBSignaller(self)
         self.fetchers = []
+        self._importers = set()
         self.connect_signals()
 
     @property
@@ -171,6 +184,7 @@ class SpineDBManager(QObject):
         if db_map is None:
             return
         db_map.connection.close()
+        self._last_commit_ids.pop(db_map, None)
         if db_map.codename in self._db_specific_loggers:
             del self._db_specific_loggers[db_map.codename]
 
@@ -298,7 +312,7 @@ class SpineDBManager(QObject):
         self.undo_stack[db_map].indexChanged.disconnect(ds_form.update_undo_redo_actions)
         self.undo_stack[db_map].cleanChanged.disconnect(ds_form.update_commit_enabled)
         if not self.signaller.db_map_listeners(db_map):
-            del self.undo_stack[db_map]
+            self.undo_stack.pop(db_map).clear()
             del self.undo_action[db_map]
             del self.redo_action[db_map]
         return True
@@ -318,17 +332,94 @@ class SpineDBManager(QObject):
             db_map (DiffDatabaseMapping)
             listener (DataStoreForm)
         """
+        for db_map in db_maps:
+            self._last_commit_ids[db_map] = self._last_commit_id(db_map)
         fetcher = SpineDBFetcher(self, listener, *db_maps)
         self.fetchers.append(fetcher)
         fetcher.run()
 
     def refresh_session(self, *db_maps):
+        refreshed_db_maps = {db_map for db_map in db_maps if db_map in self._cache}
+        if not refreshed_db_maps:
+            return
+        self.refresh_cache(*refreshed_db_maps)
+        self.session_refreshed.emit(refreshed_db_maps)
+
+    def refresh_cache(self, *db_maps, force=False):
+        """Brings the cache of given db maps up to date with the database.
+
+        Only the difference between the cache and the database is applied:
+        the regular ``*_added``, ``*_updated`` and ``*_removed`` signals are emitted for new, changed and deleted items
+        so listeners can update their models in place.
+        Db maps whose latest commit has not changed since the last synchronization are skipped unless ``force`` is set.
+
+        Args:
+            *db_maps: database maps to refresh
+            force (bool): if True, refresh even if there are no new commits in the database
+
+        Returns:
+            set: db maps that were refreshed
+        """
         refreshed_db_maps = set()
         for db_map in db_maps:
-            if self._cache.pop(db_map, None) is not None:
-                refreshed_db_maps.add(db_map)
-        if refreshed_db_maps:
-            self.session_refreshed.emit(refreshed_db_maps)
+            if db_map not in self._cache:
+                continue
+            last_commit_id = self._last_commit_id(db_map)
+            if not force and last_commit_id is not None and last_commit_id == self._last_commit_ids.get(db_map):
+                continue
+            self._last_commit_ids[db_map] = last_commit_id
+            refreshed_db_maps.add(db_map)
+        if not refreshed_db_maps:
+            return refreshed_db_maps
+        added = {}
+        updated = {}
+        removed = {}
+        for item_type, getter_name, _ in self._DELTA_REFRESH_TYPES:
+            getter = getattr(self, getter_name)
+            for db_map in refreshed_db_maps:
+                cached_items = self._cache[db_map].get(item_type, {})
+                fresh_items = getter(db_map)
+                fresh_ids = set()
+                for item in fresh_items:
+                    id_ = item["id"]
+                    fresh_ids.add(id_)
+                    cached_item = cached_items.get(id_)
+                    if cached_item is None:
+                        added.setdefault(item_type, {}).setdefault(db_map, []).append(item)
+                    elif any(cached_item.get(key) != value for key, value in item.items()):
+                        updated.setdefault(item_type, {}).setdefault(db_map, []).append(item)
+                removed_items = [item for id_, item in cached_items.items() if id_ not in fresh_ids]
+                if removed_items:
+                    removed.setdefault(item_type, {})[db_map] = removed_items
+        for item_type, _, signal_prefix in reversed(self._DELTA_REFRESH_TYPES):
+            db_map_data = removed.get(item_type)
+            if db_map_data:
+                getattr(self, signal_prefix + "_removed").emit(db_map_data)
+        for item_type, _, signal_prefix in self._DELTA_REFRESH_TYPES:
+            db_map_data = added.get(item_type)
+            if db_map_data:
+                getattr(self, signal_prefix + "_added").emit(db_map_data)
+        for item_type, _, signal_prefix in self._DELTA_REFRESH_TYPES:
+            db_map_data = updated.get(item_type)
+            if db_map_data:
+                getattr(self, signal_prefix + "_updated").emit(db_map_data)
+        return refreshed_db_maps
+
+    @staticmethod
+    def _last_commit_id(db_map):
+        """Returns the id of the latest commit in given db map's database.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+
+        Returns:
+            int: commit id or None if it cannot be determined
+        """
+        commit_sq = getattr(db_map, "commit_sq", None)
+        if commit_sq is None:
+            return None
+        latest = db_map.query(commit_sq.c.id).order_by(commit_sq.c.id.desc()).first()
+        return latest.id if latest is not None else None
 
     def commit_session(self, *db_maps, rollback_if_no_msg=False, cookie=None):
         """
@@ -350,11 +441,11 @@ class SpineDBManager(QObject):
                 if commit_msg:
                     db_map.commit_session(commit_msg)
                     committed_db_maps.add(db_map)
+                    self._last_commit_ids[db_map] = self._last_commit_id(db_map)
                     self.undo_stack[db_map].setClean()
                 elif rollback_if_no_msg:
                     db_map.rollback_session()
                     rolled_db_maps.add(db_map)
-                    self._cache.pop(db_map, None)
                     self.undo_stack[db_map].setClean()
             except SpineDBAPIError as e:
                 error_log[db_map] = e.msg
@@ -363,6 +454,7 @@ class SpineDBManager(QObject):
         if committed_db_maps:
             self.session_committed.emit(committed_db_maps, cookie)
         if rolled_db_maps:
+            self.refresh_cache(*rolled_db_maps, force=True)
             self.session_rolled_back.emit(rolled_db_maps)
 
     @staticmethod
@@ -384,12 +476,12 @@ class SpineDBManager(QObject):
                 db_map.rollback_session()
                 rolled_db_maps.add(db_map)
                 self.undo_stack[db_map].clear()
-                del self._cache[db_map]
             except SpineDBAPIError as e:
                 error_log[db_map] = e.msg
         if any(error_log.values()):
             self.error_msg(error_log)
         if rolled_db_maps:
+            self.refresh_cache(*rolled_db_maps, force=True)
             self.session_rolled_back.emit(rolled_db_maps)
 
     @staticmethod
@@ -411,6 +503,7 @@ class SpineDBManager(QObject):
             return False
         try:
             db_map.commit_session(commit_msg)
+            self._last_commit_ids[db_map] = self._last_commit_id(db_map)
             cookie = None
             self.session_committed.emit({db_map}, cookie)
             return True
@@ -981,30 +1074,44 @@ class SpineDBManager(QObject):
         """Imports the given data into given db maps using the dedicated import functions from spinedb_api.
         Condenses all in a single command for undo/redo.
 
+        Large imports are done in batches in the background while a progress dialog is shown.
+
         Args:
-            db_map_data (dict(DiffDatabaseMapping, list)): Maps dbs to data to be passed as keyword arguments
+            db_map_data (dict(DiffDatabaseMapping, dict)): Maps dbs to data to be passed as keyword arguments
                 to `get_data_for_import`
             command_text (str, optional): What to call the command that condenses the operation.
         """
-        error_log = dict()
-        for db_map, data in db_map_data.items():
-            import_command = AgedUndoCommand()
-            import_command.setText(command_text)
-            child_cmds = []
-            # NOTE: we push the import command before adding the children,
-            # because we *need* to call redo() on the children one by one
-            self.undo_stack[db_map].push(import_command)
-            for item_type, (to_add, to_update, import_error_log) in get_data_for_import(db_map, **data):
-                error_log[db_map] = [str(x) for x in import_error_log]
-                add_cmd = AddItemsCommand(self, db_map, to_add, item_type, parent=import_command)
-                upd_cmd = UpdateItemsCommand(self, db_map, to_update, item_type, parent=import_command)
-                add_cmd.redo()
-                upd_cmd.redo()
-                child_cmds += [add_cmd, upd_cmd]
-            if all([cmd.isObsolete() for cmd in child_cmds]):
-                # Nothing imported. Set the command obsolete and call undo() on the stack to removed it
-                import_command.setObsolete(True)
-                self.undo_stack[db_map].undo()
+        importer = SpineDBImporter(self, db_map_data, command_text)
+        importer.finished.connect(self._handle_import_finished)
+        if importer.item_count <= IMPORT_BATCH_SIZE:
+            importer.run()
+            return
+        progress_dialog = QProgressDialog(
+            f"{command_text}...",
+            "Cancel",
+            0,
+            importer.item_count,
+            qApp.activeWindow(),  # pylint: disable=undefined-variable
+        )
+        progress_dialog.setWindowTitle(command_text)
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        importer.progressed.connect(progress_dialog.setValue)
+        progress_dialog.canceled.connect(importer.cancel)
+        importer.finished.connect(lambda _: progress_dialog.deleteLater())
+        self._importers.add(importer)
+        importer.start()
+
+    @Slot(object)
+    def _handle_import_finished(self, error_log):
+        """Reports import errors and releases the importer.
+
+        Args:
+            error_log (dict): lists of import errors keyed by DiffDatabaseMapping
+        """
+        self._importers.discard(self.sender())
         if any(error_log.values()):
             self.error_msg(error_log)
 
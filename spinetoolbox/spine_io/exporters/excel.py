@@ -23,6 +23,9 @@ import numpy as np
 from openpyxl import Workbook
 from spinedb_api import from_database, TimeSeries, TimePattern, DateTime, Duration, to_database
 
+# Number of parameter value rows fetched from the database at a time when streaming.
+_QUERY_BATCH_SIZE = 1000
+
 
 def _get_objects_and_parameters(db):
     """Exports all object data from spine database into unstacked list of lists
@@ -552,3 +555,195 @@ def export_spine_database_to_xlsx(db, filepath):
     _write_TimeSeries_to_xlsx(wb, rel_timepattern, "relationship", "time pattern")
     wb.save(filepath)
     wb.close()
+
+
+def stream_spine_database_to_xlsx(db, filepath):
+    """Writes all data in a spine database into an excel file using a write-only workbook.
+
+    Unlike :func:`export_spine_database_to_xlsx` this function reads the database one entity class at a time
+    and writes the class' sheets before moving on to the next class
+    so only the data of a single class is kept in memory at any time.
+    The sheets have the same format but they are ordered by class rather than by data type.
+
+    Args:
+        db (spinedb_api.DatabaseMapping): database mapping for database.
+        filepath (str): str with filepath to save excel file to.
+    """
+    wb = Workbook(write_only=True)
+    sheet_counters = {"object": 0, "json": 0, "ts": 0}
+    for rel_class in db.query(db.wide_relationship_class_sq):
+        object_classes = rel_class.object_class_name_list.split(",")
+        sq = db.relationship_parameter_value_sq
+        value_rows = db.query(sq).filter(sq.c.relationship_class_id == rel_class.id).yield_per(_QUERY_BATCH_SIZE)
+        parameters = [p.name for p in db.parameter_definition_list(relationship_class_id=rel_class.id)]
+        entity_names = [r.object_name_list for r in db.wide_relationship_list(class_id=rel_class.id)]
+        class_data = _collect_class_data(
+            entity_names, parameters, ((r.object_name_list, r.parameter_name, r.value) for r in value_rows)
+        )
+        _stream_class_to_xlsx(wb, "relationship", rel_class.name, object_classes, class_data, sheet_counters)
+    for obj_class in db.query(db.object_class_sq):
+        sq = db.object_parameter_value_sq
+        value_rows = db.query(sq).filter(sq.c.object_class_id == obj_class.id).yield_per(_QUERY_BATCH_SIZE)
+        parameters = [p.name for p in db.parameter_definition_list(object_class_id=obj_class.id)]
+        entity_names = [o.name for o in db.object_list(class_id=obj_class.id)]
+        class_data = _collect_class_data(
+            entity_names, parameters, ((r.object_name, r.parameter_name, r.value) for r in value_rows)
+        )
+        _stream_class_to_xlsx(wb, "object", obj_class.name, [obj_class.name], class_data, sheet_counters)
+    wb.save(filepath)
+    wb.close()
+
+
+class _ClassData:
+    """Parameter data of a single entity class sorted by value type.
+
+    Attributes:
+        parameters (list): sorted parameter names
+        rows (list): unstacked parameter table, one row per entity
+        json (list): array values as (entity name, parameter name, value) tuples
+        ts (list): time series as (entity name, parameter name, value) tuples
+        timepattern (list): time patterns as (entity name, parameter name, value) tuples
+    """
+
+    def __init__(self):
+        self.parameters = list()
+        self.rows = list()
+        self.json = list()
+        self.ts = list()
+        self.timepattern = list()
+
+
+def _collect_class_data(entity_names, parameter_names, value_rows):
+    """Unstacks the parameter values of a single entity class.
+
+    Args:
+        entity_names (list): names of class' entities; comma separated object names for relationships
+        parameter_names (list): names of class' parameter definitions
+        value_rows (Iterable): (entity name, parameter name, database value) tuples
+
+    Returns:
+        _ClassData: class' data
+    """
+    values_by_entity = {name: dict() for name in entity_names}
+    class_data = _ClassData()
+    parameters = set(parameter_names)
+    for entity_name, parameter_name, db_value in value_rows:
+        parameters.add(parameter_name)
+        value = from_database(db_value)
+        if value is None or isinstance(value, (int, float, str, DateTime, Duration)):
+            if isinstance(value, (Duration, DateTime)):
+                value = to_database(value)
+            values_by_entity.setdefault(entity_name, dict())[parameter_name] = value
+            continue
+        values_by_entity.setdefault(entity_name, dict())
+        if isinstance(value, list):
+            class_data.json.append((entity_name, parameter_name, value))
+        elif isinstance(value, TimeSeries):
+            class_data.ts.append((entity_name, parameter_name, value))
+        elif isinstance(value, TimePattern):
+            class_data.timepattern.append((entity_name, parameter_name, value))
+        else:
+            warnings.warn(f"Skipping export of unsuported parameter type: {type(value)}")
+    class_data.parameters = sorted(parameters)
+    for entity_name in sorted(values_by_entity):
+        values = values_by_entity.pop(entity_name)
+        class_data.rows.append((entity_name, [values.get(name) for name in class_data.parameters]))
+    return class_data
+
+
+def _stream_class_to_xlsx(wb, sheet_type, class_name, object_classes, class_data, sheet_counters):
+    """Writes the sheets of a single entity class into a write-only workbook.
+
+    Args:
+        wb (openpyxl.Workbook): write-only workbook
+        sheet_type (str): "relationship" or "object"
+        class_name (str): entity class name
+        object_classes (list): names of the object classes that make up the entity class
+        class_data (_ClassData): class' data
+        sheet_counters (dict): running counters used to name sheets with overly long titles
+    """
+    is_relationship = sheet_type == "relationship"
+    title = ("rel_" if is_relationship else "obj_") + class_name
+    if len(title) >= 32:
+        title = None if is_relationship else "object_class{}".format(sheet_counters["object"])
+    if not is_relationship:
+        sheet_counters["object"] += 1
+    ws = wb.create_sheet(title)
+    header = ["Sheet type", "Data type", f"{sheet_type} class name"]
+    info = [sheet_type, "Parameter", class_name]
+    if is_relationship:
+        header += ["Number of relationship dimensions", "Number of pivoted relationship dimensions"]
+        info += [len(object_classes), 0]
+    ws.append(header)
+    ws.append(info)
+    ws.append([])
+    ws.append(object_classes + class_data.parameters)
+    for entity_name, values in class_data.rows:
+        keys = entity_name.split(",") if is_relationship else [entity_name]
+        ws.append(keys + values)
+    class_data.rows.clear()
+    if class_data.json:
+        _stream_indexed_values_to_xlsx(
+            wb, sheet_type, class_name, object_classes, "array", class_data.json, "json", sheet_counters
+        )
+    if class_data.ts:
+        _stream_indexed_values_to_xlsx(
+            wb, sheet_type, class_name, object_classes, "time series", class_data.ts, "ts", sheet_counters
+        )
+    if class_data.timepattern:
+        _stream_indexed_values_to_xlsx(
+            wb, sheet_type, class_name, object_classes, "time pattern", class_data.timepattern, "ts", sheet_counters
+        )
+
+
+def _stream_indexed_values_to_xlsx(
+    wb, sheet_type, class_name, object_classes, data_type, values, sheet_prefix, sheet_counters
+):
+    """Writes a sheet of arrays, time series or time patterns for a single entity class into a write-only workbook.
+
+    Args:
+        wb (openpyxl.Workbook): write-only workbook
+        sheet_type (str): "relationship" or "object"
+        class_name (str): entity class name
+        object_classes (list): names of the object classes that make up the entity class
+        data_type (str): "array", "time series" or "time pattern"
+        values (list): (entity name, parameter name, value) tuples
+        sheet_prefix (str): "json" or "ts"
+        sheet_counters (dict): running counters used to name sheets with overly long titles
+    """
+    title = sheet_prefix + "_" + class_name
+    if len(title) >= 32:
+        title = "{}_{}{}".format(sheet_type, sheet_prefix, sheet_counters[sheet_prefix])
+    sheet_counters[sheet_prefix] += 1
+    ws = wb.create_sheet(title)
+    header = ["Sheet type", "Data type", f"{sheet_type} class name"]
+    info = [sheet_type, data_type, class_name]
+    if sheet_type == "relationship":
+        header.append("Number of relationship dimensions")
+        info.append(len(object_classes))
+    ws.append(header)
+    ws.append(info)
+    ws.append([])
+    index_name = {"array": "json parameter", "time series": "timestamp", "time pattern": "pattern"}[data_type]
+    title_rows = object_classes + [index_name]
+    columns = [
+        (entity_name.split(",") if sheet_type == "relationship" else [entity_name]) + [parameter_name]
+        for entity_name, parameter_name, _ in values
+    ]
+    for row_iter, title_cell in enumerate(title_rows):
+        ws.append([title_cell] + [keys[row_iter] for keys in columns])
+    if data_type == "array":
+        row_count = max(len(value) for _, _, value in values)
+        for row_iter in range(row_count):
+            ws.append([None] + [value[row_iter] if row_iter < len(value) else None for _, _, value in values])
+        return
+    unique_indexes = np.unique(np.concatenate([value.indexes for _, _, value in values]))
+    table = np.full((len(unique_indexes), len(values)), None, dtype=object)
+    for col, (_, _, value) in enumerate(values):
+        table[np.searchsorted(unique_indexes, value.indexes), col] = np.asarray(value.values).tolist()
+    if data_type == "time series":
+        index_labels = (str(np.datetime_as_string(index)) for index in unique_indexes)
+    else:
+        index_labels = (str(index) for index in unique_indexes)
+    for index_label, row in zip(index_labels, table):
+        ws.append([index_label] + row.tolist())
@@ -1530,6 +1530,11 @@ class SetSettings:
         """this list contains SetMetadata objects for each name in `set_names`"""
         return self._set_metadatas
 
+    @property
+    def records(self):
+        """a mapping from domain and set names to ordered record key lists"""
+        return self._records
+
     @property
     def global_parameters_domain_name(self):
         """the name of the domain, parameters of which should be exported as GAMS scalars"""
@@ -1682,8 +1687,18 @@ class SetSettings:
         return as_dictionary
 
     @staticmethod
-    def from_dict(dictionary):
-        """Deserializes ``SetSettings`` from a dict."""
+    def from_dict(dictionary, records=None):
+        """
+        Deserializes ``SetSettings`` from a dict.
+
+        Args:
+            dictionary (dict): serialized settings
+            records (Mapping, optional): a mapping from set names to record key tuples;
+                if given, overrides the records stored in ``dictionary``
+
+        Returns:
+            SetSettings: deserialized settings
+        """
         domain_names = dictionary.get("domain_names", list())
         domain_metadatas = dictionary.get("domain_metadatas", None)
         if domain_metadatas is not None:
@@ -1692,9 +1707,10 @@ class SetSettings:
         set_metadatas = dictionary.get("set_metadatas", None)
         if set_metadatas is not None:
             set_metadatas = [SetMetadata.from_dict(metadata_dict) for metadata_dict in set_metadatas]
-        records = {
-            set_name: [tuple(key) for key in keys] for set_name, keys in dictionary.get("records", dict()).items()
-        }
+        if records is None:
+            records = {
+                set_name: [tuple(key) for key in keys] for set_name, keys in dictionary.get("records", dict()).items()
+            }
         global_parameters_domain_name = dictionary.get("global_parameters_domain_name", "")
         settings = SetSettings(
             domain_names, set_names, records, domain_metadatas, set_metadatas, global_parameters_domain_name
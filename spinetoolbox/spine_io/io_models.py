@@ -50,6 +50,9 @@ _MAPPING_COLORS = {
 _ERROR_COLOR = QColor(Qt.red)
 
 
+# Marker for values that have not been type checked yet.
+_NOT_CONVERTED = object()
+
 _COLUMN_TYPE_ROLE = Qt.UserRole
 _COLUMN_NUMBER_ROLE = Qt.UserRole + 1
 
@@ -94,6 +97,11 @@ class MappingPreviewModel(MinimalTableModel):
         self._row_types = {}
         self._column_type_errors = {}
         self._row_type_errors = {}
+        self._color_map = None
+        self.modelReset.connect(self._invalidate_color_map)
+        self.headerDataChanged.connect(self._invalidate_color_map)
+        self.columnsInserted.connect(self._invalidate_color_map)
+        self.columnsRemoved.connect(self._invalidate_color_map)
 
     def mapping(self):
         return self._mapping
@@ -143,18 +151,34 @@ class MappingPreviewModel(MinimalTableModel):
             correct_index_order = lambda x: (x[0], x[1])
             error_dict = self._row_type_errors
         converter = type_class.convert_function()
+        # Many cells in a column or row share the same value, so each distinct value is converted only once.
+        errors_by_value = dict()
         for other_index in range(other_orientation_count):
-            index_tuple = correct_index_order((section, other_index))
-            index = self.index(*index_tuple)
+            row, column = index_tuple = correct_index_order((section, other_index))
             error_dict.pop(index_tuple, None)
-            data = self.data(index)
             try:
-                if isinstance(data, str) and not data:
-                    data = None
-                if data is not None:
+                data = self._main_data[row][column]
+            except IndexError:
+                continue
+            if data is None or (isinstance(data, str) and not data):
+                continue
+            try:
+                error = errors_by_value.get(data, _NOT_CONVERTED)
+            except TypeError:
+                # Unhashable values are not cached.
+                error = _NOT_CONVERTED
+            if error is _NOT_CONVERTED:
+                try:
                     converter(data)
-            except (ValueError, ParameterValueFormatError) as e:
-                error_dict[index_tuple] = e
+                    error = None
+                except (ValueError, ParameterValueFormatError) as e:
+                    error = e
+                try:
+                    errors_by_value[data] = error
+                except TypeError:
+                    pass
+            if error is not None:
+                error_dict[index_tuple] = error
         data_changed_start = correct_index_order((section, 0))
         data_changed_end = correct_index_order((section, other_orientation_count))
         self.dataChanged.emit(self.index(*data_changed_start), self.index(*data_changed_end))
@@ -189,9 +213,71 @@ class MappingPreviewModel(MinimalTableModel):
         self.validate(section, orientation)
 
     def _mapping_data_changed(self):
+        self._invalidate_color_map()
         self.update_colors()
         self.mappingChanged.emit()
 
+    def _invalidate_color_map(self, *args):
+        """Marks the precomputed cell colors out of date."""
+        self._color_map = None
+
+    def _current_color_map(self):
+        """Returns up-to-date precomputed cell colors.
+
+        Returns:
+            _PreviewColorMap: color map
+        """
+        if self._color_map is None:
+            self._color_map = self._build_color_map()
+        return self._color_map
+
+    def _build_color_map(self):
+        """Precomputes cell colors and error columns from current mapping and header.
+
+        The color rules are added in the same order of precedence as they used to be checked cell by cell.
+
+        Returns:
+            _PreviewColorMap: color map
+        """
+        mapping = self._mapping.model
+        if mapping.is_pivoted():
+            last_pivot_row = mapping.last_pivot_row()
+            if last_pivot_row is None:
+                last_pivot_row = -1
+            data_start_row = max(last_pivot_row, self._mapping.read_start_row - 1) + 1
+        else:
+            data_start_row = self._mapping.read_start_row
+        non_pivoted_columns = set(mapping_non_pivoted_columns(mapping, self.columnCount(), self.header))
+        non_pivoted_columns.update(self._mapping.skip_columns)
+        color_map = _PreviewColorMap(
+            data_start_row, set(self.mapping_column_ref_int_list()), non_pivoted_columns, self.header
+        )
+        if isinstance(mapping.parameters, ParameterValueMapping):
+            if mapping.is_pivoted():
+                color_map.add_pivoted_values(_MAPPING_COLORS["parameter value"])
+            else:
+                color_map.add_mapping(mapping.parameters.value, _MAPPING_COLORS["parameter value"])
+        if isinstance(mapping.parameters, ParameterArrayMapping) and mapping.parameters.extra_dimensions:
+            for ed in mapping.parameters.extra_dimensions:
+                color_map.add_mapping(ed, _MAPPING_COLORS["parameter extra dimension"])
+        if isinstance(mapping.parameters, ParameterDefinitionMapping):
+            color_map.add_mapping(mapping.parameters.name, _MAPPING_COLORS["parameter name"])
+        color_map.add_mapping(mapping.name, _MAPPING_COLORS["entity class"])
+        objects = []
+        classes = []
+        if isinstance(mapping, ObjectClassMapping):
+            objects = [mapping.objects]
+        else:
+            if mapping.objects:
+                objects = mapping.objects
+            if mapping.object_classes:
+                classes = mapping.object_classes
+        for o in objects:
+            color_map.add_mapping(o, _MAPPING_COLORS["entity"])
+        for c in classes:
+            color_map.add_mapping(c, _MAPPING_COLORS["entity class"])
+        return color_map
+
     def update_colors(self):
         self.dataChanged.emit(QModelIndex, QModelIndex, [Qt.BackgroundColorRole])
 
@@ -216,11 +302,8 @@ class MappingPreviewModel(MinimalTableModel):
             if (index.row(), index.column()) in self._column_type_errors:
                 return self.data_error(index, role)
 
-        if index.row() <= last_pivoted_row:
-            if (
-                index.column() not in mapping_non_pivoted_columns(self._mapping.model, self.columnCount(), self.header)
-                and index.column() not in self._mapping.skip_columns
-            ):
+        if index.row() <= last_pivoted_row and self._row_type_errors:
+            if index.column() not in self._current_color_map().non_pivoted_columns:
                 if (index.row(), index.column()) in self._row_type_errors:
                     return self.data_error(index, role, orientation=Qt.Vertical)
 
@@ -238,49 +321,7 @@ class MappingPreviewModel(MinimalTableModel):
         Returns:
             QColor: color of index
         """
-        mapping = self._mapping.model
-        if isinstance(mapping.parameters, ParameterValueMapping):
-            # parameter values color
-            if mapping.is_pivoted():
-                last_row = max(mapping.last_pivot_row(), mapping.read_start_row - 1)
-                if (
-                    last_row is not None
-                    and index.row() > last_row
-                    and index.column() not in self.mapping_column_ref_int_list()
-                ):
-                    return _MAPPING_COLORS["parameter value"]
-            elif self.index_in_mapping(mapping.parameters.value, index):
-                return _MAPPING_COLORS["parameter value"]
-        if isinstance(mapping.parameters, ParameterArrayMapping) and mapping.parameters.extra_dimensions:
-            # parameter extra dimensions color
-            for ed in mapping.parameters.extra_dimensions:
-                if self.index_in_mapping(ed, index):
-                    return _MAPPING_COLORS["parameter extra dimension"]
-        if isinstance(mapping.parameters, ParameterDefinitionMapping) and self.index_in_mapping(
-            mapping.parameters.name, index
-        ):
-            # parameter name colors
-            return _MAPPING_COLORS["parameter name"]
-        if self.index_in_mapping(mapping.name, index):
-            # class name color
-            return _MAPPING_COLORS["entity class"]
-        objects = []
-        classes = []
-        if isinstance(mapping, ObjectClassMapping):
-            objects = [mapping.objects]
-        else:
-            if mapping.objects:
-                objects = mapping.objects
-            if mapping.object_classes:
-                classes = mapping.object_classes
-        for o in objects:
-            # object colors
-            if self.index_in_mapping(o, index):
-                return _MAPPING_COLORS["entity"]
-        for c in classes:
-            # object colors
-            if self.index_in_mapping(c, index):
-                return _MAPPING_COLORS["entity class"]
+        return self._current_color_map().color(index.row(), index.column())
 
     def index_in_mapping(self, mapping, index):
         """
@@ -342,6 +383,82 @@ class MappingPreviewModel(MinimalTableModel):
         return int_non_piv_cols
 
 
+class _PreviewColorMap:
+    """Background colors and pivoted error columns of :class:`MappingPreviewModel` cells
+    precomputed per column and per row so looking up a cell's color does not depend on mapping complexity."""
+
+    def __init__(self, data_start_row, non_data_columns, non_pivoted_columns, header):
+        """
+        Args:
+            data_start_row (int): first row where column mappings apply
+            non_data_columns (set of int): non-pivoted and skipped columns where row mappings do not apply
+            non_pivoted_columns (set of int): columns excluded from row type validation of pivoted rows
+            header (list): preview table's header labels
+        """
+        self._data_start_row = data_start_row
+        self._non_data_columns = non_data_columns
+        self.non_pivoted_columns = non_pivoted_columns
+        self._header = header
+        self._column_colors = dict()
+        self._row_colors = dict()
+        self._pivoted_value_color = None
+        self._rule_count = 0
+
+    def add_mapping(self, mapping, color):
+        """Adds a color for cells that are included in given mapping.
+
+        Rules added earlier take precedence.
+
+        Args:
+            mapping (MappingBase): a mapping
+            color (QColor): cell color
+        """
+        if isinstance(mapping, ColumnHeaderMapping):
+            # column header can't be in data
+            return
+        if isinstance(mapping, ColumnMapping):
+            ref = mapping.reference
+            if isinstance(ref, str) and ref in self._header:
+                ref = self._header.index(ref)
+            self._column_colors.setdefault(ref, (self._rule_count, color))
+        elif isinstance(mapping, RowMapping):
+            self._row_colors.setdefault(mapping.reference, (self._rule_count, color))
+        self._rule_count += 1
+
+    def add_pivoted_values(self, color):
+        """Adds a color for the value cells of pivoted data.
+
+        Args:
+            color (QColor): cell color
+        """
+        if self._pivoted_value_color is None:
+            self._pivoted_value_color = (self._rule_count, color)
+        self._rule_count += 1
+
+    def color(self, row, column):
+        """Returns the background color of a cell.
+
+        Args:
+            row (int): cell's row
+            column (int): cell's column
+
+        Returns:
+            QColor: cell color or None if cell is not included in any mapping
+        """
+        rule = None
+        is_data_column = column not in self._non_data_columns
+        if row >= self._data_start_row:
+            rule = self._column_colors.get(column)
+            if is_data_column and self._pivoted_value_color is not None:
+                if rule is None or self._pivoted_value_color[0] < rule[0]:
+                    rule = self._pivoted_value_color
+        if is_data_column:
+            row_rule = self._row_colors.get(row)
+            if row_rule is not None and (rule is None or row_rule[0] < rule[0]):
+                rule = row_rule
+        return rule[1] if rule is not None else None
+
+
 class MappingSpecModel(QAbstractTableModel):
     """
     A model to hold a Mapping specification.
@@ -17,7 +17,7 @@ Class for a custom QTextBrowser for showing the logs and tool output.
 """
 
 from PySide2.QtCore import Slot
-from PySide2.QtGui import QDesktopServices, QTextCursor
+from PySide2.QtGui import QDesktopServices
 from PySide2.QtWidgets import QTextBrowser, QAction
 
 
@@ -31,6 +31,8 @@ class CustomQTextBrowser(QTextBrowser):
         """
         super().__init__(parent=parent)
         self._max_blocks = 2000
+        self.document().setMaximumBlockCount(self._max_blocks)
+        self.document().setUndoRedoEnabled(False)
         self.setOpenExternalLinks(True)
         self.setOpenLinks(False)  # Don't try open file:/// links in the browser widget, we'll open them externally
         self.anchorClicked.connect(self._open_external_link)
@@ -41,21 +43,13 @@ class CustomQTextBrowser(QTextBrowser):
         Appends new text block to the end of the current contents.
 
         If the widget contains more text blocks after the addition than a set limit,
-        blocks will be deleted at the start of the contents.
+        blocks will be deleted at the start of the contents by the document itself
+        so the rest of the document need not be laid out again.
 
         Args:
             text (str): text to add
         """
         super().append(text)
-        block_count = super().document().blockCount()
-        if block_count > self._max_blocks:
-            blocks_to_remove = block_count - self._max_blocks
-            cursor = self.textCursor()
-            cursor.movePosition(QTextCursor.Start)
-            for _ in range(blocks_to_remove):
-                cursor.select(QTextCursor.BlockUnderCursor)
-                cursor.removeSelectedText()
-                cursor.deleteChar()  # Remove the trailing newline
 
     def contextMenuEvent(self, event):
         """Reimplemented method to add a clear action into the default context menu.
@@ -79,6 +73,7 @@ class CustomQTextBrowser(QTextBrowser):
     @max_blocks.setter
     def max_blocks(self, new_max):
         self._max_blocks = new_max if new_max > 0 else 2000
+        self.document().setMaximumBlockCount(self._max_blocks)
 
     # pylint: disable=no-self-use
     @Slot("QUrl")
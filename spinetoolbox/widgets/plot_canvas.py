@@ -12,14 +12,22 @@
 """
 A Qt widget to use as a matplotlib backend.
 
+Long lines are downsampled to a few points per horizontal pixel before they are handed to matplotlib.
+The raw data is kept on the canvas and the lines are resampled whenever the x limits of the axes change.
+
 :author: A. Soininen (VTT)
 :date:   3.6.2019
 """
 
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.dates import date2num
 from matplotlib.figure import Figure
+import numpy as np
 from PySide2 import QtWidgets
 
+DOWNSAMPLING_THRESHOLD = 4096
+"""Lines with more points than this get downsampled."""
+
 
 class PlotCanvas(FigureCanvasQTAgg):
     """A widget for plotting with matplotlib."""
@@ -37,8 +45,122 @@ class PlotCanvas(FigureCanvasQTAgg):
         self.setParent(parent)
         super().setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         super().updateGeometry()
+        self._raw_data = dict()  # Maps downsampled lines to a tuple (numeric x, x, y) of the raw data
+        self._axes.callbacks.connect("xlim_changed", self._resample_lines)
 
     @property
     def axes(self):
         """:obj:`matplotlib.axes.Axes`: figure's axes"""
         return self._axes
+
+    def plot_downsampled(self, x, y, step=False, **kwargs):
+        """
+        Plots a line downsampling it first if it is long.
+
+        Args:
+            x (numpy.ndarray or list): x values in ascending order; numbers or datetime64 stamps
+            y (numpy.ndarray or list): y values
+            step (bool): if True, plots a step plot
+            **kwargs: additional arguments passed to matplotlib
+
+        Returns:
+            Line2D: the plotted line
+        """
+        plot = self._axes.step if step else self._axes.plot
+        if step:
+            kwargs.setdefault("where", "post")
+        x_numeric = _numeric_x(x)
+        if x_numeric is None or len(x_numeric) <= DOWNSAMPLING_THRESHOLD:
+            (line,) = plot(x, y, **kwargs)
+            return line
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=float)
+        indexes = downsampled_indexes(x_numeric, y, x_numeric[0], x_numeric[-1], self._bucket_count())
+        (line,) = plot(x[indexes], y[indexes], **kwargs)
+        self._raw_data[line] = (x_numeric, x, y)
+        return line
+
+    def raw_data(self, line):
+        """
+        Returns the data of a line before downsampling, e.g. for exporting it.
+
+        Args:
+            line (Line2D): a line on the axes
+
+        Returns:
+            tuple: x and y data at full resolution
+        """
+        data = self._raw_data.get(line)
+        if data is None:
+            return line.get_data(orig=True)
+        return data[1], data[2]
+
+    def _bucket_count(self):
+        """Returns the number of downsampling buckets which is the width of the axes in pixels."""
+        return max(1, int(self._axes.bbox.width))
+
+    def _resample_lines(self, axes):
+        """Downsamples the raw data of the lines to the current x limits."""
+        if not self._raw_data:
+            return
+        x_min, x_max = sorted(axes.get_xlim())
+        bucket_count = self._bucket_count()
+        for line, (x_numeric, x, y) in list(self._raw_data.items()):
+            if line not in axes.lines:
+                del self._raw_data[line]
+                continue
+            indexes = downsampled_indexes(x_numeric, y, x_min, x_max, bucket_count)
+            line.set_data(x[indexes], y[indexes])
+        self.draw_idle()
+
+
+def _numeric_x(x):
+    """Returns x as a float array if it is numeric or datetime64 and in ascending order, None otherwise."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x_numeric = date2num(x)
+    elif np.issubdtype(x.dtype, np.number):
+        x_numeric = x.astype(float)
+    else:
+        return None
+    if len(x_numeric) > 1 and np.any(np.diff(x_numeric) < 0.0):
+        return None
+    return x_numeric
+
+
+def downsampled_indexes(x, y, x_min, x_max, bucket_count):
+    """
+    Selects the points of a line that are needed to draw it at given resolution.
+
+    The visible x range is divided into buckets and the first, last, minimum and maximum point
+    of each bucket are kept (M4 aggregation). The points just outside the visible range are kept too
+    so the line continues to the edges of the view.
+
+    Args:
+        x (numpy.ndarray): x values as floats in ascending order
+        y (numpy.ndarray): y values
+        x_min (float): left edge of the visible range
+        x_max (float): right edge of the visible range
+        bucket_count (int): number of buckets, typically the width of the plot in pixels
+
+    Returns:
+        numpy.ndarray: indexes of the selected points in ascending order
+    """
+    first = max(0, np.searchsorted(x, x_min, side="left") - 1)
+    last = min(len(x), np.searchsorted(x, x_max, side="right") + 1)
+    if last - first <= 4 * bucket_count or x_max <= x_min:
+        return np.arange(first, last)
+    visible_x = x[first:last]
+    visible_y = y[first:last]
+    buckets = ((visible_x - x_min) * (bucket_count / (x_max - x_min))).astype(int)
+    np.clip(buckets, 0, bucket_count - 1, out=buckets)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.append(starts[1:], len(visible_x)) - 1
+    bucket_lengths = ends - starts + 1
+    selected = [starts, ends]
+    for reduce in (np.fmin, np.fmax):
+        extremes = np.repeat(reduce.reduceat(visible_y, starts), bucket_lengths)
+        positions = np.flatnonzero(visible_y == extremes)
+        _, first_in_bucket = np.unique(np.repeat(np.arange(len(starts)), bucket_lengths)[positions], return_index=True)
+        selected.append(positions[first_in_bucket])
+    return np.unique(np.concatenate(selected)) + first
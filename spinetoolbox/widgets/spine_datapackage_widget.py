@@ -71,6 +71,7 @@ class SpineDatapackageWidget(QMainWindow):
         self.err_msg = QErrorMessage(self)
         self.remove_row_icon = QIcon(":/icons/minus.png")
         self.progress_bar = QProgressBar()
+        self._converter_progress_message = ""
         self.progress_bar.hide()
         self.focus_widget = None  # Last widget which had focus before showing a menu from the menubar
         #  Set up the user interface from Designer.
@@ -351,8 +352,9 @@ class SpineDatapackageWidget(QMainWindow):
     @Slot("int", "QString", name="_handle_converter_progressed")
     def _handle_converter_progressed(self, step, msg):
         self.progress_bar.setValue(step)
-        if msg:
+        if msg and msg != self._converter_progress_message:
             self.msg_proc.emit(msg)
+        self._converter_progress_message = msg
 
     @Slot("QString", name="_handle_converter_failed")
     def _handle_converter_failed(self, msg):
@@ -17,7 +17,7 @@ Unit tests for PivotModel class.
 """
 
 import unittest
-from spinetoolbox.data_store_form.mvcmodels.pivot_model import PivotModel
+from spinetoolbox.data_store_form.mvcmodels.pivot_model import PivotModel, ProductPivotModel
 
 
 class TestPivotModel(unittest.TestCase):
@@ -152,6 +152,85 @@ class TestPivotModel(unittest.TestCase):
         index_header_values = model._get_unique_index_values(('test1', 'test2'))
         self.assertEqual(index_header_values, index_set)
 
+    def test_add_to_model_appends_new_headers(self):
+        model = PivotModel()
+        model.reset_model(dict(self.data), self.index_ids, ('test1',), ('test3',), ('test2',), ('cc',))
+        self.assertEqual(model._row_data_header, [('b',), ('c',)])
+        self.assertEqual(model._column_data_header, [(3,), (4,)])
+        row_count, column_count = model.add_to_model({('a', 'cc', 6): 'value_a_cc_6', ('f', 'ff', 7): 'value_f_ff_7'})
+        self.assertEqual((row_count, column_count), (1, 1))
+        self.assertEqual(model._row_data_header, [('b',), ('c',), ('a',)])
+        self.assertEqual(model._column_data_header, [(3,), (4,), (6,)])
+        self.assertEqual(list(model.index_values['test1']), ['a', 'b', 'c', 'd', 'e', 'f'])
+
+    def test_remove_from_model_keeps_headers_still_in_use(self):
+        model = PivotModel()
+        model.reset_model(dict(self.data), self.index_ids, ('test1',), ('test3', 'test2'), (), ())
+        row_count, column_count = model.remove_from_model({('a', 'aa', 1): None, ('d', 'dd', 5): None})
+        self.assertEqual((row_count, column_count), (1, 2))
+        self.assertEqual(model._row_data_header, [('a',), ('b',), ('c',), ('e',)])
+        self.assertEqual(model._column_data_header, [(2, 'bb'), (3, 'cc'), (4, 'cc'), (5, 'ee')])
+        self.assertEqual(list(model.index_values['test2']), ['bb', 'cc', 'ee'])
+        self.assertEqual(model._row_data_header, model._get_unique_index_values(('test1',)))
+        self.assertEqual(model._column_data_header, model._get_unique_index_values(('test3', 'test2')))
+
+    def test_unique_values(self):
+        model = PivotModel()
+        model.reset_model(self.data, self.index_ids)
+        self.assertEqual(model.unique_values(('test3',)), [(1,), (2,), (3,), (4,), (5,)])
+        self.assertEqual(model.unique_values(()), [])
+
+
+class TestProductPivotModel(unittest.TestCase):
+    def setUp(self):
+        self.index_ids = ['class1', 'class2', 'class3']
+        self.factors = [[('a',), ('b',)], [('x',), ('y',), ('z',)], [(1,), (2,)]]
+        self.data = {('a', 'y', 2): 'relationship_a_y_2'}
+
+    def _make_model(self, rows, columns, frozen=(), frozen_value=()):
+        model = ProductPivotModel()
+        model.set_factors((1, 1, 1), self.factors)
+        model.reset_model(dict(self.data), self.index_ids, rows, columns, frozen, frozen_value)
+        return model
+
+    def test_headers_span_cartesian_product(self):
+        model = self._make_model(('class1', 'class3'), ('class2',))
+        self.assertEqual(list(model.rows), [('a', 1), ('a', 2), ('b', 1), ('b', 2)])
+        self.assertEqual(list(model.columns), [('x',), ('y',), ('z',)])
+        self.assertEqual(model.get_pivoted_data([1], [0, 1]), [[None, 'relationship_a_y_2']])
+
+    def test_header_keys_follow_pivot_order(self):
+        model = self._make_model(('class3', 'class1'), ('class2',))
+        self.assertEqual(list(model.rows), [(1, 'a'), (2, 'a'), (1, 'b'), (2, 'b')])
+
+    def test_frozen_value_filters_headers(self):
+        model = self._make_model(('class1',), ('class2',), ('class3',), (2,))
+        self.assertEqual(list(model.rows), [('a',), ('b',)])
+        model.set_frozen_value((3,))
+        self.assertEqual(list(model.rows), [])
+        self.assertEqual(list(model.columns), [])
+
+    def test_add_factor_values_appends_rows(self):
+        model = self._make_model(('class1', 'class2'), ('class3',))
+        self.assertEqual(model.add_factor_values(1, [('w',), ('x',)]), (2, 0))
+        self.assertEqual(
+            list(model.rows),
+            [('a', 'x'), ('a', 'y'), ('a', 'z'), ('b', 'x'), ('b', 'y'), ('b', 'z'), ('a', 'w'), ('b', 'w')],
+        )
+        self.assertEqual(list(model.index_values['class2']), ['x', 'y', 'z', 'w'])
+
+    def test_remove_factor_values(self):
+        model = self._make_model(('class1', 'class2'), ('class3',))
+        self.assertEqual(model.remove_factor_values(0, [('a',)]), (3, 0))
+        self.assertEqual(list(model.rows), [('b', 'x'), ('b', 'y'), ('b', 'z')])
+        self.assertEqual(model.remove_factor_values(2, [(1,), (2,)]), (0, 2))
+        self.assertEqual(list(model.columns), [])
+        self.assertEqual(list(model.rows), [('b', 'x'), ('b', 'y'), ('b', 'z')])
+
+    def test_unique_values(self):
+        model = self._make_model(('class1',), ('class2',), ('class3',), (1,))
+        self.assertEqual(model.unique_values(('class3',)), [(1,), (2,)])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,66 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the SingleParameterModel subclasses.
+"""
+
+import unittest
+from unittest import mock
+from PySide2.QtWidgets import QApplication
+from spinetoolbox.data_store_form.mvcmodels.single_parameter_models import SingleObjectParameterValueModel
+
+
+class TestSingleObjectParameterValueModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._db_map = mock.Mock()
+        self._values = {
+            value_id: {"id": value_id, "parameter_id": 10 + value_id % 2, "object_id": 20 + value_id % 3}
+            for value_id in range(1, 7)
+        }
+        db_mngr = mock.MagicMock()
+        db_mngr.get_item.side_effect = lambda db_map, item_type, id_: self._values[id_]
+        self._model = SingleObjectParameterValueModel(["parameter_name"], db_mngr, self._db_map, 1)
+        self._model.reset_model(list(self._values))
+
+    def test_all_rows_accepted_without_filters(self):
+        self.assertEqual(list(self._model.accepted_rows()), [0, 1, 2, 3, 4, 5])
+
+    def test_parameter_and_entity_filters(self):
+        self._model._filter_parameter_ids = {(self._db_map, 1): {11}}
+        self.assertEqual(self._model.accepted_rows(), [0, 2, 4])
+        self._model._filter_entity_ids = {(self._db_map, 1): {20, 21}}
+        self.assertEqual(self._model.accepted_rows(), [0, 2])
+        self._model._filter_entity_ids = {(self._db_map, 2): {20}}
+        self.assertEqual(self._model.accepted_rows(), [])
+
+    def test_auto_filter(self):
+        self._model._auto_filter = {"parameter_name": {2, 3, 4}, "object_name": {}}
+        self.assertEqual(self._model.accepted_rows(), [1, 2, 3])
+        self._model._auto_filter["object_name"] = {1, 4, 6}
+        self.assertEqual(self._model.accepted_rows(), [3])
+        self._model._auto_filter = None
+        self.assertEqual(self._model.accepted_rows(), [])
+
+    def test_filter_columns_are_rebuilt_after_row_removal(self):
+        self._model._filter_parameter_ids = {(self._db_map, 1): {10}}
+        self.assertEqual(self._model.accepted_rows(), [1, 3, 5])
+        self._model.removeRows(0, 2)
+        self.assertEqual(self._model.accepted_rows(), [1, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the Entity graph's graphics items.
+"""
+
+from types import SimpleNamespace
+import unittest
+from unittest import mock
+from PySide2.QtCore import Qt
+from PySide2.QtGui import QColor, QPixmap
+from PySide2.QtWidgets import QApplication
+from spinetoolbox.data_store_form import graphics_items
+from spinetoolbox.data_store_form.graphics_items import EntityItem
+
+
+def _icon_color(color):
+    """Returns the icon color of an entity item that shows a pixmap filled with given color."""
+    pixmap = QPixmap(4, 4)
+    pixmap.fill(color)
+    return EntityItem._icon_color(SimpleNamespace(pixmap=lambda: pixmap))
+
+
+class TestIconColors(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        patcher = mock.patch.object(graphics_items, "_ICON_COLORS", graphics_items.OrderedDict())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_icon_color_is_average_of_pixmap(self):
+        self.assertEqual(_icon_color(QColor(Qt.red)), QColor(Qt.red))
+
+    def test_cache_size_is_bounded(self):
+        with mock.patch.object(graphics_items, "_ICON_COLOR_CACHE_SIZE", 2):
+            for color in (Qt.red, Qt.green, Qt.blue):
+                _icon_color(QColor(color))
+        self.assertEqual(len(graphics_items._ICON_COLORS), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the Entity graph's level of detail rendering.
+"""
+
+import unittest
+from unittest import mock
+from PySide2.QtCore import QRectF
+from PySide2.QtGui import QImage, QPainter
+from PySide2.QtWidgets import QApplication, QGraphicsLineItem, QGraphicsRectItem
+from spinetoolbox.data_store_form.graphics_items import DetailLevel
+from spinetoolbox.data_store_form.widgets.custom_qgraphicsviews import EntityQGraphicsView, GraphOverview, detail_level
+from spinetoolbox.widgets.custom_qgraphicsscene import CustomGraphicsScene
+
+_MODULE = "spinetoolbox.data_store_form.widgets.custom_qgraphicsviews"
+
+
+class _EntityItem(QGraphicsRectItem):
+    def __init__(self, x, y):
+        super().__init__(-8.0, -8.0, 16.0, 16.0)
+        self.setPos(x, y)
+        self.set_detail_level = mock.MagicMock()
+        self.apply_zoom = mock.MagicMock()
+
+
+class _ArcItem(QGraphicsLineItem):
+    def __init__(self, rel_item, obj_item):
+        super().__init__(rel_item.x(), rel_item.y(), obj_item.x(), obj_item.y())
+        self.rel_item = rel_item
+        self.obj_item = obj_item
+        self.set_detail_level = mock.MagicMock()
+        self.apply_zoom = mock.MagicMock()
+
+
+class _GraphTestBase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        for name, replacement in (("EntityItem", _EntityItem), ("ArcItem", _ArcItem)):
+            patcher = mock.patch(f"{_MODULE}.{name}", replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self._scene = CustomGraphicsScene()
+        self._relationship = _EntityItem(0.0, 0.0)
+        self._near_object = _EntityItem(1.0, 1.0)
+        self._far_object = _EntityItem(3000.0, 0.0)
+        self._arcs = [_ArcItem(self._relationship, self._near_object), _ArcItem(self._relationship, self._far_object)]
+        for item in [self._relationship, self._near_object, self._far_object] + self._arcs:
+            self._scene.addItem(item)
+
+
+def _paint(paint):
+    """Calls paint with a painter on a small image."""
+    image = QImage(16, 16, QImage.Format_ARGB32)
+    painter = QPainter(image)
+    try:
+        paint(painter)
+    finally:
+        painter.end()
+
+
+class TestDetailLevel(unittest.TestCase):
+    def test_zoom_thresholds(self):
+        expected = {
+            2.0: DetailLevel.FULL,
+            0.5: DetailLevel.FULL,
+            0.49: DetailLevel.NO_LABELS,
+            0.25: DetailLevel.NO_LABELS,
+            0.24: DetailLevel.PLAIN,
+            0.08: DetailLevel.PLAIN,
+            0.079: DetailLevel.CLUSTERS,
+            0.001: DetailLevel.CLUSTERS,
+        }
+        for zoom_factor, level in expected.items():
+            with self.subTest(zoom_factor=zoom_factor):
+                self.assertEqual(detail_level(zoom_factor), level)
+
+
+class TestGraphOverview(_GraphTestBase):
+    def test_hidden_items_are_left_out(self):
+        self._far_object.setVisible(False)
+        overview = GraphOverview(self._scene.items())
+        self.assertEqual(len(overview._positions), 2)
+        self.assertEqual(len(overview._arcs), 1)
+
+    def test_arcs_are_painted_as_single_path(self):
+        overview = GraphOverview(self._scene.items())
+        _paint(overview.paint_arcs)
+        self.assertEqual(overview._arc_path.elementCount(), 2 * len(self._arcs))
+
+    def test_nearby_entities_are_clustered(self):
+        overview = GraphOverview(self._scene.items())
+        _paint(lambda painter: overview.paint_clusters(painter, 0.05))
+        arc_path, vertex_path = overview._cluster_paths
+        # The arc inside the cluster of the relationship and the near object is dropped.
+        self.assertEqual(arc_path.elementCount(), 2)
+        self.assertFalse(vertex_path.isEmpty())
+        clusters = overview._cluster_paths
+        _paint(lambda painter: overview.paint_clusters(painter, 0.051))
+        self.assertIs(overview._cluster_paths, clusters)
+
+
+class TestEntityQGraphicsView(_GraphTestBase):
+    def setUp(self):
+        super().setUp()
+        self._view = EntityQGraphicsView(None)
+        self._view.setScene(self._scene)
+        self.addCleanup(self._view.deleteLater)
+
+    def _zoom_to(self, zoom_factor):
+        self._view._zoom(zoom_factor / self._view.zoom_factor)
+
+    def _draw_background(self):
+        _paint(lambda painter: self._view.drawBackground(painter, QRectF(-10.0, -10.0, 20.0, 20.0)))
+
+    def test_detail_level_is_set_only_when_it_changes(self):
+        self._zoom_to(0.3)
+        for item in self._scene.items():
+            item.set_detail_level.assert_called_once_with(DetailLevel.NO_LABELS)
+            item.set_detail_level.reset_mock()
+        self._zoom_to(0.35)
+        for item in self._scene.items():
+            item.set_detail_level.assert_not_called()
+        self._zoom_to(0.1)
+        for item in self._scene.items():
+            item.set_detail_level.assert_called_once_with(DetailLevel.PLAIN)
+
+    def test_only_entities_are_rescaled_when_zoomed_out(self):
+        self._zoom_to(0.3)
+        for item in self._scene.items():
+            item.apply_zoom.reset_mock()
+        self._zoom_to(0.35)
+        for arc in self._arcs:
+            arc.apply_zoom.assert_not_called()
+        self._relationship.apply_zoom.assert_called_once()
+
+    def test_overview_is_cached_until_invalidated(self):
+        self._zoom_to(0.1)
+        self._draw_background()
+        overview = self._view._overview
+        self.assertIsNotNone(overview)
+        self._draw_background()
+        self.assertIs(self._view._overview, overview)
+        self._far_object.setPos(-3000.0, 0.0)
+        self._view.invalidate_overview()
+        self._draw_background()
+        self.assertIsNot(self._view._overview, overview)
+        self.assertIn(-3000.0, self._view._overview._positions[:, 0])
+
+    def test_changing_detail_level_invalidates_overview(self):
+        self._zoom_to(0.1)
+        self._draw_background()
+        self._zoom_to(0.09)
+        self.assertIsNotNone(self._view._overview)
+        self._zoom_to(0.05)
+        self.assertIsNone(self._view._overview)
+
+    def test_no_overview_at_full_detail(self):
+        self._draw_background()
+        self.assertIsNone(self._view._overview)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the graph_layout_generator module.
+"""
+
+import unittest
+from unittest import mock
+import numpy as np
+from PySide2.QtWidgets import QApplication
+from spinetoolbox.data_store_form.widgets.graph_layout_generator import GraphLayoutGenerator
+
+
+class TestGraphLayoutGenerator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        # A ring of 30 objects connected by 30 relationships
+        object_count = 30
+        self._vertex_count = 2 * object_count
+        self._src_inds = []
+        self._dst_inds = []
+        for k in range(object_count):
+            self._src_inds += [object_count + k, object_count + k]
+            self._dst_inds += [k, (k + 1) % object_count]
+
+    def _make_generator(self, heavy_positions=None):
+        generator = GraphLayoutGenerator(
+            self._vertex_count, self._src_inds, self._dst_inds, 3.0, heavy_positions=heavy_positions
+        )
+        self.addCleanup(generator._thread.wait)
+        self.addCleanup(generator.clean_up)
+        return generator
+
+    def _link_lengths(self, x, y):
+        layout = np.column_stack((x, y))
+        return np.linalg.norm(layout[self._src_inds] - layout[self._dst_inds], axis=1)
+
+    def test_sparse_layout_keeps_links_short(self):
+        generator = self._make_generator()
+        with mock.patch("spinetoolbox.data_store_form.widgets.graph_layout_generator._SPARSE_LAYOUT_THRESHOLD", 10):
+            x, y = generator.get_coordinates()
+        self.assertEqual(len(x), self._vertex_count)
+        self.assertTrue(np.all(np.isfinite(x)) and np.all(np.isfinite(y)))
+        self.assertLess(np.median(self._link_lengths(x, y)), 6.0)
+
+    def test_sparse_layout_pins_heavy_positions(self):
+        generator = self._make_generator(heavy_positions={0: {"x": 100.0, "y": -50.0}})
+        with mock.patch("spinetoolbox.data_store_form.widgets.graph_layout_generator._SPARSE_LAYOUT_THRESHOLD", 10):
+            x, y = generator.get_coordinates()
+        self.assertEqual((x[0], y[0]), (100.0, -50.0))
+
+    def test_cancelled_sparse_layout_still_finishes(self):
+        generator = self._make_generator()
+        finished = mock.MagicMock()
+        generator.finished.connect(finished)
+        generator.cancel()
+        with mock.patch("spinetoolbox.data_store_form.widgets.graph_layout_generator._SPARSE_LAYOUT_THRESHOLD", 10):
+            x, y = generator.get_coordinates()
+        self.assertEqual(len(x), self._vertex_count)
+        finished.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
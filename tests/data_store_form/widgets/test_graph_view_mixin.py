@@ -0,0 +1,192 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for building the Entity graph in GraphViewMixin.
+"""
+
+import unittest
+from unittest import mock
+from PySide2.QtCore import QObject, Signal
+from PySide2.QtWidgets import QApplication, QGraphicsLineItem, QGraphicsRectItem, QGraphicsScene
+from spinetoolbox.data_store_form.widgets.graph_view_mixin import GraphViewMixin
+
+_MODULE = "spinetoolbox.data_store_form.widgets.graph_view_mixin"
+
+
+class _EntityItem(QGraphicsRectItem):
+    def __init__(self, data_store_form, x, y, extent, entity_id=None):
+        super().__init__(-extent / 2, -extent / 2, extent, extent)
+        self.setPos(x, y)
+        self.entity_id = entity_id
+        self.arc_items = list()
+
+    def add_arc_item(self, arc_item):
+        self.arc_items.append(arc_item)
+
+    def update_arcs_line(self):
+        pass
+
+
+class _ObjectItem(_EntityItem):
+    pass
+
+
+class _RelationshipItem(_EntityItem):
+    pass
+
+
+class _ArcItem(QGraphicsLineItem):
+    def __init__(self, rel_item, obj_item, width):
+        super().__init__()
+        self.rel_item = rel_item
+        self.obj_item = obj_item
+        rel_item.add_arc_item(self)
+        obj_item.add_arc_item(self)
+
+
+class _LayoutGenerator(QObject):
+    """Lays vertices out on a line right away, keeping heavy vertices where they are."""
+
+    finished = Signal(object, object)
+    done = Signal()
+
+    def __init__(self, vertex_count, src_inds, dst_inds, spread, heavy_positions=None):
+        super().__init__()
+        heavy_positions = heavy_positions or {}
+        self._x = [heavy_positions.get(i, {"x": spread * i})["x"] for i in range(vertex_count)]
+        self._y = [heavy_positions.get(i, {"y": 0.0})["y"] for i in range(vertex_count)]
+
+    def show_progress_widget(self, parent):
+        pass
+
+    def stop(self):
+        pass
+
+    def start(self):
+        self.done.emit()
+        self.finished.emit(self._x, self._y)
+
+
+class _GraphHost(GraphViewMixin, QObject):
+    def __init__(self, relationships):
+        self.qsettings = mock.MagicMock()
+        self.qsettings.value.return_value = "false"
+        self.ui = mock.MagicMock()
+        self.db_map = mock.MagicMock()
+        self.db_mngr = mock.MagicMock()
+        self.db_mngr.get_items.return_value = relationships
+        self.db_mngr.get_items_by_field.return_value = []
+        super().__init__()
+        self.scene = QGraphicsScene()
+        self.scene.selectionChanged.connect(self._handle_scene_selection_changed)
+        self.ui.graphicsView.items.side_effect = self.scene.items
+        self.selected_object_ids = set()
+
+    def setup_widget_actions(self):
+        pass
+
+    def _get_selected_entity_ids(self):
+        return set(self.selected_object_ids), set()
+
+
+def _graph(host):
+    """Returns the entities and arcs that are visible in host's scene."""
+    items = [item for item in host.scene.items() if item.isVisible()]
+    entities = {(type(item), item.entity_id) for item in items if isinstance(item, _EntityItem)}
+    arcs = {(item.rel_item.entity_id, item.obj_item.entity_id) for item in items if isinstance(item, _ArcItem)}
+    return entities, arcs
+
+
+class TestGraphViewMixin(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        relationships = [
+            {"id": 10, "object_id_list": "1,2"},
+            {"id": 11, "object_id_list": "2,3"},
+            {"id": 12, "object_id_list": "3,4"},
+        ]
+        patchers = [
+            mock.patch(f"{_MODULE}.ObjectItem", _ObjectItem),
+            mock.patch(f"{_MODULE}.RelationshipItem", _RelationshipItem),
+            mock.patch(f"{_MODULE}.EntityItem", _EntityItem),
+            mock.patch(f"{_MODULE}.ArcItem", _ArcItem),
+            mock.patch(f"{_MODULE}.GraphLayoutGenerator", _LayoutGenerator),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self._host = _GraphHost(relationships)
+        self._reference = _GraphHost(relationships)
+
+    def _build(self, object_ids, **kwargs):
+        self._host.selected_object_ids = object_ids
+        self._host.build_graph(**kwargs)
+
+    def _full_build(self, object_ids):
+        self._reference.selected_object_ids = object_ids
+        self._reference.build_graph(incremental=False)
+        return _graph(self._reference)
+
+    def test_incremental_update_matches_full_build(self):
+        self._build({1, 2})
+        for object_ids in ({1, 2, 3}, {3, 4}, {1}, {1, 2, 3, 4}, set(), {2}):
+            with self.subTest(object_ids=object_ids):
+                self._build(object_ids)
+                self.assertEqual(_graph(self._host), self._full_build(object_ids))
+
+    def test_incremental_update_keeps_positions_of_remaining_items(self):
+        self._build({1, 2})
+        positions = {item.entity_id: item.pos() for item in self._host.object_items}
+        with mock.patch.object(self._host, "_update_graph_incrementally", wraps=self._host._update_graph_incrementally):
+            self._build({1, 2, 3})
+            self._host._update_graph_incrementally.assert_called_once()
+        for item in self._host.object_items:
+            if item.entity_id in positions:
+                self.assertEqual(item.pos(), positions[item.entity_id])
+        self.assertEqual(_graph(self._host), self._full_build({1, 2, 3}))
+
+    def test_hidden_items_force_full_build(self):
+        self._build({1, 2})
+        hidden_item = self._host.object_items[0]
+        hidden_item.setVisible(False)
+        self._host.hidden_items.append(hidden_item)
+        with mock.patch.object(self._host, "_update_graph_incrementally") as update_graph_incrementally:
+            self._build({1, 2, 3})
+            update_graph_incrementally.assert_not_called()
+        self.assertEqual(self._host.hidden_items, [])
+        self.assertEqual(_graph(self._host), self._full_build({1, 2, 3}))
+
+    def test_heat_map_forces_full_build(self):
+        self._build({1, 2})
+        heat_map_item = QGraphicsRectItem()
+        self._host.scene.addItem(heat_map_item)
+        self._host.heat_map_items.append(heat_map_item)
+        with mock.patch.object(self._host, "_update_graph_incrementally") as update_graph_incrementally:
+            self._build({1, 2, 3})
+            update_graph_incrementally.assert_not_called()
+        self.assertEqual(self._host.heat_map_items, [])
+        self.assertEqual(_graph(self._host), self._full_build({1, 2, 3}))
+
+    def test_persistent_build_is_never_incremental(self):
+        self._build({1, 2})
+        with mock.patch.object(self._host, "_update_graph_incrementally") as update_graph_incrementally:
+            self._build({1, 2, 3}, persistent=True)
+            update_graph_incrementally.assert_not_called()
+        self.assertEqual(_graph(self._host), self._full_build({1, 2, 3}))
+
+
+if __name__ == '__main__':
+    unittest.main()
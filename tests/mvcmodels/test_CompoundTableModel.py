@@ -0,0 +1,100 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the CompoundTableModel class.
+"""
+
+import unittest
+from unittest import mock
+from PySide2.QtWidgets import QApplication
+from spinetoolbox.mvcmodels.compound_table_model import CompoundTableModel
+from spinetoolbox.mvcmodels.minimal_table_model import MinimalTableModel
+
+
+class _EvenRowsCompoundModel(CompoundTableModel):
+    """A compound model that accepts only even rows from its sub models."""
+
+    def _rows_for_model(self, model):
+        return [row for row in range(model.rowCount()) if row % 2 == 0]
+
+
+class TestCompoundTableModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def _make_sub_model(self, data):
+        sub_model = MinimalTableModel()
+        sub_model.reset_model([[x] for x in data])
+        return sub_model
+
+    def test_rows_map_to_sub_models(self):
+        model = CompoundTableModel(header=["letter"])
+        first = self._make_sub_model(["a", "b"])
+        empty = self._make_sub_model([])
+        second = self._make_sub_model(["c", "d", "e"])
+        model.sub_models = [first, empty, second]
+        model.refresh()
+        self.assertEqual(model.rowCount(), 5)
+        self.assertEqual([model.item_at_row(row)[0] for row in range(5)], ["a", "b", "c", "d", "e"])
+        self.assertIs(model.sub_model_at_row(1), first)
+        self.assertIs(model.sub_model_at_row(2), second)
+        self.assertEqual(list(model._row_map), [(first, 0), (first, 1), (second, 0), (second, 1), (second, 2)])
+        self.assertEqual(model._row_map[-1], (second, 2))
+        with self.assertRaises(IndexError):
+            model._row_map[5]
+
+    def test_map_from_sub_with_filtered_rows(self):
+        model = _EvenRowsCompoundModel(header=["letter"])
+        first = self._make_sub_model(["a", "b", "c"])
+        second = self._make_sub_model(["d", "e", "f", "g", "h"])
+        model.sub_models = [first, second]
+        model.refresh()
+        self.assertEqual([model.item_at_row(row)[0] for row in range(model.rowCount())], ["a", "c", "d", "f", "h"])
+        self.assertEqual(model.map_from_sub(second, second.index(4, 0)).row(), 4)
+        self.assertFalse(model.map_from_sub(second, second.index(1, 0)).isValid())
+        self.assertEqual(model.map_to_sub(model.index(3, 0)).row(), 2)
+
+    def test_refresh_recomputes_only_changed_sub_models(self):
+        model = _EvenRowsCompoundModel(header=["letter"])
+        first = self._make_sub_model(["a", "b"])
+        second = self._make_sub_model(["c", "d"])
+        model.sub_models = [first, second]
+        model.refresh()
+        with mock.patch.object(model, "_rows_for_model", wraps=model._rows_for_model) as rows_for_model:
+            model.refresh()
+            rows_for_model.assert_not_called()
+            second.insertRows(2, 1)
+            second.setData(second.index(2, 0), "e")
+            model.refresh()
+            rows_for_model.assert_called_once_with(second)
+            rows_for_model.reset_mock()
+            model._invalidate_row_map(first)
+            model.refresh()
+            rows_for_model.assert_called_once_with(first)
+        self.assertEqual([model.item_at_row(row)[0] for row in range(model.rowCount())], ["a", "c", "e"])
+
+    def test_insert_rows_goes_to_right_sub_model(self):
+        model = CompoundTableModel(header=["letter"])
+        first = self._make_sub_model(["a"])
+        second = self._make_sub_model(["b"])
+        model.sub_models = [first, second]
+        model.refresh()
+        self.assertTrue(model.insertRows(1, 2))
+        self.assertEqual(first.rowCount(), 1)
+        self.assertEqual(second.rowCount(), 3)
+        self.assertEqual(model.rowCount(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,7 @@ Unit tests for FilterCheckboxListModel class.
 :date:   3.12.2018
 """
 
+import re
 import unittest
 from unittest import mock
 from PySide2.QtCore import Qt
@@ -368,6 +369,35 @@ class TestFilterCheckboxListModel(unittest.TestCase):
         self.assertEqual(self.model._selected_filtered, set(self.data[4:]))
         self.assertTrue(self.model._all_selected)
 
+    def test_remove_many_scattered_items_resets_model_once(self):
+        data = [str(i) for i in range(100)]
+        self.model.set_list(data)
+        with mock.patch.object(self.model, "beginResetModel") as br, mock.patch.object(
+            self.model, "endResetModel"
+        ), mock.patch.object(self.model, "beginRemoveRows") as brr:
+            self.model.remove_items(data[::2])
+        br.assert_called_once()
+        brr.assert_not_called()
+        self.assertEqual(self.model._data, data[1::2])
+
+    def test_remove_items_keeps_base_filter_index(self):
+        self.model.set_list(self.data)
+        self.model.set_base_filter(lambda x: x != 'bb')
+        self.model.remove_items({'a', 'aaa'})
+        self.assertEqual(self.model._base_filter_index, [0, 1, 3])
+        self.assertIs(self.model._filter_index, self.model._base_filter_index)
+
+    def test_add_items_evaluates_filters_only_for_new_items(self):
+        self.model.set_list(self.data)
+        self.model.set_base_filter(lambda x: x != 'bbbbb')
+        self.model.set_filter('b')
+        with mock.patch("spinetoolbox.mvcmodels.filter_checkbox_list_model.re.search", wraps=re.search) as search:
+            self.model.add_items(['bbbb', 'bbbbb', 'c'])
+        self.assertEqual(search.call_count, 2)
+        self.assertEqual(self.model._base_filter_index, [0, 1, 2, 3, 4, 5, 6, 8])
+        self.assertEqual(self.model._filter_index, [3, 4, 5, 6])
+        self.assertEqual(self.model._selected_filtered, {'b', 'bb', 'bbb', 'bbbb'})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -250,6 +250,14 @@ class TestMapModel(unittest.TestCase):
         index = model.index(0, 0)
         self.assertEqual(index.data(), "1M")
 
+    def test_batch_set_data(self):
+        map_value = Map(["a"], [1.1])
+        model = MapModel(map_value)
+        self.assertTrue(model.insertRows(1, 2))
+        indexes = [model.index(1, 0), model.index(1, 1), model.index(2, 0), model.index(2, 1)]
+        self.assertTrue(model.batch_set_data(indexes, ['"b"', "2.2", '"c"', "3.3"]))
+        self.assertEqual(model.value(), Map(["a", "b", "c"], [1.1, 2.2, 3.3]))
+
     def test_trim_columns(self):
         map_value = Map(["a"], [1.1])
         model = MapModel(map_value)
@@ -19,6 +19,7 @@ Unit tests for Data Connection project item.
 import os
 import unittest
 from unittest.mock import MagicMock, NonCallableMagicMock
+from PySide2.QtCore import Qt
 from PySide2.QtWidgets import QApplication
 from spinetoolbox.project_items.data_connection.data_connection import DataConnection
 from spinetoolbox.project_items.data_connection.item_info import ItemInfo
@@ -82,6 +83,40 @@ class TestDataConnection(unittest.TestCase):
             " a <b>Data Connection</b> has not been implemented yet."
         )
 
+    def test_refresh_updates_only_changed_rows(self):
+        data_dir = self.data_connection.data_dir
+        for name in ("a.txt", "b.txt"):
+            with open(os.path.join(data_dir, name), "w"):
+                pass
+        self.data_connection.refresh()
+        model = self.data_connection.data_model
+        self.assertEqual(model.rowCount(), 2)
+        kept_item = model.findItems(os.path.join(data_dir, "b.txt"))[0]
+        os.remove(os.path.join(data_dir, "a.txt"))
+        with open(os.path.join(data_dir, "c.csv"), "w"):
+            pass
+        self.data_connection.refresh()
+        paths = sorted(model.item(row).data(Qt.UserRole) for row in range(model.rowCount()))
+        self.assertEqual(paths, [os.path.join(data_dir, "b.txt"), os.path.join(data_dir, "c.csv")])
+        self.assertIs(model.findItems(os.path.join(data_dir, "b.txt"))[0], kept_item)
+
+    def test_refresh_emits_item_changed_only_when_files_change(self):
+        with open(os.path.join(self.data_connection.data_dir, "a.txt"), "w"):
+            pass
+        self.data_connection.refresh()
+        item_changed = MagicMock()
+        self.data_connection.item_changed.connect(item_changed)
+        self.data_connection.refresh()
+        item_changed.assert_not_called()
+        os.remove(os.path.join(self.data_connection.data_dir, "a.txt"))
+        self.data_connection.refresh()
+        item_changed.assert_called_once_with()
+
+    def test_tear_down_stops_pending_refresh(self):
+        self.data_connection._refresh_timer.start()
+        self.data_connection.tear_down()
+        self.assertFalse(self.data_connection._refresh_timer.isActive())
+
     def test_default_name_prefix(self):
         self.assertEqual(DataConnection.default_name_prefix(), "Data Connection")
 
@@ -23,6 +23,8 @@ from PySide2.QtWidgets import QApplication
 from spinetoolbox.project_item_resource import ProjectItemResource
 from spinetoolbox.project_items.exporter.exporter import Exporter
 from spinetoolbox.project_items.exporter.item_info import ItemInfo
+from spinetoolbox.project_items.exporter.records_storage import LazyRecords, records_file_path, save_records
+from spinetoolbox.project_items.exporter.settings_pack import SettingsPack
 from ...mock_helpers import clean_up_toolboxui_with_project, create_toolboxui_with_project
 
 
@@ -104,6 +106,24 @@ class TestExporter(unittest.TestCase):
         expected_data_dir = os.path.join(self.toolbox.project().items_dir, expected_short_name)
         self.assertEqual(expected_data_dir, self.exporter.data_dir)  # Check data dir
 
+    def test_rename_moves_lazy_records_along_with_data_dir(self):
+        content_hash = save_records({"domain": [("a",)]}, self.exporter.data_dir)
+        settings_pack = SettingsPack("output.gdx")
+        settings_pack.settings = MagicMock()
+        settings_pack.settings.records = LazyRecords(self.exporter.data_dir, content_hash)
+        self.exporter._settings_packs["sqlite:///database.sqlite"] = settings_pack
+        self.assertTrue(self.exporter.rename("ABC"))
+        settings_pack.load_records()
+        self.assertEqual(dict(settings_pack.settings.records), {"domain": [("a",)]})
+
+    def test_unused_records_files_are_removed_only_after_project_has_been_saved(self):
+        unused_hash = save_records({"domain": [("a",)]}, self.exporter.data_dir)
+        unused_path = records_file_path(self.exporter.data_dir, unused_hash)
+        self.exporter.item_dict()
+        self.assertTrue(os.path.exists(unused_path))
+        self.exporter.project_saved()
+        self.assertFalse(os.path.exists(unused_path))
+
     def test_activation_populates_properties_tab(self):
         self.exporter._start_worker = MagicMock()
         resources = [
@@ -0,0 +1,103 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for Exporter's records_storage module.
+"""
+from copy import deepcopy
+import gzip
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from spinetoolbox.project_items.exporter.records_storage import (
+    LazyRecords,
+    load_records,
+    records_file_path,
+    remove_unused_records_files,
+    save_records,
+)
+from spinetoolbox.spine_io.exporters.gdx import GdxExportException
+
+
+class TestRecordsStorage(unittest.TestCase):
+    def test_save_and_load_records(self):
+        records = {"domain": [("a",), ("b",)], "set": [("a", "x"), ("b", "y")]}
+        with TemporaryDirectory() as records_dir:
+            content_hash = save_records(records, records_dir)
+            self.assertTrue(os.path.exists(records_file_path(records_dir, content_hash)))
+            self.assertEqual(load_records(records_dir, content_hash), records)
+
+    def test_identical_records_get_identical_hash(self):
+        with TemporaryDirectory() as records_dir:
+            first_hash = save_records({"domain": [("a",)], "set": [("a", "x")]}, records_dir)
+            second_hash = save_records({"set": [("a", "x")], "domain": [("a",)]}, records_dir)
+            self.assertEqual(first_hash, second_hash)
+            self.assertEqual(len(os.listdir(records_dir)), 1)
+
+    def test_load_raises_when_content_does_not_match_hash(self):
+        with TemporaryDirectory() as records_dir:
+            content_hash = save_records({"domain": [("a",)]}, records_dir)
+            with gzip.open(records_file_path(records_dir, content_hash), "wb") as records_file:
+                records_file.write(b'{"domain":[["b"]]}')
+            with self.assertRaises(GdxExportException):
+                load_records(records_dir, content_hash)
+
+    def test_load_raises_when_file_is_missing(self):
+        with TemporaryDirectory() as records_dir:
+            with self.assertRaises(GdxExportException):
+                load_records(records_dir, "0123456789abcdef")
+
+    def test_lazy_records_are_loaded_on_first_access(self):
+        records = {"domain": [("a",), ("b",)]}
+        with TemporaryDirectory() as records_dir:
+            content_hash = save_records(records, records_dir)
+            lazy_records = LazyRecords(records_dir, content_hash)
+            self.assertFalse(lazy_records.is_loaded)
+            self.assertEqual(lazy_records["domain"], [("a",), ("b",)])
+            self.assertTrue(lazy_records.is_loaded)
+
+    def test_deep_copy_does_not_load_lazy_records(self):
+        with TemporaryDirectory() as records_dir:
+            content_hash = save_records({"domain": [("a",)]}, records_dir)
+            lazy_records = LazyRecords(records_dir, content_hash)
+            copied = deepcopy(lazy_records)
+            self.assertFalse(lazy_records.is_loaded)
+            self.assertFalse(copied.is_loaded)
+            self.assertEqual(dict(copied), {"domain": [("a",)]})
+
+    def test_saving_unloaded_lazy_records_does_not_touch_disk(self):
+        lazy_records = LazyRecords("non-existent directory", "0123456789abcdef")
+        self.assertEqual(save_records(lazy_records, "non-existent directory"), "0123456789abcdef")
+        self.assertFalse(lazy_records.is_loaded)
+
+    def test_saving_modified_lazy_records_writes_new_file(self):
+        with TemporaryDirectory() as records_dir:
+            content_hash = save_records({"domain": [("a",)]}, records_dir)
+            lazy_records = LazyRecords(records_dir, content_hash)
+            lazy_records["domain"] = [("b",)]
+            new_hash = save_records(lazy_records, records_dir)
+            self.assertNotEqual(new_hash, content_hash)
+            self.assertEqual(load_records(records_dir, new_hash), {"domain": [("b",)]})
+
+    def test_remove_unused_records_files(self):
+        with TemporaryDirectory() as records_dir:
+            used_hash = save_records({"domain": [("a",)]}, records_dir)
+            unused_hash = save_records({"domain": [("b",)]}, records_dir)
+            other_file = os.path.join(records_dir, "output.gdx")
+            open(other_file, "w").close()
+            remove_unused_records_files(records_dir, {used_hash})
+            self.assertTrue(os.path.exists(records_file_path(records_dir, used_hash)))
+            self.assertFalse(os.path.exists(records_file_path(records_dir, unused_hash)))
+            self.assertTrue(os.path.exists(other_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,7 @@ Unit tests for ToolExecutable item.
 :date:   2.4.2020
 """
 import pathlib
+import stat
 import sys
 from tempfile import TemporaryDirectory
 import unittest
@@ -24,6 +25,7 @@ from PySide2.QtCore import QCoreApplication
 from spine_engine import ExecutionDirection
 from spinetoolbox.project_item_resource import ProjectItemResource
 from spinetoolbox.project_items.tool.executable_item import ExecutableItem
+from spinetoolbox.project_items.tool.file_staging import stage_files
 from spinetoolbox.project_items.tool.tool_specifications import ToolSpecification, PythonTool
 
 
@@ -76,12 +78,60 @@ class TestToolExecutable(unittest.TestCase):
             executable.execute([], ExecutionDirection.FORWARD)
             while executable._tool_instance is not None:
                 QCoreApplication.processEvents()
-            archives = list(archive_dir.iterdir())
+            archives = [path for path in archive_dir.iterdir() if not path.name.startswith(".")]
             self.assertEqual(len(archives), 1)
             self.assertNotEqual(archives[0].name, "failed")
             self.assertTrue(pathlib.Path(archives[0], "out.dat").exists())
             self.assertTrue(pathlib.Path(archives[0], "subdir", "out.txt").exists())
 
+    def test_unused_archived_contents_are_removed_without_archive_limit(self):
+        with TemporaryDirectory() as temp_dir:
+            output_file = pathlib.Path(temp_dir, "out.dat")
+            output_file.write_text("output")
+            archive_dir = pathlib.Path(temp_dir, "archive")
+            result_dir = pathlib.Path(archive_dir, "2020-10-19T10.00.00")
+            result_dir.mkdir(parents=True)
+            executable = ExecutableItem("Create files", None, str(archive_dir), None, [], mock.MagicMock())
+            self.assertEqual(
+                stage_files(
+                    [(str(output_file), str(pathlib.Path(result_dir, "out.dat")))], executable._archive_store_dir()
+                ),
+                [],
+            )
+            blob_dir = pathlib.Path(executable._archive_store_dir())
+            self.assertEqual(len([path for path in blob_dir.rglob("*") if path.is_file()]), 2)
+            pathlib.Path(result_dir, "out.dat").unlink()
+            executable._prune_result_archives()
+            self.assertEqual([path.name for path in blob_dir.rglob("*") if path.is_file()], ["index.json"])
+
+    def test_input_files_are_linked_read_only_from_staging_cache(self):
+        with TemporaryDirectory() as temp_dir:
+            input_file = pathlib.Path(temp_dir, "input.dat")
+            input_file.write_text("input")
+            work_dir = pathlib.Path(temp_dir, "work")
+            execution_dir = pathlib.Path(work_dir, "run")
+            execution_dir.mkdir(parents=True)
+            executable = ExecutableItem("Tool", str(work_dir), temp_dir, None, [], mock.MagicMock())
+            self.assertTrue(executable._copy_input_files({"input.dat": str(input_file)}, str(execution_dir)))
+            staged_file = pathlib.Path(execution_dir, "input.dat")
+            self.assertEqual(staged_file.read_text(), "input")
+            self.assertEqual(staged_file.stat().st_nlink, 2)
+            self.assertEqual(staged_file.stat().st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH), 0)
+
+    def test_input_files_are_copied_when_requested(self):
+        with TemporaryDirectory() as temp_dir:
+            input_file = pathlib.Path(temp_dir, "input.dat")
+            input_file.write_text("input")
+            work_dir = pathlib.Path(temp_dir, "work")
+            execution_dir = pathlib.Path(work_dir, "run")
+            execution_dir.mkdir(parents=True)
+            executable = ExecutableItem("Tool", str(work_dir), temp_dir, None, [], mock.MagicMock(), copy_inputs=True)
+            self.assertTrue(executable._copy_input_files({"input.dat": str(input_file)}, str(execution_dir)))
+            staged_file = pathlib.Path(execution_dir, "input.dat")
+            self.assertEqual(staged_file.read_text(), "input")
+            self.assertEqual(staged_file.stat().st_nlink, 1)
+            self.assertFalse(pathlib.Path(work_dir, ".input_cache").exists())
+
     def test_find_optional_input_files_without_wildcards(self):
         with TemporaryDirectory() as temp_dir:
             optional_file = pathlib.Path(temp_dir, "1.txt")
@@ -0,0 +1,189 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for Tool's file_staging module.
+"""
+import os
+import os.path
+import stat
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+from spinetoolbox.project_items.tool.file_staging import StagingCache, remove_unused_files, stage_files
+
+
+class TestStageFiles(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self._cache_dir = os.path.join(self._temp_dir.name, "cache")
+        self._source_dir = os.path.join(self._temp_dir.name, "sources")
+        os.mkdir(self._source_dir)
+
+    def _write_source(self, file_name, content):
+        path = os.path.join(self._source_dir, file_name)
+        with open(path, "w") as source_file:
+            source_file.write(content)
+        return path
+
+    def _make_execution_dir(self, name):
+        path = os.path.join(self._temp_dir.name, name)
+        os.mkdir(path)
+        return path
+
+    @staticmethod
+    def _read(path):
+        with open(path) as file:
+            return file.read()
+
+    def test_files_are_linked_from_cache(self):
+        sources = [self._write_source(f"input_{i}.dat", f"content {i}") for i in range(5)]
+        execution_dir = self._make_execution_dir("run_1")
+        paths = [(source, os.path.join(execution_dir, os.path.basename(source))) for source in sources]
+        self.assertEqual(stage_files(paths, self._cache_dir), [])
+        for i, (source, destination) in enumerate(paths):
+            self.assertEqual(self._read(destination), f"content {i}")
+            self.assertFalse(os.path.samefile(source, destination))
+            self.assertEqual(os.stat(destination).st_nlink, 2)
+        self.assertTrue(os.path.exists(os.path.join(self._cache_dir, "index.json")))
+
+    def test_unchanged_files_are_not_read_again(self):
+        source = self._write_source("input.dat", "content")
+        first_destination = os.path.join(self._make_execution_dir("run_1"), "input.dat")
+        stage_files([(source, first_destination)], self._cache_dir)
+        cache = StagingCache(self._cache_dir)
+        second_destination = os.path.join(self._make_execution_dir("run_2"), "input.dat")
+        with mock.patch.object(cache, "_add") as add:
+            self.assertTrue(cache.stage(source, second_destination))
+            add.assert_not_called()
+        self.assertTrue(os.path.samefile(first_destination, second_destination))
+
+    def test_modified_source_file_is_staged_again(self):
+        source = self._write_source("input.dat", "content")
+        first_destination = os.path.join(self._make_execution_dir("run_1"), "input.dat")
+        stage_files([(source, first_destination)], self._cache_dir)
+        self._write_source("input.dat", "modified content")
+        os.utime(source, ns=(os.stat(source).st_atime_ns, os.stat(source).st_mtime_ns + 1000000000))
+        second_destination = os.path.join(self._make_execution_dir("run_2"), "input.dat")
+        stage_files([(source, second_destination)], self._cache_dir)
+        self.assertEqual(self._read(first_destination), "content")
+        self.assertEqual(self._read(second_destination), "modified content")
+
+    def test_cached_file_modified_through_link_is_replaced(self):
+        source = self._write_source("input.dat", "content")
+        first_destination = os.path.join(self._make_execution_dir("run_1"), "input.dat")
+        stage_files([(source, first_destination)], self._cache_dir)
+        with open(first_destination, "a") as destination_file:
+            destination_file.write(" appended by tool")
+        second_destination = os.path.join(self._make_execution_dir("run_2"), "input.dat")
+        stage_files([(source, second_destination)], self._cache_dir)
+        self.assertEqual(self._read(second_destination), "content")
+
+    def test_files_are_copied_without_cache(self):
+        source = self._write_source("input.dat", "content")
+        destination = os.path.join(self._make_execution_dir("run_1"), "input.dat")
+        self.assertEqual(stage_files([(source, destination)]), [])
+        self.assertEqual(self._read(destination), "content")
+        self.assertEqual(os.stat(destination).st_nlink, 1)
+        self.assertFalse(os.path.exists(self._cache_dir))
+
+    def test_cached_files_are_read_only(self):
+        source = self._write_source("program.py", "content")
+        destination = os.path.join(self._make_execution_dir("run_1"), "program.py")
+        stage_files([(source, destination)], self._cache_dir)
+        self.assertEqual(os.stat(destination).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH), 0)
+        self.assertTrue(os.access(source, os.W_OK))
+
+    def test_copy_without_cache_is_independent_of_source(self):
+        source = self._write_source("input.dat", "content")
+        destination = os.path.join(self._make_execution_dir("run_1"), "input.dat")
+        stage_files([(source, destination)])
+        with open(destination, "a") as destination_file:
+            destination_file.write(" appended by tool")
+        self.assertEqual(self._read(source), "content")
+
+    def test_copying_without_cache_is_fallback_when_cloning_fails(self):
+        source = self._write_source("input.dat", "content")
+        destination = os.path.join(self._make_execution_dir("run_1"), "input.dat")
+        with mock.patch("spinetoolbox.project_items.tool.file_staging.fcntl") as fcntl:
+            fcntl.ioctl.side_effect = OSError()
+            self.assertEqual(stage_files([(source, destination)]), [])
+        self.assertEqual(self._read(destination), "content")
+
+    def test_copying_is_fallback_when_linking_fails(self):
+        source = self._write_source("input.dat", "content")
+        destination = os.path.join(self._make_execution_dir("run_1"), "input.dat")
+        with mock.patch("spinetoolbox.project_items.tool.file_staging.os.link", side_effect=OSError()):
+            self.assertEqual(stage_files([(source, destination)], self._cache_dir), [])
+        self.assertEqual(self._read(destination), "content")
+        self.assertEqual(os.stat(destination).st_nlink, 1)
+
+    def test_destination_is_written_once_when_linking_fails(self):
+        source = self._write_source("output.dat", "content")
+        destination = os.path.join(self._make_execution_dir("result_1"), "output.dat")
+        with mock.patch("spinetoolbox.project_items.tool.file_staging.os.link", side_effect=OSError()), mock.patch(
+            "spinetoolbox.project_items.tool.file_staging.shutil.copyfile"
+        ) as copyfile:
+            self.assertEqual(stage_files([(source, destination)], self._cache_dir, remember_sources=False), [])
+            copyfile.assert_not_called()
+        self.assertEqual(self._read(destination), "content")
+        self.assertTrue(os.access(destination, os.W_OK))
+        cached_files = [name for _, _, names in os.walk(self._cache_dir) for name in names if name != "index.json"]
+        self.assertEqual(cached_files, [])
+
+    def test_failures_are_returned(self):
+        source = self._write_source("input.dat", "content")
+        missing_source = os.path.join(self._source_dir, "missing.dat")
+        execution_dir = self._make_execution_dir("run_1")
+        paths = [
+            (missing_source, os.path.join(execution_dir, "missing.dat")),
+            (source, os.path.join(execution_dir, "input.dat")),
+        ]
+        failures = stage_files(paths, self._cache_dir)
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0][:2], paths[0])
+        self.assertIsInstance(failures[0][2], OSError)
+        self.assertEqual(self._read(paths[1][1]), "content")
+
+    def test_identical_files_share_storage_without_remembering_sources(self):
+        first_source = self._write_source("out_1.dat", "same content")
+        second_source = self._write_source("out_2.dat", "same content")
+        first_destination = os.path.join(self._make_execution_dir("result_1"), "out.dat")
+        second_destination = os.path.join(self._make_execution_dir("result_2"), "out.dat")
+        paths = [(first_source, first_destination), (second_source, second_destination)]
+        self.assertEqual(stage_files(paths, self._cache_dir, remember_sources=False), [])
+        self.assertTrue(os.path.samefile(first_destination, second_destination))
+        cache = StagingCache(self._cache_dir)
+        cache._load_index()
+        self.assertEqual(cache._sources, {})
+        self.assertEqual(len(cache._blobs), 1)
+
+    def test_remove_unused_files(self):
+        kept_source = self._write_source("kept.dat", "kept")
+        removed_source = self._write_source("removed.dat", "removed")
+        result_dir = self._make_execution_dir("result")
+        kept_destination = os.path.join(result_dir, "kept.dat")
+        removed_destination = os.path.join(result_dir, "removed.dat")
+        stage_files([(kept_source, kept_destination), (removed_source, removed_destination)], self._cache_dir)
+        os.remove(removed_destination)
+        remove_unused_files(self._cache_dir)
+        self.assertEqual(os.stat(kept_destination).st_nlink, 2)
+        cached_files = [name for _, _, names in os.walk(self._cache_dir) for name in names if name != "index.json"]
+        self.assertEqual(len(cached_files), 1)
+        cache = StagingCache(self._cache_dir)
+        cache._load_index()
+        self.assertEqual(len(cache._blobs), 1)
+        self.assertEqual(list(cache._sources.values()), list(cache._blobs))
+
+
+if __name__ == '__main__':
+    unittest.main()
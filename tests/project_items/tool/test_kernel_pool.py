@@ -0,0 +1,156 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for Tool's kernel_pool module.
+"""
+
+import os
+import os.path
+import shutil
+import sys
+import time
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+from PySide2.QtCore import QCoreApplication, QEventLoop
+from spinetoolbox.project_items.tool.kernel_pool import KernelExecutionManager, KernelPool
+
+
+class TestKernelExecutionManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QCoreApplication.instance():
+            QCoreApplication()
+
+    def setUp(self):
+        self._pool = KernelPool()
+        self.addCleanup(self._pool.shut_down)
+        self._temp_dir = TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+
+    def _write_script(self, name, lines):
+        path = os.path.join(self._temp_dir.name, name)
+        with open(path, "w") as script:
+            script.write("\n".join(lines) + "\n")
+        return path
+
+    def _run(self, script, args=None, work_dir=None):
+        logger = mock.MagicMock()
+        manager = KernelExecutionManager(logger, self._pool, "python", sys.executable, [], script, args or [], 1)
+        exit_codes = list()
+        manager.execution_finished.connect(exit_codes.append)
+        loop = QEventLoop()
+        manager.execution_finished.connect(loop.quit)
+        manager.start_execution(workdir=work_dir or self._temp_dir.name)
+        if not exit_codes:
+            loop.exec_()
+        stdout = "\n".join(call.args[0] for call in logger.msg_proc.emit.call_args_list)
+        stderr = "\n".join(call.args[0] for call in logger.msg_proc_error.emit.call_args_list)
+        return exit_codes[0], stdout, stderr
+
+    def test_kernel_is_reused_with_fresh_namespace_and_arguments(self):
+        first = self._write_script(
+            "first.py", ["import json, os, sys", "json.warm = True", "secret = 1", "print(os.getpid(), sys.argv[1:])"]
+        )
+        second = self._write_script(
+            "second.py",
+            [
+                "import json, os, sys",
+                "print(os.getpid(), sys.argv[1:])",
+                "print(getattr(json, 'warm', False), 'secret' in globals(), os.getcwd())",
+            ],
+        )
+        other_dir = os.path.join(self._temp_dir.name, "other")
+        os.mkdir(other_dir)
+        exit_code, first_output, _ = self._run(first, ["a", "b"])
+        self.assertEqual(exit_code, 0)
+        first_pid, first_args = first_output.split(" ", 1)
+        self.assertEqual(first_args, "['a', 'b']")
+        exit_code, second_output, _ = self._run(second, ["c"], other_dir)
+        self.assertEqual(exit_code, 0)
+        pid_line, state_line = second_output.splitlines()
+        self.assertEqual(pid_line, f"{first_pid} ['c']")
+        self.assertEqual(state_line, f"True False {os.path.realpath(other_dir)}")
+
+    def test_exit_code_and_errors_are_reported(self):
+        script = self._write_script("fail.py", ["import sys", "print('oops', file=sys.stderr)", "sys.exit(3)"])
+        exit_code, _, stderr = self._run(script)
+        self.assertEqual(exit_code, 3)
+        self.assertEqual(stderr, "oops")
+        script = self._write_script("raise.py", ["raise ValueError('broken')"])
+        exit_code, _, stderr = self._run(script)
+        self.assertEqual(exit_code, 1)
+        self.assertIn("ValueError: broken", stderr)
+
+    def test_dead_kernel_is_not_reused(self):
+        script = self._write_script("die.py", ["import os", "os._exit(5)"])
+        exit_code, _, _ = self._run(script)
+        self.assertEqual(exit_code, 5)
+        script = self._write_script("ok.py", ["print('alive')"])
+        exit_code, stdout, _ = self._run(script)
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, "alive")
+
+    def test_kernel_that_exits_with_zero_succeeds(self):
+        script = self._write_script("exit.py", ["import os", "print('done', flush=True)", "os._exit(0)"])
+        exit_code, stdout, _ = self._run(script)
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, "done")
+
+    def test_kernel_that_closes_its_streams_without_exiting_is_killed_after_deadline(self):
+        script = self._write_script("hang.py", ["import os, time", "os.close(1)", "os.close(2)", "time.sleep(60)"])
+        poll_durations = list()
+        poll = KernelExecutionManager._poll
+
+        def timed_poll(manager):
+            start = time.monotonic()
+            poll(manager)
+            poll_durations.append(time.monotonic() - start)
+
+        with mock.patch("spinetoolbox.project_items.tool.kernel_pool._EXIT_TIMEOUT", 0.5), mock.patch.object(
+            KernelExecutionManager, "_poll", timed_poll
+        ):
+            exit_code, _, _ = self._run(script)
+        self.assertEqual(exit_code, -1)
+        self.assertLess(max(poll_durations), 0.25)
+
+    def test_killed_kernel_is_reaped(self):
+        kernel = self._pool.acquire("python", sys.executable, [])
+        kernel.kill()
+        self.assertIsNotNone(kernel._process.returncode)
+
+    def test_modules_next_to_work_directory_are_kept(self):
+        sibling_dir = self._temp_dir.name + "_sibling"
+        os.mkdir(sibling_dir)
+        self.addCleanup(shutil.rmtree, sibling_dir)
+        with open(os.path.join(sibling_dir, "sibling_module.py"), "w") as module_file:
+            module_file.write("LOADS = []\n")
+        first = self._write_script(
+            "first.py",
+            [
+                "import sys",
+                f"sys.path.append({sibling_dir!r})",
+                "import sibling_module",
+                "sibling_module.LOADS.append(1)",
+            ],
+        )
+        second = self._write_script(
+            "second.py", ["import sys", "module = sys.modules.get('sibling_module')", "print(module and module.LOADS)"]
+        )
+        self.assertEqual(self._run(first)[0], 0)
+        exit_code, stdout, _ = self._run(second)
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, "[1]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for Tool project item's utils module.
+"""
+
+import fnmatch
+import os
+import os.path
+import pathlib
+import stat
+from tempfile import TemporaryDirectory
+import unittest
+from spinetoolbox.project_item_resource import ProjectItemResource
+from spinetoolbox.project_items.tool.utils import (
+    FilePathIndex,
+    file_path_index,
+    find_last_output_files,
+    prune_result_archives,
+)
+
+
+class TestFilePathIndex(unittest.TestCase):
+    def setUp(self):
+        root = os.path.abspath(os.sep)
+        self._paths = [
+            os.path.join(root, "data", "input.csv"),
+            os.path.join(root, "data", "input.dat"),
+            os.path.join(root, "data", "archive.tar.gz"),
+            os.path.join(root, "other", "input.csv"),
+            os.path.join(root, "other", "README"),
+            os.path.join(root, "x.y", "no_extension"),
+        ]
+        self._index = FilePathIndex(self._paths)
+
+    def test_find_file(self):
+        self.assertEqual(self._index.find_file("input.csv"), [self._paths[0], self._paths[3]])
+        self.assertEqual(self._index.find_file("README"), [self._paths[4]])
+        self.assertIsNone(self._index.find_file("missing.csv"))
+
+    def test_match_agrees_with_fnmatch(self):
+        patterns = ["*.csv", "input.*", "*.gz", "*.tar.gz", "input.csv", "README", "*", "?nput.d?t", "*.[cd]*", "*y*"]
+        for pattern in patterns:
+            with self.subTest(pattern=pattern):
+                expected = fnmatch.filter(self._paths, os.path.join("*", pattern))
+                self.assertEqual(self._index.match(pattern), expected)
+
+
+class TestFilePathIndexCache(unittest.TestCase):
+    def test_index_is_shared_for_same_file_resources(self):
+        with TemporaryDirectory() as temp_dir:
+            path = pathlib.Path(temp_dir, "input.csv")
+            path.touch()
+            resources = [ProjectItemResource(None, "file", path.as_uri())]
+            index = file_path_index(resources)
+            self.assertIs(file_path_index(list(resources)), index)
+            self.assertEqual(index.find_file("input.csv"), [str(path)])
+            other_path = pathlib.Path(temp_dir, "other.csv")
+            other_path.touch()
+            resources.append(ProjectItemResource(None, "file", other_path.as_uri()))
+            self.assertIsNot(file_path_index(resources), index)
+
+    def test_created_and_deleted_files_are_noticed(self):
+        with TemporaryDirectory() as temp_dir:
+            path = pathlib.Path(temp_dir, "input.csv")
+            resources = [ProjectItemResource(None, "file", path.as_uri())]
+            self.assertIsNone(file_path_index(resources).find_file("input.csv"))
+            path.touch()
+            self.assertEqual(file_path_index(resources).find_file("input.csv"), [str(path)])
+            path.unlink()
+            self.assertIsNone(file_path_index(resources).find_file("input.csv"))
+
+    def test_transient_file_is_noticed_when_it_appears(self):
+        with TemporaryDirectory() as temp_dir:
+            path = pathlib.Path(temp_dir, "output.csv")
+            resources = [ProjectItemResource(None, "transient_file", path.as_uri(), {"label": "output.csv"})]
+            self.assertIsNone(file_path_index(resources).find_file("output.csv"))
+            path.touch()
+            self.assertEqual(file_path_index(resources).find_file("output.csv"), [str(path)])
+
+
+class TestPruneResultArchives(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+
+    def _make_dirs(self, names):
+        for name in names:
+            os.mkdir(os.path.join(self._temp_dir.name, name))
+
+    def test_oldest_archives_are_removed(self):
+        self._make_dirs(["2020-10-19T10.00.00", "2020-10-19T12.00.00", "2020-10-19T11.00.00", "failed", ".blobs"])
+        self.assertEqual(prune_result_archives(self._temp_dir.name, 2), [])
+        self.assertEqual(
+            sorted(os.listdir(self._temp_dir.name)), [".blobs", "2020-10-19T11.00.00", "2020-10-19T12.00.00", "failed"]
+        )
+
+    def test_archives_with_read_only_files_are_removed(self):
+        self._make_dirs(["2020-10-19T10.00.00", "2020-10-19T11.00.00"])
+        archived_file = os.path.join(self._temp_dir.name, "2020-10-19T10.00.00", "out.dat")
+        open(archived_file, "w").close()
+        os.chmod(archived_file, stat.S_IREAD)
+        self.assertEqual(prune_result_archives(self._temp_dir.name, 1), [])
+        self.assertEqual(os.listdir(self._temp_dir.name), ["2020-10-19T11.00.00"])
+
+    def test_zero_keeps_everything(self):
+        self._make_dirs(["2020-10-19T10.00.00", "2020-10-19T11.00.00"])
+        self.assertEqual(prune_result_archives(self._temp_dir.name, 0), [])
+        self.assertEqual(len(os.listdir(self._temp_dir.name)), 2)
+
+    def test_find_last_output_files_skips_hidden_directories(self):
+        self._make_dirs(["2020-10-19T10.00.00", ".blobs"])
+        open(os.path.join(self._temp_dir.name, ".blobs", "out.dat"), "w").close()
+        open(os.path.join(self._temp_dir.name, "2020-10-19T10.00.00", "out.dat"), "w").close()
+        files = find_last_output_files(["out.dat"], self._temp_dir.name)
+        self.assertEqual(
+            [file.path for file in files["out.dat"]],
+            [os.path.join(self._temp_dir.name, "2020-10-19T10.00.00", "out.dat")],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -29,7 +29,7 @@ from spinedb_api import (
     TimeSeriesVariableResolution,
     to_database,
 )
-from spinetoolbox.spine_io.exporters.excel import export_spine_database_to_xlsx
+from spinetoolbox.spine_io.exporters.excel import export_spine_database_to_xlsx, stream_spine_database_to_xlsx
 from spinetoolbox.spine_io.importers.excel_reader import ExcelConnector
 
 _TEMP_EXCEL_FILENAME = 'excel.xlsx'
@@ -280,6 +280,20 @@ class TestExcelIntegration(unittest.TestCase):
                 db_map.connection.close()
                 empty_db_map.connection.close()
 
+    def test_streaming_export_import(self):
+        """Integration test exporting an excel using write-only workbook and then importing it to a new database."""
+        with TemporaryDirectory() as directory:
+            db_map, empty_db_map = self._create_database(directory)
+            try:
+                excel_file_name = str(PurePath(directory, _TEMP_EXCEL_FILENAME))
+                stream_spine_database_to_xlsx(db_map, excel_file_name)
+                import_num = self._import_xlsx_to_database(excel_file_name, empty_db_map)
+                self.assertEqual(import_num, 32)
+                self._compare_dbs(empty_db_map, db_map)
+            finally:
+                db_map.connection.close()
+                empty_db_map.connection.close()
+
     def test_import_to_existing_data(self):
         """Integration test importing data to a database with existing items"""
         with TemporaryDirectory() as directory:
@@ -72,6 +72,13 @@ class TestMappingPreviewModel(unittest.TestCase):
         model.set_mapping(mapping)
         self.assertEqual(model.data(model.index(*error_index)), "Not a valid number")
 
+    def test_column_type_checking_produces_error_for_each_repeated_invalid_value(self):
+        model = MappingPreviewModel()
+        model.reset_model([["Not a valid number"], ["1"], ["Not a valid number"], [""]])
+        model.set_type(0, value_to_convert_spec('float'))
+        self.assertEqual(set(model._column_type_errors), {(0, 0), (2, 0)})
+        self.assertEqual(model._row_type_errors, {})
+
     def test_row_type_checking_produces_error(self):
         model = MappingPreviewModel()
         model.reset_model([["1", "2.4"], ["Not a valid number", "3"]])
@@ -154,6 +161,21 @@ class TestMappingPreviewModel(unittest.TestCase):
         self.assertEqual(model.data(model.index(1, 0), role=Qt.BackgroundColorRole), _MAPPING_COLORS["entity class"])
         self.assertEqual(model.data(model.index(1, 1), role=Qt.BackgroundColorRole), None)
 
+    def test_colors_update_when_header_changes(self):
+        model = MappingPreviewModel()
+        model.reset_model([[1, 2], [3, 4]])
+        model.set_horizontal_header_labels(["a", "b"])
+        mapping = MappingSpecModel(
+            dict_to_map({"map_type": "ObjectClass", "name": {"map_type": "column", "value_reference": "b"}}),
+            "connector's name",
+        )
+        model.set_mapping(mapping)
+        self.assertEqual(model.data(model.index(0, 0), role=Qt.BackgroundColorRole), None)
+        self.assertEqual(model.data(model.index(0, 1), role=Qt.BackgroundColorRole), _MAPPING_COLORS["entity class"])
+        model.set_horizontal_header_labels(["b", "a"])
+        self.assertEqual(model.data(model.index(0, 0), role=Qt.BackgroundColorRole), _MAPPING_COLORS["entity class"])
+        self.assertEqual(model.data(model.index(0, 1), role=Qt.BackgroundColorRole), None)
+
 
 class TestMappingSpecModel(unittest.TestCase):
     def test_data_when_mapping_object_class_without_objects_or_parameters(self):
@@ -0,0 +1,67 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the QProcessExecutionManager class.
+"""
+
+import os.path
+import sys
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+from PySide2.QtCore import QCoreApplication, QEventLoop
+from spinetoolbox.execution_managers import QProcessExecutionManager
+
+
+class TestQProcessExecutionManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QCoreApplication.instance():
+            QCoreApplication()
+
+    def _run(self, script, log_file=None):
+        logger = mock.MagicMock()
+        manager = QProcessExecutionManager(logger, sys.executable, ["-c", script], semisilent=True, log_file=log_file)
+        loop = QEventLoop()
+        manager.execution_finished.connect(loop.quit)
+        manager.start_execution()
+        loop.exec_()
+        return logger
+
+    def test_output_is_sent_to_process_log_in_batches(self):
+        logger = self._run("import sys\nfor i in range(1000): print(i)\nprint('error', file=sys.stderr)")
+        messages = [call.args[0] for call in logger.msg_proc.emit.call_args_list]
+        self.assertLess(len(messages), 1000)
+        self.assertEqual("\n".join(messages).split(), [str(i) for i in range(1000)])
+        logger.msg_proc_error.emit.assert_called_once_with("error")
+
+    def test_complete_output_is_written_to_log_file(self):
+        with TemporaryDirectory() as temp_dir:
+            log_file = os.path.join(temp_dir, "output.log")
+            self._run("for i in range(1000): print(i)", log_file)
+            with open(log_file, encoding="utf-8") as log:
+                self.assertEqual(log.read().split(), [str(i) for i in range(1000)])
+
+    def test_multibyte_characters_split_between_chunks_are_decoded(self):
+        logger = mock.MagicMock()
+        manager = QProcessExecutionManager(logger)
+        manager._process = mock.MagicMock()
+        encoded = "äö".encode("utf-8")
+        manager._process.readAllStandardOutput.return_value.data.side_effect = [encoded[:1], encoded[1:]]
+        manager.on_ready_stdout()
+        manager.on_ready_stdout()
+        manager._output.flush()
+        logger.msg_proc.emit.assert_called_once_with("äö")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the spine_db_commands module.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from PySide2.QtWidgets import QApplication
+from spinetoolbox.spine_db_commands import (
+    AgedUndoCommand,
+    AgedUndoStack,
+    PayloadAttribute,
+    RemoveItemsCommand,
+    _PackedPayload,
+)
+
+
+class _DBMap:
+    """A stand-in for a database mapping which cannot be pickled."""
+
+    codename = "test_db"
+
+    def __reduce__(self):
+        raise TypeError("database mappings cannot be pickled")
+
+
+class _ItemsCommand(AgedUndoCommand):
+    redo_db_map_data = PayloadAttribute()
+
+    def __init__(self, db_map, item_count, parent=None):
+        super().__init__(parent=parent)
+        self.redo_db_map_data = {db_map: [{"id": i, "value": f"[{i}, 2.3, 5.5, -1.0]"} for i in range(item_count)]}
+
+    def redo(self):
+        pass
+
+    def undo(self):
+        pass
+
+
+class _MergingItemsCommand(_ItemsCommand):
+    def id(self):
+        return 1
+
+    def mergeWith(self, other):
+        data = self.redo_db_map_data
+        for db_map, items in other.redo_db_map_data.items():
+            data[db_map] = data[db_map] + items
+        self.redo_db_map_data = data
+        return True
+
+
+def _is_packed(command, name):
+    return isinstance(command.__dict__["_payload_" + name], _PackedPayload)
+
+
+class TestAgedUndoStack(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._db_map = _DBMap()
+
+    def _make_stack(self, memory_budget):
+        stack = AgedUndoStack(memory_budget=memory_budget)
+        self.addCleanup(stack.clear)
+        return stack
+
+    def test_payloads_survive_packing(self):
+        stack = self._make_stack(memory_budget=10 * 1024 * 1024)
+        small = _ItemsCommand(self._db_map, 2)
+        large = _ItemsCommand(self._db_map, 10000)
+        stack.push(small)
+        stack.push(large)
+        stack.pack_payloads()
+        self.assertGreater(stack.memory_usage(), 0)
+        self.assertEqual(small.redo_db_map_data[self._db_map][1]["id"], 1)
+        data = large.redo_db_map_data
+        self.assertIs(next(iter(data)), self._db_map)
+        self.assertEqual(data[self._db_map][9999], {"id": 9999, "value": "[9999, 2.3, 5.5, -1.0]"})
+
+    def test_oldest_payloads_are_spilled_when_over_budget(self):
+        stack = self._make_stack(memory_budget=1)
+        commands = [_ItemsCommand(self._db_map, 10) for _ in range(3)]
+        for command in commands:
+            stack.push(command)
+        stack.pack_payloads()
+        self.assertEqual(stack.memory_usage(), 0)
+        for command in commands:
+            self.assertEqual(len(command.redo_db_map_data[self._db_map]), 10)
+
+    def test_child_commands_of_macros_are_packed(self):
+        stack = self._make_stack(memory_budget=1)
+        macro = AgedUndoCommand()
+        stack.push(macro)
+        child = _ItemsCommand(self._db_map, 10, parent=macro)
+        stack.pack_payloads()
+        self.assertEqual(stack.memory_usage(), 0)
+        self.assertEqual(len(child.redo_db_map_data[self._db_map]), 10)
+
+    def test_command_merged_by_stack_is_packed_again(self):
+        stack = self._make_stack(memory_budget=10 * 1024 * 1024)
+        command = _MergingItemsCommand(self._db_map, 10)
+        stack.push(command)
+        stack.pack_payloads()
+        stack.push(_MergingItemsCommand(self._db_map, 10))
+        self.assertEqual(stack.count(), 1)
+        self.assertFalse(_is_packed(command, "redo_db_map_data"))
+        stack.pack_payloads()
+        self.assertTrue(_is_packed(command, "redo_db_map_data"))
+        self.assertEqual(len(command.redo_db_map_data[self._db_map]), 20)
+
+    def test_repacking_child_merged_outside_stack(self):
+        stack = self._make_stack(memory_budget=1)
+        macro = AgedUndoCommand()
+        stack.push(macro)
+        child = _ItemsCommand(self._db_map, 10, parent=macro)
+        stack.pack_payloads()
+        child.redo_db_map_data = _ItemsCommand(self._db_map, 20).redo_db_map_data
+        stack.repack(child)
+        stack.pack_payloads()
+        self.assertTrue(_is_packed(child, "redo_db_map_data"))
+        self.assertEqual(stack.memory_usage(), 0)
+        self.assertEqual(len(child.redo_db_map_data[self._db_map]), 20)
+
+
+class TestRemoveItemsCommand(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def test_undo_unpacks_payload_once(self):
+        db_mngr = MagicMock()
+        db_mngr.signaller.db_map_listeners.return_value = []
+        db_map = _DBMap()
+        command = RemoveItemsCommand(db_mngr, db_map, {})
+        command.undo_typed_db_map_data = {
+            "object class": {db_map: [{"id": 1, "name": "fish"}]},
+            "object": {db_map: [{"id": i, "class_id": 1, "name": f"nemo_{i}"} for i in range(1000)]},
+        }
+        RemoveItemsCommand.undo_typed_db_map_data.pack(command)
+        with patch.object(_PackedPayload, "get", autospec=True, side_effect=_PackedPayload.get) as get:
+            command.undo()
+        get.assert_called_once()
+        self.assertEqual(db_mngr.add_or_update_items.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
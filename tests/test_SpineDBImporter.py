@@ -0,0 +1,135 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the spine_db_importer module.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from PySide2.QtWidgets import QApplication, QUndoCommand
+from spinetoolbox.spine_db_commands import AgedUndoStack
+from spinetoolbox.spine_db_importer import SpineDBImporter
+from spinetoolbox.spine_db_manager import SpineDBManager
+
+
+def _get_data_for_import(db_map, objects=()):
+    """Pretends that all objects are new."""
+    yield "object", ([{"class_id": 1, "name": name} for name in objects], [], [])
+
+
+class _UnrelatedCommand(QUndoCommand):
+    def __init__(self):
+        super().__init__("unrelated")
+        self.undone = False
+
+    def redo(self):
+        pass
+
+    def undo(self):
+        self.undone = True
+
+
+class TestSpineDBImporter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._db_mngr = SpineDBManager(None, None, None)
+        self._db_map = MagicMock()
+        self._db_map.codename = "test_db"
+        self._undo_stack = self._db_mngr.undo_stack[self._db_map] = AgedUndoStack()
+        self.addCleanup(self._undo_stack.clear)
+        self._next_id = 1
+        self._add_calls = 0
+        patcher = patch.object(self._db_mngr, "add_or_update_items", side_effect=self._add_or_update_items)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("spinetoolbox.spine_db_importer.get_data_for_import", side_effect=_get_data_for_import)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _add_or_update_items(self, db_map_data, method_name, get_method_name, signal_name):
+        self._add_calls += 1
+        added = {}
+        for db_map, items in db_map_data.items():
+            for item in items:
+                added.setdefault(db_map, []).append(dict(item, id=self._next_id))
+                self._next_id += 1
+        getattr(self._db_mngr, signal_name).emit(added)
+
+    def test_batches_end_up_in_single_compact_macro(self):
+        names = [f"object_{i}" for i in range(25)]
+        importer = SpineDBImporter(self._db_mngr, {self._db_map: {"objects": names}}, "Import data", batch_size=10)
+        finished = MagicMock()
+        importer.finished.connect(finished)
+        importer.run()
+        finished.assert_called_once_with({self._db_map: []})
+        self.assertEqual(self._add_calls, 3)
+        self.assertEqual(self._undo_stack.count(), 1)
+        macro = self._undo_stack.command(0)
+        self.assertEqual(macro.text(), "Import data")
+        self.assertEqual(macro.childCount(), 1)
+        added = macro.child(0).undo_db_map_data[self._db_map]["object"]
+        self.assertEqual([item["name"] for item in added], names)
+        self.assertEqual([item["id"] for item in added], list(range(1, 26)))
+
+    def test_background_import_reports_progress(self):
+        names = [f"object_{i}" for i in range(25)]
+        importer = SpineDBImporter(self._db_mngr, {self._db_map: {"objects": names}}, "Import data", batch_size=10)
+        progress = []
+        importer.progressed.connect(progress.append)
+        finished = MagicMock()
+        importer.finished.connect(finished)
+        importer.start()
+        while not finished.called:
+            QApplication.processEvents()
+        self.assertEqual(progress, [10, 20, 25])
+        self.assertEqual(self._undo_stack.count(), 1)
+
+    def test_cancelled_import_keeps_imported_batches(self):
+        names = [f"object_{i}" for i in range(25)]
+        importer = SpineDBImporter(self._db_mngr, {self._db_map: {"objects": names}}, "Import data", batch_size=10)
+        importer.progressed.connect(lambda _: importer.cancel())
+        finished = MagicMock()
+        importer.finished.connect(finished)
+        importer.start()
+        while not finished.called:
+            QApplication.processEvents()
+        self.assertEqual(self._add_calls, 1)
+        self.assertEqual(len(self._db_mngr.get_items(self._db_map, "object")), 10)
+
+
+    def test_empty_import_is_removed_from_undo_stack(self):
+        importer = SpineDBImporter(self._db_mngr, {self._db_map: {"objects": ["existing"]}}, "Import data")
+        with patch("spinetoolbox.spine_db_importer.get_data_for_import", return_value=[("object", ([], [], []))]):
+            importer.run()
+        self.assertEqual(self._undo_stack.count(), 0)
+
+    def test_empty_import_does_not_undo_commands_pushed_meanwhile(self):
+        importer = SpineDBImporter(self._db_mngr, {self._db_map: {"objects": ["existing"]}}, "Import data")
+        unrelated_command = _UnrelatedCommand()
+        importer.progressed.connect(lambda _: self._undo_stack.push(unrelated_command))
+        finished = MagicMock()
+        importer.finished.connect(finished)
+        with patch("spinetoolbox.spine_db_importer.get_data_for_import", return_value=[("object", ([], [], []))]):
+            importer.start()
+            while not finished.called:
+                QApplication.processEvents()
+        self.assertFalse(unrelated_command.undone)
+        self.assertIs(self._undo_stack.command(self._undo_stack.index() - 1), unrelated_command)
+        self.assertTrue(self._undo_stack.command(0).isObsolete())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,7 +17,7 @@ Unit tests for the spine_db_manager module.
 """
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock, patch
 from PySide2.QtCore import Qt
 from PySide2.QtWidgets import QApplication
 from spinedb_api import (
@@ -165,5 +165,62 @@ class TestParameterValueFormatting(unittest.TestCase):
         self.assertTrue(formatted.startswith('Could not decode the value'))
 
 
+class TestDeltaRefresh(unittest.TestCase):
+    """Tests for refreshing SpineDBManager's cache."""
+
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self.db_mngr = SpineDBManager(None, None, None)
+        self.db_map = MagicMock()
+        self.db_mngr.cache_items("object class", {self.db_map: [{"id": 1, "name": "unit"}, {"id": 2, "name": "node"}]})
+        self.db_mngr.cache_items("object", {self.db_map: [{"id": 1, "class_id": 1, "name": "gas_plant"}]})
+        for getter_name in (
+            "get_relationship_classes",
+            "get_parameter_value_lists",
+            "get_parameter_tags",
+            "get_parameter_definitions",
+            "get_relationships",
+            "get_parameter_values",
+        ):
+            setattr(self.db_mngr, getter_name, Mock(return_value=[]))
+
+    def test_refresh_emits_only_differences(self):
+        self.db_mngr.get_object_classes = Mock(return_value=[{"id": 1, "name": "unit"}, {"id": 3, "name": "line"}])
+        self.db_mngr.get_objects = Mock(return_value=[{"id": 1, "class_id": 1, "name": "coal_plant"}])
+        object_classes_added = Mock()
+        object_classes_removed = Mock()
+        object_classes_updated = Mock()
+        objects_updated = Mock()
+        self.db_mngr.object_classes_added.connect(object_classes_added)
+        self.db_mngr.object_classes_removed.connect(object_classes_removed)
+        self.db_mngr.object_classes_updated.connect(object_classes_updated)
+        self.db_mngr.objects_updated.connect(objects_updated)
+        with patch.object(self.db_mngr, "_last_commit_id", return_value=None), patch.object(
+            self.db_mngr, "update_icons"
+        ):
+            self.assertEqual(self.db_mngr.refresh_cache(self.db_map), {self.db_map})
+        object_classes_added.assert_called_once_with({self.db_map: [{"id": 3, "name": "line"}]})
+        object_classes_removed.assert_called_once_with({self.db_map: [{"id": 2, "name": "node"}]})
+        object_classes_updated.assert_not_called()
+        objects_updated.assert_called_once_with({self.db_map: [{"id": 1, "class_id": 1, "name": "coal_plant"}]})
+        self.assertEqual(self.db_mngr.get_item(self.db_map, "object", 1)["name"], "coal_plant")
+        self.assertEqual(self.db_mngr.get_item(self.db_map, "object class", 2), {})
+
+    def test_refresh_is_skipped_when_there_are_no_new_commits(self):
+        self.db_mngr.get_object_classes = Mock(return_value=[])
+        self.db_mngr.get_objects = Mock(return_value=[])
+        with patch.object(self.db_mngr, "_last_commit_id", return_value=5):
+            self.assertEqual(self.db_mngr.refresh_cache(self.db_map), {self.db_map})
+            self.db_mngr.get_object_classes.reset_mock()
+            self.assertEqual(self.db_mngr.refresh_cache(self.db_map), set())
+            self.db_mngr.get_object_classes.assert_not_called()
+            self.assertEqual(self.db_mngr.refresh_cache(self.db_map, force=True), {self.db_map})
+            self.db_mngr.get_object_classes.assert_called_once_with(self.db_map)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,155 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the datapackage_import_export module.
+"""
+
+from types import SimpleNamespace
+import unittest
+from unittest.mock import MagicMock, patch
+from spinetoolbox.datapackage_import_export import DatapackageToSpineConverter
+
+
+class _DatabaseMapping:
+    """A minimal in-memory stand-in for DiffDatabaseMapping."""
+
+    def __init__(self):
+        self.items = {
+            "object_class": [],
+            "relationship_class": [],
+            "parameter_definition": [],
+            "object": [],
+            "parameter_value": [],
+            "relationship": [],
+        }
+        self.batches = {item_type: [] for item_type in self.items}
+
+    def _add(self, item_type, items):
+        self.batches[item_type].append(len(items))
+        for item in items:
+            self.items[item_type].append(SimpleNamespace(id=len(self.items[item_type]) + 1, **item))
+
+    def add_object_classes(self, *items):
+        self._add("object_class", items)
+
+    def add_wide_relationship_classes(self, *items):
+        self._add("relationship_class", items)
+
+    def add_parameter_definitions(self, *items):
+        self._add("parameter_definition", items)
+
+    def add_objects(self, *items):
+        self._add("object", items)
+
+    def add_parameter_values(self, *items):
+        self._add("parameter_value", items)
+
+    def add_wide_relationships(self, *items):
+        self._add("relationship", items)
+
+    def object_class_list(self):
+        return self.items["object_class"]
+
+    def wide_relationship_class_list(self):
+        return self.items["relationship_class"]
+
+    def parameter_definition_list(self):
+        return self.items["parameter_definition"]
+
+    def object_list(self):
+        return self.items["object"]
+
+    def commit_session(self, message):
+        pass
+
+
+def _resource(name, field_names, primary_key, foreign_keys, rows):
+    schema = SimpleNamespace(
+        field_names=field_names, fields=field_names, primary_key=primary_key, foreign_keys=foreign_keys
+    )
+    return SimpleNamespace(name=name, schema=schema, read=MagicMock(return_value=rows))
+
+
+class TestDatapackageToSpineConverter(unittest.TestCase):
+    def setUp(self):
+        unit = _resource("unit", ["name", "capacity"], ["name"], [], [["a", "1"], ["b", "2"], ["c", "3"]])
+        connection = _resource(
+            "connection",
+            ["id", "from", "flow"],
+            ["id"],
+            [{"fields": ["from"], "reference": {"resource": "unit", "fields": ["name"]}}],
+            [["x", "a", "5"], ["y", "c", "6"], ["z", "missing", "7"]],
+        )
+        resources = {resource.name: resource for resource in (unit, connection)}
+        package = SimpleNamespace(resources=list(resources.values()), get_resource=resources.get)
+        self._db_map = _DatabaseMapping()
+        with patch("spinetoolbox.datapackage_import_export.create_new_spine_database"), patch(
+            "spinetoolbox.datapackage_import_export.DiffDatabaseMapping"
+        ) as mapping_constructor, patch("spinetoolbox.datapackage_import_export.Package") as package_constructor:
+            mapping_constructor.return_value = self._db_map
+            package_constructor.return_value = package
+            self._converter = DatapackageToSpineConverter("sqlite://", {}, "")
+        self._progress = list()
+        self._converter.signaler.progressed.connect(lambda step, message: self._progress.append((step, message)))
+
+    def _run(self):
+        step_count = self._converter.number_of_steps()
+        with patch("spinetoolbox.datapackage_import_export._BATCH_SIZE", 2):
+            self._converter._run()
+        return step_count
+
+    def test_foreign_key_fields_are_not_parameters(self):
+        self._run()
+        parameter_names = [x.name for x in self._db_map.items["parameter_definition"]]
+        self.assertEqual(parameter_names, ["unit_capacity", "connection_flow"])
+        values = [(x.object_id, x.parameter_id, x.value) for x in self._db_map.items["parameter_value"]]
+        self.assertEqual(values, [(1, 1, "1"), (2, 1, "2"), (3, 1, "3"), (4, 2, "5"), (5, 2, "6"), (6, 2, "7")])
+
+    def test_relationships_resolve_referenced_objects(self):
+        self._run()
+        object_names = [x.name for x in self._db_map.items["object"]]
+        self.assertEqual(object_names, ["unit_a", "unit_b", "unit_c", "connection_x", "connection_y", "connection_z"])
+        relationships = [(x.name, x.object_id_list) for x in self._db_map.items["relationship"]]
+        self.assertEqual(
+            relationships,
+            [("connection__unit_connection_x__unit_a", [4, 1]), ("connection__unit_connection_y__unit_c", [5, 3])],
+        )
+
+    def test_items_are_added_in_batches(self):
+        self._run()
+        self.assertEqual(self._db_map.batches["object"], [2, 2, 2])
+        self.assertEqual(self._db_map.batches["parameter_value"], [2, 2, 2])
+        self.assertEqual(self._db_map.batches["relationship"], [2])
+
+    def test_progress_keeps_phase_message_between_batches(self):
+        step_count = self._run()
+        steps = [step for step, _ in self._progress]
+        self.assertEqual(steps, sorted(steps))
+        self.assertEqual(self._progress[-1], (step_count, ""))
+        messages = [message for _, message in self._progress[1:-1]]
+        self.assertNotIn("", messages)
+        phases = [message for i, message in enumerate(messages) if i == 0 or message != messages[i - 1]]
+        self.assertEqual(
+            phases,
+            [
+                "Adding object classes...",
+                "Adding relationship classes...",
+                "Adding parameters...",
+                "Adding objects...",
+                "Adding parameter values...",
+                "Adding relationships...",
+            ],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,8 @@ Unit tests for the :module:`spinetoolbox.load_project_items` module.
 :author: A. Soininen (VTT)
 :date:   8.5.2020
 """
+import subprocess
+import sys
 import unittest
 from unittest.mock import MagicMock
 from PySide2.QtWidgets import QApplication
@@ -73,6 +75,19 @@ class MyTestCase(unittest.TestCase):
         for item_class in item_classes.values():
             self.assertTrue(issubclass(item_class, ExecutableItemBase))
 
+    def test_headless_startup_does_not_import_gui_modules(self):
+        script = (
+            "import sys\n"
+            "from spinetoolbox.headless import headless_main\n"
+            "from spinetoolbox.load_project_items import load_executable_items, load_item_specification_factories\n"
+            "load_executable_items()\n"
+            "load_item_specification_factories()\n"
+            "gui_modules = ('matplotlib', 'qtconsole', 'spinetoolbox.ui_main', 'spinetoolbox.data_store_form')\n"
+            "print(sorted(m for m in sys.modules if m.split('.')[0] in gui_modules or m.startswith(gui_modules)))\n"
+        )
+        completed = subprocess.run([sys.executable, "-c", script], stdout=subprocess.PIPE, check=True)
+        self.assertEqual(completed.stdout.decode().strip(), "[]")
+
 
 if __name__ == '__main__':
     unittest.main()
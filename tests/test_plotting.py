@@ -47,7 +47,11 @@ def _make_pivot_proxy_model():
     with patch.object(DataStoreForm, "restore_ui"), patch.object(DataStoreForm, "show"):
         data_store_widget = DataStoreForm(db_mngr, mock_db_map)
     data_store_widget.create_header_widget = lambda *args, **kwargs: None
-    data_store_widget.load_parameter_value_data = lambda: {
+    data_store_widget.load_parameter_value_factors = lambda: [
+        [('1',), ('2',), ('3',)],
+        [('int_col',), ('float_col',), ('time_series_col',)],
+    ]
+    data_store_widget.load_full_parameter_value_data = lambda: {
         ('1', 'int_col'): '-3',
         ('2', 'int_col'): '-1',
         ('3', 'int_col'): '2',
@@ -218,6 +218,57 @@ class TestSpineToolboxProject(unittest.TestCase):
         self.assertTrue(data_connection_executable.execute_forward_called)
         self.assertFalse(view_executable.execute_forward_called)
 
+    def test_dag_change_notifications_are_batched(self):
+        project = self.toolbox.project()
+        data_store, _ = self._make_item(self.add_ds)
+        view, _ = self._make_item(self.add_view)
+        project.dag_handler.add_graph_edge(data_store.name, view.name)
+        project._notify_pending_dag_changes()
+        data_store.handle_dag_changed = mock.MagicMock()
+        data_store.resources_for_direct_successors = mock.MagicMock(return_value=[])
+        view.handle_dag_changed = mock.MagicMock()
+        for _ in range(3):
+            project.notify_changes_in_all_dags()
+        project._notify_pending_dag_changes()
+        data_store.handle_dag_changed.assert_called_once_with(0, [])
+        view.handle_dag_changed.assert_called_once_with(1, [])
+        data_store.resources_for_direct_successors.assert_called_once_with()
+
+    def test_item_change_notifies_only_downstream_items(self):
+        project = self.toolbox.project()
+        data_store, _ = self._make_item(self.add_ds)
+        data_connection, _ = self._make_item(self.add_dc)
+        view, _ = self._make_item(self.add_view)
+        project.dag_handler.add_graph_edge(data_store.name, data_connection.name)
+        project.dag_handler.add_graph_edge(data_connection.name, view.name)
+        project._notify_pending_dag_changes()
+        for item in (data_store, data_connection, view):
+            item.handle_dag_changed = mock.MagicMock()
+        data_store.resources_for_direct_successors = mock.MagicMock(return_value=[])
+        project.notify_changes_in_containing_dag(data_connection.name)
+        project._notify_pending_dag_changes()
+        data_store.handle_dag_changed.assert_not_called()
+        data_connection.handle_dag_changed.assert_called_once()
+        view.handle_dag_changed.assert_called_once()
+        data_store.resources_for_direct_successors.assert_called_once_with()
+
+    def test_resources_are_queried_again_in_next_notification(self):
+        project = self.toolbox.project()
+        data_connection, _ = self._make_item(self.add_dc)
+        view, _ = self._make_item(self.add_view)
+        project.dag_handler.add_graph_edge(data_connection.name, view.name)
+        project._notify_pending_dag_changes()
+        view.handle_dag_changed = mock.MagicMock()
+        data_connection.resources_for_direct_successors = mock.MagicMock(return_value=["old resource"])
+        project.notify_changes_in_containing_dag(view.name)
+        project._notify_pending_dag_changes()
+        view.handle_dag_changed.assert_called_once_with(1, ["old resource"])
+        view.handle_dag_changed.reset_mock()
+        data_connection.resources_for_direct_successors.return_value = ["new resource"]
+        project.notify_changes_in_containing_dag(view.name)
+        project._notify_pending_dag_changes()
+        view.handle_dag_changed.assert_called_once_with(1, ["new resource"])
+
     def add_ds(self):
         """Helper method to add Data Store. Returns created items name."""
         item = dict(name="DS", description="", url=dict(), x=0, y=0)
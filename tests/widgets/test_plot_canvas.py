@@ -0,0 +1,84 @@
+######################################################################################################################
+# Copyright (C) 2017-2020 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the plot_canvas module.
+"""
+
+import unittest
+import numpy as np
+from PySide2.QtWidgets import QApplication
+from spinetoolbox.widgets.plot_canvas import downsampled_indexes, DOWNSAMPLING_THRESHOLD, PlotCanvas
+
+
+class TestDownsampledIndexes(unittest.TestCase):
+    def test_short_lines_are_not_downsampled(self):
+        x = np.arange(10.0)
+        self.assertEqual(list(downsampled_indexes(x, x, 0.0, 9.0, 10)), list(range(10)))
+
+    def test_extremes_of_each_bucket_are_kept(self):
+        x = np.arange(1000.0)
+        y = np.zeros(1000)
+        y[123] = 5.0
+        y[456] = -5.0
+        indexes = downsampled_indexes(x, y, 0.0, 999.0, 10)
+        self.assertLessEqual(len(indexes), 4 * 10)
+        self.assertIn(123, indexes)
+        self.assertIn(456, indexes)
+        self.assertEqual(indexes[0], 0)
+        self.assertEqual(indexes[-1], 999)
+        self.assertTrue(np.all(np.diff(indexes) > 0))
+
+    def test_points_next_to_visible_range_are_kept(self):
+        x = np.arange(1000.0)
+        indexes = downsampled_indexes(x, x, 100.5, 199.5, 2)
+        self.assertEqual(indexes[0], 100)
+        self.assertEqual(indexes[-1], 200)
+
+
+class TestPlotCanvas(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def test_long_line_gets_resampled_when_x_limits_change(self):
+        canvas = PlotCanvas()
+        point_count = 10 * DOWNSAMPLING_THRESHOLD
+        x = np.arange(float(point_count))
+        y = np.sin(x)
+        line = canvas.plot_downsampled(x, y)
+        self.assertLess(len(line.get_xdata()), point_count)
+        canvas.axes.set_xlim(100.0, 200.0)
+        self.assertEqual(list(line.get_xdata()), list(x[99:202]))
+
+    def test_raw_data_is_available_at_full_resolution(self):
+        canvas = PlotCanvas()
+        point_count = 10 * DOWNSAMPLING_THRESHOLD
+        x = np.arange(float(point_count))
+        y = np.cos(x)
+        line = canvas.plot_downsampled(x, y)
+        canvas.axes.set_xlim(100.0, 200.0)
+        raw_x, raw_y = canvas.raw_data(line)
+        self.assertTrue(np.array_equal(raw_x, x))
+        self.assertTrue(np.array_equal(raw_y, y))
+        short_line = canvas.plot_downsampled([1.0, 2.0], [3.0, 4.0])
+        self.assertEqual([list(data) for data in canvas.raw_data(short_line)], [[1.0, 2.0], [3.0, 4.0]])
+
+    def test_short_line_is_plotted_as_is(self):
+        canvas = PlotCanvas()
+        line = canvas.plot_downsampled([1.0, 2.0], [3.0, 4.0], step=True)
+        self.assertEqual(list(line.get_ydata()), [3.0, 4.0])
+        self.assertEqual(line.get_drawstyle(), "steps-post")
+
+
+if __name__ == '__main__':
+    unittest.main()